@@ -0,0 +1,53 @@
+"""
+Timestamp parsing: per-row strptime versus the cached and batch parsers.
+
+Usage:
+    python benchmarks/bench_dates.py [--count 100000]
+"""
+import argparse
+import random
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos import dates  # noqa: E402
+import payloads  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    values = [payloads.device_transaction(rng, i)["settlement_date"] for i in range(args.count)]
+
+    def cold_cache():
+        dates.parse_datetime.cache_clear()
+        return [dates.parse_datetime(v) for v in values]
+
+    cases = {
+        "datetime.strptime per row": lambda: [datetime.strptime(v, "%Y-%m-%d %H:%M:%S") for v in values],
+        "parse_datetime, cold cache": cold_cache,
+        "parse_datetime, warm cache": lambda: [dates.parse_datetime(v) for v in values],
+        "parse_datetimes (batch)": lambda: dates.parse_datetimes(values),
+    }
+    if dates.np is not None:
+        column = dates.np.array(values, dtype="S19")
+        cases["parse_datetimes (columnar S19)"] = lambda: dates.parse_datetimes(column)
+
+    print(f"{args.count} timestamps, numpy {'available' if dates.np is not None else 'not installed'}")
+    baseline = None
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"  {label:<32} {best * 1e3:9.2f} ms  x{baseline / best:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Micro-benchmark of response decoding strategies.
+
+Compares decoding a raw response body into schema types with:
+
+- stdlib `json.loads` followed by `Model(**data)` (the previous behaviour)
+- every available `mypos.decoding` backend followed by `Model(**data)`
+- `mypos.decoding.decode`, which validates the raw bytes in a single pass
+
+Usage:
+    python benchmarks/bench_decoding.py [--size 500] [--repeat 20]
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos import decoding  # noqa: E402
+from mypos.schemas import DeviceTransactionListResponse, ReceiptDetail, TransactionListResponse  # noqa: E402
+import payloads  # noqa: E402
+
+
+def run(name: str, body: bytes, model, repeat: int) -> None:
+    print(f"\n{name} ({len(body) / 1024:.1f} KiB)")
+    cases = {"json.loads + Model(**data)": lambda: model(**json.loads(body))}
+    for backend in decoding.available_backends():
+        loads = decoding._BACKENDS[backend]
+        cases[f"{backend}.loads + Model(**data)"] = lambda loads=loads: model(**loads(body))
+    cases["decoding.decode (single pass)"] = lambda: decoding.decode(body, model)
+
+    baseline = None
+    for label, fn in cases.items():
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        baseline = baseline or best
+        print(f"  {label:<36} {best * 1e3:9.3f} ms  x{baseline / best:5.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=500, help="records per list page")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Available backends: {', '.join(decoding.available_backends())}")
+    run("TransactionListResponse", json.dumps(payloads.transaction_page(args.size)).encode(), TransactionListResponse, args.repeat)
+    run("DeviceTransactionListResponse", json.dumps(payloads.device_transaction_page(args.size)).encode(), DeviceTransactionListResponse, args.repeat)
+    run("ReceiptDetail", json.dumps(payloads.receipt(random.Random(1))).encode(), ReceiptDetail, args.repeat * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Parsing a multi-megabyte MT940 statement: reading it whole and matching entries
+with regexes over the full text, as ad-hoc scripts do, versus the incremental
+`MT940Parser`, which reads the file line by line.
+
+The statement is written to a temporary file first, so both approaches read
+from disk. The peak memory excludes the interpreter and the module imports.
+
+Usage:
+    python benchmarks/bench_mt940.py [--entries 50000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.records import TransactionRecord  # noqa: E402
+from mypos.transactions.mt940 import Entry, match_transactions, parse_mt940  # noqa: E402
+import payloads  # noqa: E402
+
+WHOLE_TEXT = re.compile(r":61:(\d{6})(\d{4})?(R?[CD])(\d+,\d*)(\w{4})([^\n/]*)(?://([^\n]*))?\n(?::86:((?:(?!\n:)[\s\S])*))?")
+
+
+def write_statement(path: str, count: int, rng: random.Random) -> list:
+    transactions = [payloads.transaction(rng, i) for i in range(count)]
+    balance = 0.0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{1:F01MYPOSBGSFAXXX0000000000}{2:I940XXXXXXXXXXXXN}{4:\n:20:STMT-BENCH\n:25:BG80MPOS40100000001\n:28C:00001/001\n:60F:C250101EUR0,00\n")
+        for transaction in transactions:
+            amount = transaction["transaction_amount"]
+            mark = transaction["sign"]
+            balance += amount if mark == "C" else -amount
+            day = transaction["date"][2:10].replace("-", "")
+            f.write(f":61:{day}{day[2:]}{mark}{amount:.2f}".replace(".", ",") + f"NTRF{transaction['reference_number']}//{transaction['id']}\n")
+            f.write(f":86:/EREF/{transaction['payment_reference']}/REMI/Ride {transaction['reference_number']}\n/ORDP/{transaction['billing_descriptor']}\n")
+        f.write(f":62F:{'C' if balance >= 0 else 'D'}250131EUR{abs(balance):.2f}\n-}}\n".replace(".", ","))
+    return transactions
+
+
+def whole_text(path: str) -> int:
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    entries = [match.groups() for match in WHOLE_TEXT.finditer(text)]
+    return len(entries)
+
+
+def streamed(path: str) -> int:
+    return sum(1 for record in parse_mt940(path) if isinstance(record, Entry))
+
+
+def measure(label: str, fn, *args) -> None:
+    # Timed without tracemalloc, which slows down every allocation
+    start = time.perf_counter()
+    count = fn(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {count:>7} entries  peak {peak / 2**20:8.2f} MiB  {elapsed * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "statement.sta")
+        transactions = write_statement(path, args.entries, random.Random(1))
+        print(f"MT940 statement, {args.entries} entries, {os.path.getsize(path) / 2**20:.1f} MiB")
+        measure("whole text, regex", whole_text, path)
+        measure("MT940Parser, line by line", streamed, path)
+
+        start = time.perf_counter()
+        matched = sum(1 for _, transaction in match_transactions(
+            (record for record in parse_mt940(path) if isinstance(record, Entry)),
+            [TransactionRecord.from_dict(transaction) for transaction in transactions]
+        ) if transaction is not None)
+        print(f"  joined to payment_reference        {matched:>7} matched  {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Acknowledgement latency of the webhook receiver under a CPU-bound handler: running
+the handler in the default thread pool, where it holds the GIL of the receiver,
+versus offloading it to worker processes with `ProcessDispatcher`.
+
+Usage:
+    python benchmarks/bench_offload.py [--count 2000] [--concurrency 64] [--cpu-ms 2] [--processes 4]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.webhooks.offload import ProcessDispatcher  # noqa: E402
+from mypos.webhooks.receiver import WebhookReceiver  # noqa: E402
+from bench_webhooks import SECRET, load, report, signed_request  # noqa: E402
+
+CPU_SECONDS = 0.002
+
+
+def score(delivery) -> float:
+    # Pure Python work standing in for fraud scoring or receipt rendering
+    deadline = time.process_time() + CPU_SECONDS
+    total = 0.0
+    while time.process_time() < deadline:
+        total += sum(i * i for i in range(200))
+    return total + delivery.payload["amount"]
+
+
+async def main() -> None:
+    global CPU_SECONDS
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--cpu-ms", type=float, default=2.0)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    CPU_SECONDS = args.cpu_ms / 1e3
+
+    rng = random.Random(1)
+    requests = [signed_request(rng, i) for i in range(args.count)]
+    print(f"{args.count} notifications, {args.concurrency} concurrent senders, handler {args.cpu_ms} ms of CPU")
+
+    receiver = WebhookReceiver(SECRET, workers=args.processes * 2, max_queue=args.count)
+    receiver.add_handler("transaction", score)
+    start = time.perf_counter()
+    elapsed, latencies, statuses = await load(receiver, requests, args.concurrency)
+    await receiver.join()
+    total = time.perf_counter() - start
+    await receiver.stop()
+    report("thread pool", elapsed, latencies, statuses, total)
+
+    pool = ProcessDispatcher(max_workers=args.processes)
+    # Start the worker processes before measuring
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(pool.executor, time.sleep, 0.05) for _ in range(args.processes)))
+    receiver = WebhookReceiver(SECRET, workers=pool.max_pending, max_queue=args.count)
+    receiver.add_handler("transaction", pool.offload(score))
+    start = time.perf_counter()
+    elapsed, latencies, statuses = await load(receiver, requests, args.concurrency)
+    await receiver.join()
+    total = time.perf_counter() - start
+    await receiver.stop()
+    pool.shutdown()
+    report(f"{args.processes} processes", elapsed, latencies, statuses, total)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Per-event CPU cost of webhook dispatch with typed payloads: validating the payload
+eagerly for every handler, as `WebhookReceiver` did before `LazyPayload`, versus
+validating lazily and at most once per delivery.
+
+Three async handlers are registered for the event: one reads two fields, one
+forwards the raw payload and one only counts events.
+
+Usage:
+    python benchmarks/bench_payloads.py [--count 20000]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.schemas import DeviceTransaction  # noqa: E402
+from mypos.webhooks.payloads import PayloadRegistry  # noqa: E402
+from mypos.webhooks.receiver import WebhookDelivery, WebhookReceiver  # noqa: E402
+import payloads  # noqa: E402
+
+
+async def eager_dispatch(handlers: list, delivery: WebhookDelivery) -> None:
+    # The dispatch loop before LazyPayload: every handler with a model validates again
+    for handler, model in handlers:
+        argument = delivery._replace(payload=model.model_validate(delivery.payload)) if model else delivery
+        await handler(argument)
+
+
+async def run(count: int) -> None:
+    rng = random.Random(1)
+    deliveries = [
+        WebhookDelivery("transaction", json.loads(json.dumps(payloads.device_transaction(rng, i))), b"", {}, 0.0)
+        for i in range(count)
+    ]
+    total = 0.0
+    forwarded = []
+
+    async def score(delivery):
+        nonlocal total
+        total += delivery.payload.amount if delivery.payload.currency == "EUR" else 0
+
+    async def forward(delivery):
+        forwarded.append(delivery.payload)
+
+    async def count_events(delivery):
+        pass
+
+    start = time.perf_counter()
+    handlers = [(score, DeviceTransaction), (forward, DeviceTransaction), (count_events, DeviceTransaction)]
+    for delivery in deliveries:
+        await eager_dispatch(handlers, delivery)
+    eager = time.perf_counter() - start
+
+    receiver = WebhookReceiver("benchmark-secret", payloads=PayloadRegistry({"transaction": DeviceTransaction}))
+    receiver.on("transaction")(score)
+    receiver.on("transaction", raw=True)(forward)
+    receiver.on("transaction", raw=True)(count_events)
+    start = time.perf_counter()
+    for delivery in deliveries:
+        await receiver.dispatch(delivery)
+    lazy = time.perf_counter() - start
+
+    print(f"{count} transaction events, 3 handlers")
+    print(f"  eager validation per handler {eager / count * 1e6:7.2f} us/event")
+    print(f"  lazy, raw passthrough        {lazy / count * 1e6:7.2f} us/event  ({eager / lazy:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Memory per record of pydantic models versus the slots-based records.
+
+Usage:
+    python benchmarks/bench_records.py [--count 50000]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos import decoding  # noqa: E402
+from mypos.records import DeviceTransactionRecord, TransactionRecord  # noqa: E402
+from mypos.schemas import DeviceTransaction, Transaction  # noqa: E402
+import payloads  # noqa: E402
+
+
+def measure(label: str, raw_items: list, build) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    kept = [build(raw) for raw in raw_items]
+    elapsed = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_record = (after - before) / len(kept)
+    print(f"  {label:<32} {per_record:8.0f} B/record  {(after - before) / 2**20:8.2f} MiB  {elapsed * 1e3:8.1f} ms")
+    return per_record
+
+
+def run(name: str, raw_items: list, model, record) -> None:
+    print(f"\n{name}, {len(raw_items)} records retained")
+    baseline = measure("pydantic model", raw_items, lambda raw: decoding.decode(raw, model))
+    compact = measure("slots record, interned", raw_items, record.from_json)
+    print(f"  saving: {baseline - compact:.0f} B/record ({(1 - compact / baseline) * 100:.0f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    # Every record is decoded from its own buffer, as when streamed from the socket
+    transactions = [json.dumps(payloads.transaction(rng, i)).encode() for i in range(args.count)]
+    device_transactions = [json.dumps(payloads.device_transaction(rng, i)).encode() for i in range(args.count)]
+    run("Transaction", transactions, Transaction, TransactionRecord)
+    run("DeviceTransaction", device_transactions, DeviceTransaction, DeviceTransactionRecord)
+
+
+if __name__ == "__main__":
+    main()
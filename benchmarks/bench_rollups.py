@@ -0,0 +1,65 @@
+"""
+Daily revenue per terminal for a dashboard: summing `amount` over every device
+transaction on each refresh, versus querying the pre-aggregated buckets of a
+`RollupStore` that transactions were folded into as they arrived.
+
+Usage:
+    python benchmarks/bench_rollups.py [--count 200000] [--batch 500]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.records import DeviceTransactionRecord  # noqa: E402
+from mypos.rollups import RollupStore  # noqa: E402
+import payloads  # noqa: E402
+
+
+def recompute(transactions: list) -> int:
+    revenue = defaultdict(float)
+    for transaction in transactions:
+        revenue[(transaction.date[:10], transaction.terminal_id, transaction.currency)] += transaction.amount
+    return len(revenue)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=500, help="transactions per incremental sync")
+    parser.add_argument("--terminals", type=int, default=200, help="size of the fleet")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    transactions = []
+    for i in range(args.count):
+        data = payloads.device_transaction(rng, i)
+        data["terminal_id"] = f"9000{rng.randrange(args.terminals):04d}"
+        transactions.append(DeviceTransactionRecord.from_dict(data))
+    store = RollupStore()
+    start = time.perf_counter()
+    for i in range(0, len(transactions), args.batch):
+        store.add(transactions[i:i + args.batch])
+    fold = time.perf_counter() - start
+    print(f"{args.count} device transactions of {args.terminals} terminals, folded in batches of {args.batch}: {args.count / fold:,.0f} transactions/s")
+
+    start = time.perf_counter()
+    groups = recompute(transactions)
+    full = time.perf_counter() - start
+    start = time.perf_counter()
+    rows = len(store.daily_revenue())
+    rollup = time.perf_counter() - start
+    print(f"  recompute over all transactions  {groups:>6} rows  {full * 1e3:8.1f} ms")
+    print(f"  query rollup buckets             {rows:>6} rows  {rollup * 1e3:8.1f} ms  ({full / rollup:.1f}x)")
+    start = time.perf_counter()
+    store.daily_revenue("2025-01-10", "2025-01-10")
+    print(f"  query one day                                {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
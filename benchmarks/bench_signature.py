@@ -0,0 +1,100 @@
+"""
+Per-notification cost of webhook signature verification: the original
+`WebhooksV1.verify_signature` implementation versus `SignatureVerifier`.
+
+Usage:
+    python benchmarks/bench_signature.py [--count 50000] [--secrets 2]
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.webhooks.signature import SignatureVerifier, verify_signature  # noqa: E402
+import payloads  # noqa: E402
+
+
+def legacy_verify_signature(payload: str, headers: dict, secret: str) -> bool:
+    # The implementation WebhooksV1.verify_signature had before SignatureVerifier
+    import hmac
+    import hashlib
+    import time
+
+    signature_header = headers.get("X-myPOS-Signature")
+    if not signature_header:
+        return False
+    try:
+        parts = signature_header.split(",")
+        timestamp = None
+        signature = None
+        for part in parts:
+            if part.startswith("t="):
+                timestamp = part.split("=")[1]
+            elif part.startswith("v1="):
+                signature = part.split("=")[1]
+        if not timestamp or not signature:
+            return False
+        if abs(int(time.time()) - int(timestamp)) > 300:
+            return False
+        normalized_payload = payload.replace(": ", ":").replace(", ", ",")
+        expected_signature = hmac.new(secret.encode("utf-8"), normalized_payload.encode("utf-8"), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected_signature, signature)
+    except Exception:
+        return False
+
+
+def sign(body: bytes, secret: str) -> dict:
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return {"X-myPOS-Signature": f"t={int(time.time())},v1={signature}"}
+
+
+def bench(label: str, fn, cases: list) -> None:
+    start = time.perf_counter()
+    ok = sum(fn(body, headers) for body, headers in cases)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed / len(cases) * 1e6:7.2f} us/event  valid {ok}/{len(cases)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=50000)
+    parser.add_argument("--secrets", type=int, default=2, help="active secrets, the signing one is last")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    secrets = [f"secret-{i}" for i in range(args.secrets)]
+    secret = secrets[-1]
+    bodies = [
+        json.dumps({"event": "transaction", "payload": payloads.device_transaction(rng, i)}, separators=(",", ":")).encode()
+        for i in range(args.count)
+    ]
+    cases = [(body, sign(body, secret)) for body in bodies]
+    text_cases = [(body.decode(), headers) for body, headers in cases]
+    verifier = SignatureVerifier(secrets)
+
+    print(f"{args.count} compact notifications of ~{sum(map(len, bodies)) // len(bodies)} bytes, {args.secrets} active secrets")
+    bench("legacy, str, signing secret", lambda body, headers: legacy_verify_signature(body, headers, secret), text_cases)
+    bench("legacy, str, every secret", lambda body, headers: any(legacy_verify_signature(body, headers, s) for s in secrets), text_cases)
+    bench("verify_signature(), str, signing secret", lambda body, headers: verify_signature(body, headers, secret), text_cases)
+    bench("SignatureVerifier, bytes", verifier.verify, cases)
+    bench("SignatureVerifier, memoryview", lambda body, headers: verifier.verify(memoryview(body), headers), cases)
+
+    # A value containing ", " and ": " inside a pretty-printed body, signed over the compact form
+    document = {"event": "transaction", "payload": {"note": "Fare: 12, tip: 2", "amount": 14.0}}
+    compact = json.dumps(document, separators=(",", ":")).encode()
+    pretty = json.dumps(document, indent=2)
+    headers = sign(compact, secret)
+    print("\nString values containing ', ' and ': ' in a pretty-printed body")
+    print(f"  legacy:            {legacy_verify_signature(pretty, headers, secret)}")
+    print(f"  SignatureVerifier: {verifier.verify(pretty.encode(), headers)}")
+
+
+if __name__ == "__main__":
+    main()
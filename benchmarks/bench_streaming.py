@@ -0,0 +1,84 @@
+"""
+Peak memory of decoding a large list page whole versus streaming it.
+
+The response body is replayed from an in-memory chunk iterator, so the
+measured peak excludes the body itself for the streamed case, as it would
+be when reading from the socket.
+
+Usage:
+    python benchmarks/bench_streaming.py [--size 20000]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos import decoding  # noqa: E402
+from mypos.schemas import DeviceTransaction, DeviceTransactionListResponse  # noqa: E402
+from mypos.streaming import StreamedPage  # noqa: E402
+import payloads  # noqa: E402
+
+
+class ReplayResponse:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    @property
+    def content(self) -> bytes:
+        # A buffered response holds a private copy of the body
+        return bytes(bytearray(self.body))
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {count:>7} records  peak {peak / 2**20:8.2f} MiB  {elapsed * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20000, help="records per list page")
+    args = parser.parse_args()
+
+    body = json.dumps(payloads.device_transaction_page(args.size)).encode()
+    print(f"DeviceTransactionListResponse, {args.size} records, {len(body) / 2**20:.1f} MiB body")
+    response = ReplayResponse(body)
+
+    def buffered() -> int:
+        # Previous behaviour: buffer, decode to dicts, then validate
+        page = DeviceTransactionListResponse(**json.loads(response.content))
+        return len(page.transactions)
+
+    def single_pass() -> int:
+        page = decoding.decode(response.content, DeviceTransactionListResponse)
+        return len(page.transactions)
+
+    def streamed() -> int:
+        count = 0
+        for _ in StreamedPage(response, "transactions", DeviceTransaction):
+            count += 1
+        return count
+
+    measure("buffered json.loads + validate", buffered)
+    measure("buffered single-pass decode", single_pass)
+    measure("streamed, record at a time", streamed)
+
+
+if __name__ == "__main__":
+    main()
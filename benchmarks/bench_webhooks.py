@@ -0,0 +1,146 @@
+"""
+Load test of the webhook receiver: events per second and acknowledgement latency,
+versus processing each notification inline before answering.
+
+The ASGI application is driven in-process, so the numbers exclude the HTTP server.
+
+Usage:
+    python benchmarks/bench_webhooks.py [--count 20000] [--concurrency 64] [--workers 8] [--handler-ms 2] [--event-log DIR]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mypos.webhooks.eventlog import EventLog  # noqa: E402
+from mypos.webhooks.receiver import EventLogWorker, WebhookReceiver  # noqa: E402
+import payloads  # noqa: E402
+
+SECRET = "benchmark-secret"
+
+
+def signed_request(rng: random.Random, i: int) -> tuple:
+    body = json.dumps({"event": "transaction", "payload": payloads.device_transaction(rng, i)}, separators=(",", ":")).encode()
+    timestamp = str(int(time.time()))
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    headers = [(b"content-type", b"application/json"), (b"x-mypos-signature", f"t={timestamp},v1={signature}".encode())]
+    return body, headers
+
+
+async def call(app, body: bytes, headers: list) -> int:
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def inline_app(receiver: WebhookReceiver, handler):
+    # A hand-rolled endpoint: verify, decode and handle before answering
+    async def app(scope, receive, send):
+        message = await receive()
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+        if not receiver.verify(message["body"], headers):
+            status = 401
+        else:
+            await handler(json.loads(message["body"]))
+            status = 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def load(app, requests: list, concurrency: int) -> tuple:
+    latencies = []
+    statuses = {}
+    queue = iter(requests)
+
+    async def client():
+        for body, headers in queue:
+            start = time.perf_counter()
+            status = await call(app, body, headers)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, sorted(latencies), statuses
+
+
+def report(label: str, elapsed: float, latencies: list, statuses: dict, total: float = None) -> None:
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    line = f"  {label:<26} {len(latencies) / elapsed:9.0f} acks/s  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms  {statuses}"
+    if total is not None:
+        line += f"  processed in {total:.2f} s"
+    print(line)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=50000)
+    parser.add_argument("--handler-ms", type=float, default=2.0)
+    parser.add_argument("--event-log", help="also benchmark a durable event log in this directory (a temporary one if empty)", nargs="?", const="")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    requests = [signed_request(rng, i) for i in range(args.count)]
+
+    async def handler(_):
+        await asyncio.sleep(args.handler_ms / 1e3)
+
+    print(f"{args.count} notifications, {args.concurrency} concurrent senders, handler {args.handler_ms} ms")
+
+    receiver = WebhookReceiver(SECRET, workers=args.workers, max_queue=args.max_queue)
+    receiver.on("transaction")(handler)
+    start = time.perf_counter()
+    elapsed, latencies, statuses = await load(receiver, requests, args.concurrency)
+    await receiver.join()
+    total = time.perf_counter() - start
+    await receiver.stop()
+    report(f"receiver ({args.workers} workers)", elapsed, latencies, statuses, total)
+
+    if args.event_log is not None:
+        directory = args.event_log or tempfile.mkdtemp(prefix="mypos-bench-")
+        log = EventLog(directory)
+        receiver = WebhookReceiver(SECRET, event_log=log)
+        receiver.on("transaction")(handler)
+        elapsed, latencies, statuses = await load(receiver, requests, args.concurrency)
+        report("receiver (event log)", elapsed, latencies, statuses)
+        worker = EventLogWorker(receiver, directory, batch=args.workers * 8)
+        start = time.perf_counter()
+        while await worker.run_once():
+            pass
+        print(f"  {'event log worker':<26} {worker.stats['handled'] / (time.perf_counter() - start):9.0f} events/s")
+        worker.close()
+        log.close()
+        if not args.event_log:
+            shutil.rmtree(directory)
+
+    elapsed, latencies, statuses = await load(inline_app(receiver, handler), requests, args.concurrency)
+    report("inline processing", elapsed, latencies, statuses)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
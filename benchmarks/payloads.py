@@ -0,0 +1,116 @@
+"""
+Realistic, deterministic API payloads shared by the benchmarks.
+"""
+import random
+from datetime import datetime, timedelta
+
+CURRENCIES = ["EUR", "EUR", "EUR", "BGN", "GBP"]
+SCHEMES = ["VISA", "MASTERCARD", "MAESTRO", "AMEX"]
+TRANSACTION_TYPES = ["008", "011", "022", "001", "501"]
+
+
+def _date(rng: random.Random, base: datetime) -> str:
+    return (base + timedelta(seconds=rng.randint(0, 30 * 86400))).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def transaction(rng: random.Random, i: int, base: datetime = datetime(2025, 1, 1)) -> dict:
+    amount = round(rng.uniform(3, 120), 2)
+    currency = rng.choice(CURRENCIES)
+    return {
+        "id": 100000 + i,
+        "payment_reference": f"PR{rng.getrandbits(48):012X}",
+        "transaction_type": rng.choice(TRANSACTION_TYPES),
+        "transaction_amount": amount,
+        "transaction_currency": currency,
+        "original_amount": amount,
+        "original_currency": currency,
+        "sign": rng.choice(["C", "D"]),
+        "date": _date(rng, base),
+        "operation_type": "POS",
+        "reference_number": f"RIDE-{rng.randint(1, 10**8):08d}",
+        "reference_number_type": 1,
+        "terminal_id": f"9000{rng.randint(0, 2000):04d}",
+        "serial_number": f"SN{rng.randint(0, 2000):06d}",
+        "account_number": f"4010{rng.randint(0, 20):06d}",
+        "ruid": None,
+        "billing_descriptor": "TAXIBEE*RIDE",
+        "pan": f"{rng.randint(0, 9999):04d}",
+    }
+
+
+def device_transaction(rng: random.Random, i: int, base: datetime = datetime(2025, 1, 1)) -> dict:
+    amount = round(rng.uniform(3, 120), 2)
+    terminal = rng.randint(0, 2000)
+    return {
+        "terminal_id": f"9000{terminal:04d}",
+        "terminal_name": f"Taxi {terminal}",
+        "outlet_name": f"Outlet {terminal % 25}",
+        "amount": amount,
+        "currency": rng.choice(CURRENCIES),
+        "fee": round(amount * 0.012, 2),
+        "pan": f"{rng.randint(0, 9999):04d}",
+        "card_scheme": rng.choice(SCHEMES),
+        "rrn": f"{rng.randint(0, 10**12):012d}",
+        "stan": f"{rng.randint(0, 10**6):06d}",
+        "date": _date(rng, base),
+        "settlement_date": _date(rng, base + timedelta(days=1)),
+        "settlement_amount": f"{amount - round(amount * 0.012, 2):.2f}",
+        "settlement_currency": "EUR",
+        "tran_status": "Approved",
+        "payment_status": rng.choice(["Settled", "Settled", "Pending"]),
+        "payment_reference": f"PR{rng.getrandbits(48):012X}",
+        "reference_number": f"RIDE-{rng.randint(1, 10**8):08d}",
+    }
+
+
+def receipt(rng: random.Random) -> dict:
+    amount = f"{rng.uniform(3, 120):.2f}"
+    return {
+        "is_declined": 0,
+        "receipt_layout_version": 2,
+        "exchange_rate": None,
+        "date": "2025-01-14",
+        "time": "21:14:05",
+        "stan": f"{rng.randint(0, 10**6):06d}",
+        "terminal_id": f"9000{rng.randint(0, 2000):04d}",
+        "merchant_id": "000000000123456",
+        "merchant_name": "TAXIBEE",
+        "address_line_1": "Main Street 1",
+        "address_line_2": "Amsterdam",
+        "resp_code": "00",
+        "reference_number": f"RIDE-{rng.randint(1, 10**8):08d}",
+        "application_preferred_name": "VISA DEBIT",
+        "transaction_preauth_code": "",
+        "card_scheme": "VISA",
+        "pan": f"XXXX-XXXX-XXXX-{rng.randint(0, 9999):04d}",
+        "emboss_name": "J DOE",
+        "amount": amount,
+        "currency": "EUR",
+        "auth_code": f"{rng.randint(0, 10**6):06d}",
+        "rrn": f"{rng.randint(0, 10**12):012d}",
+        "aid": "A0000000031010",
+        "amount_tip": "0.00",
+        "amount_total": amount,
+        "operator_code": "1",
+        "tran_type": "PURCHASE",
+        "sign_row_1": "",
+        "sign_row_2": "",
+        "sign_row_3": "",
+        "tran_status": "APPROVED",
+    }
+
+
+def transaction_page(n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    return {
+        "transactions": [transaction(rng, i) for i in range(n)],
+        "pagination": {"page": 1, "page_size": n, "total": n * 10},
+    }
+
+
+def device_transaction_page(n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    return {
+        "transactions": [device_transaction(rng, i) for i in range(n)],
+        "pagination": {"page": 1, "page_size": n, "total": n * 10},
+    }
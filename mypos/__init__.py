@@ -3,9 +3,3 @@ from .schemas import *
 
 def create_client() -> MyPOS:
     return MyPOS()
-
-
-
-def create_client() -> Client:
-    mypos_client: Client = Client()
-    return mypos_client
\ No newline at end of file
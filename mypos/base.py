@@ -3,11 +3,50 @@ import os
 import base64
 import uuid
 import niquests
+from typing import Type, TypeVar
 from dotenv import load_dotenv
+from . import decoding
+from .limits import HostLimiter
+from .streaming import StreamedPage
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Largest body checked for the token error envelope on a 200 response
+_ENVELOPE_MAX_SIZE = 512
+
+class APIError(Exception):
+    """
+    A request answered with an error status.
+
+    Attributes:
+        status_code: The HTTP status of the response.
+    """
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def definite(self) -> bool:
+        """
+        Whether the API certainly did not apply the request. A 4xx rejects the request,
+        while after a 5xx (e.g. a 502 or 504 from a proxy) it may have been applied.
+        """
+        return 400 <= self.status_code < 500
+
+
+def is_definite_failure(error: BaseException) -> bool:
+    """
+    Whether a request that raised `error` certainly had no effect. Only `APIError`s
+    with a 4xx status are, connection errors, 5xx and unknown errors may come after
+    the API applied the request.
+    """
+    return isinstance(error, APIError) and error.definite
+
+
 class BaseClient:
     """
     Base Client for interacting with the MyPOS API.
@@ -21,6 +60,7 @@ class BaseClient:
         self.auth_base_url = os.getenv("MYPOS_AUTH_BASE_URL")
         self.api_base_url = os.getenv("MYPOS_API_BASE_URL")
         self.access_token = None
+        self.limiter = HostLimiter()
         self._ensure_token()
 
     def get_access_token(self) -> str:
@@ -54,28 +94,43 @@ class BaseClient:
         if not self.access_token:
             self.get_access_token()
 
-    def _refresh_token_if_needed(self, response) -> bool:
+    def _refresh_token_if_needed(self, response, stream: bool = False) -> bool:
         """
         Check if the token needs refresh based on response and refresh if needed. 
         """
+        if response.status_code == 401:
+            logger.warning("Access token expired or invalid, refreshing...")
+            self.access_token = self.get_access_token()
+            return True
+        if response.status_code == 204:
+            return False
+        if response.status_code == 200:
+            # An expired token can also be reported as a small {"code": 503, ...} body with
+            # status 200. Successful responses can be large and are decoded once by the
+            # caller, so only small bodies that may be that envelope are decoded here.
+            # Streamed bodies are not read here, their caller consumes them.
+            if stream:
+                return False
+            content = response.content or b""
+            if len(content) > _ENVELOPE_MAX_SIZE or b'"code"' not in content:
+                return False
         try:
-            response_data = response.json()
+            response_data = decoding.loads(response.content)
             # Check for 503 or token-related errors
-            if response.status_code == 401 or response_data.get('code') == 503:
-                logger.warning("Access token expired or invalid, refreshing...")
-                self.access_token = self.get_access_token()
-                return True
-        except Exception as e:
-            # If response if not JSON or parsing fails, check status code
-            if response.status_code == 401:
+            if isinstance(response_data, dict) and response_data.get('code') == 503:
                 logger.warning("Access token expired or invalid, refreshing...")
                 self.access_token = self.get_access_token()
                 return True
+        except Exception:
+            # Response is not JSON, the status code check above is all we can do
+            pass
         return False
 
-    def request(self, method: str, endpoint: str, params: dict = None, json: dict = None, data: dict = None, base_url: str = None) -> dict:
+    def send(self, method: str, endpoint: str, params: dict = None, json: dict = None, data: dict = None, base_url: str = None, stream: bool = False):
         """
-        Make an authenticated request to the API.
+        Make an authenticated request to the API and return the raw response.
+        With `stream=True` the body is not read until the caller consumes it, and
+        the host limiter slot is held until the caller closes the response.
         """
         url = f"{base_url or self.api_base_url}{endpoint}"
         
@@ -92,17 +147,73 @@ class BaseClient:
         else:
             headers["Content-Type"] = "application/json"
         
-        response = niquests.request(method, url, headers=headers, params=params, json=json, data=data)
+        response = self._request(method, url, headers, params, json, data, stream)
         
-        if self._refresh_token_if_needed(response):
+        if self._refresh_token_if_needed(response, stream):
+            response.close()
             headers["Authorization"] = f"Bearer {self.access_token}"
-            response = niquests.request(method, url, headers=headers, params=params, json=json, data=data)
+            response = self._request(method, url, headers, params, json, data, stream)
             
         if response.status_code not in [200, 204]:
-            logger.error(f"Request failed: {response.text}")
-            raise Exception(f"Request failed: {response.text}")
+            text = response.text
+            response.close()
+            logger.error(f"Request failed: {text}")
+            raise APIError(f"Request failed: {text}", response.status_code)
+
+        return response
+
+    def _request(self, method: str, url: str, headers: dict, params: dict, json: dict, data: dict, stream: bool):
+        if not stream:
+            with self.limiter.limit(url):
+                return niquests.request(method, url, headers=headers, params=params, json=json, data=data)
+        # A streamed body is read after this returns, so the host slot is held
+        # until the caller closes the response
+        release = self.limiter.acquire(url)
+        try:
+            response = niquests.request(method, url, headers=headers, params=params, json=json, data=data, stream=True)
+        except BaseException:
+            release()
+            raise
+        close = response.close
+
+        def close_and_release() -> None:
+            try:
+                close()
+            finally:
+                release()
+        response.close = close_and_release
+        return response
+
+    def request(self, method: str, endpoint: str, params: dict = None, json: dict = None, data: dict = None, base_url: str = None) -> dict:
+        """
+        Make an authenticated request to the API.
+        """
+        response = self.send(method, endpoint, params=params, json=json, data=data, base_url=base_url)
             
         if response.status_code == 204:
             return {}
             
-        return response.json()
+        return decoding.loads(response.content)
+
+    def request_model(self, model: Type[T], method: str, endpoint: str, params: dict = None, json: dict = None, data: dict = None, base_url: str = None) -> T:
+        """
+        Make an authenticated request to the API and decode the response body
+        straight into `model`, without an intermediate dict.
+
+        Raises:
+            APIError: The response has no body (e.g. 204 No Content). Its status is
+                the 2xx of the response, so the request may have been applied.
+        """
+        response = self.send(method, endpoint, params=params, json=json, data=data, base_url=base_url)
+        if response.status_code == 204 or not (response.content or b"").strip():
+            logger.error(f"Expected a {getattr(model, '__name__', model)} from {method} {endpoint}, got an empty body")
+            raise APIError(f"Empty response body from {method} {endpoint}", response.status_code)
+        return decoding.decode(response.content, model)
+
+    def request_stream(self, key: str, model: Type[T], method: str, endpoint: str, params: dict = None, json: dict = None, data: dict = None, base_url: str = None, chunk_size: int = 64 * 1024) -> StreamedPage[T]:
+        """
+        Make an authenticated request to a list endpoint and stream the records of
+        the `key` array, each validated as `model`, as they are read from the socket.
+        """
+        response = self.send(method, endpoint, params=params, json=json, data=data, base_url=base_url, stream=True)
+        return StreamedPage(response, key, model, chunk_size=chunk_size)
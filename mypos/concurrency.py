@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Set
+
+
+class TaskResult(NamedTuple):
+    item: Any
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def default_workers() -> int:
+    """
+    Default number of worker threads for fan-out helpers, matching the host limiter.
+    """
+    return int(os.getenv("MYPOS_MAX_CONCURRENCY") or 8)
+
+
+def bounded_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+    executor: Optional[ThreadPoolExecutor] = None
+) -> Iterator[TaskResult]:
+    """
+    Apply `fn` to every item concurrently and yield results as they complete.
+
+    At most `max_pending` items (default twice `max_workers`) are in flight at a
+    time, so `items` can be a lazy or very large iterable. Exceptions do not stop
+    the run, they are returned in `TaskResult.error`.
+
+    Args:
+        fn: Called with each item.
+        items: The items to process.
+        max_workers: Number of worker threads (defaults to MYPOS_MAX_CONCURRENCY or 8)
+        max_pending: Maximum number of submitted but unfinished items (optional)
+        executor: Use this executor instead of creating one (optional)
+    """
+    max_workers = max_workers or default_workers()
+    max_pending = max_pending or max_workers * 2
+    own_executor = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mypos")
+    pending: Set[Future] = set()
+    iterator = iter(items)
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                future = executor.submit(fn, item)
+                future.item = item
+                pending.add(future)
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                yield TaskResult(future.item, None if error else future.result(), error)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,64 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a timestamp as returned by the API.
+
+    Accepts 'YYYY-MM-DD HH:mm:ss', 'YYYY-MM-DDTHH:mm:ssZ' and 'YYYY-MM-DD'.
+    Timestamps are returned naive, in the time zone the API sent them in: a
+    'Z' or UTC offset (e.g. '+02:00') is dropped, not converted. Empty values
+    give None.
+    """
+    if not value:
+        return None
+    if value[-1] == "Z":
+        value = value[:-1]
+    parsed = datetime.fromisoformat(value)
+    return parsed.replace(tzinfo=None) if parsed.tzinfo is not None else parsed
+
+
+def _numpy_input(values: Any):
+    if isinstance(values, np.ndarray):
+        kind = values.dtype.kind
+        # Columnar string buffer. Only timestamps with a 'Z' or UTC offset are wider
+        # than 19 characters, drop it in one vectorised step, as `parse_datetime` does.
+        if kind in "US" and values.dtype.itemsize // (4 if kind == "U" else 1) > 19:
+            return values.astype(f"{kind}19")
+        return values
+    return [v[:19] if v else "NaT" for v in values]
+
+
+def parse_datetimes(values: Iterable[Optional[str]]):
+    """
+    Parse a whole column of timestamps in one pass.
+
+    Args:
+        values: An iterable of timestamp strings, or a numpy string array
+            (e.g. a columnar buffer of dtype 'S19', the fastest to parse, or 'U19').
+
+    Returns:
+        numpy.ndarray: A datetime64[s] array with NaT for empty values, if numpy
+        is installed. Otherwise a list of datetimes (or None) from `parse_datetime`.
+    """
+    if np is None:
+        return [parse_datetime(v) for v in values]
+    if not isinstance(values, (np.ndarray, Sequence)):
+        values = list(values)
+    return np.asarray(_numpy_input(values), dtype="datetime64[s]")
+
+
+def parse_column(items: Iterable[Any], field: str):
+    """
+    Parse the `field` timestamps of a page of models or records in one pass,
+    e.g. `parse_column(page.transactions, "settlement_date")`.
+    """
+    return parse_datetimes([getattr(item, field) for item in items])
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union
+from pydantic import BaseModel, TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Raw JSON decoders keyed by backend name. Optional backends are registered
+# only when the package is importable, in order of preference.
+_BACKENDS: Dict[str, Callable[[Union[bytes, str]], Any]] = {}
+# Decode errors of the backends that are not ValueErrors, re-raised as ValueError
+_DECODE_ERRORS: Tuple[Type[Exception], ...] = ()
+
+try:
+    import orjson
+
+    _BACKENDS["orjson"] = orjson.loads
+except ImportError:
+    pass
+
+try:
+    import msgspec
+
+    _BACKENDS["msgspec"] = msgspec.json.Decoder().decode
+    _DECODE_ERRORS += (msgspec.DecodeError,)
+except ImportError:
+    pass
+
+_BACKENDS["json"] = json.loads
+
+_backend_name: Optional[str] = None
+
+
+def available_backends() -> list:
+    """
+    Names of the JSON backends that can be used in this environment, fastest first.
+    """
+    return list(_BACKENDS)
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """
+    Select the backend used by `loads`.
+
+    Args:
+        name: One of `available_backends()`. If None, the MYPOS_JSON_BACKEND
+            environment variable is used, falling back to the fastest installed backend.
+
+    Returns:
+        str: The name of the selected backend.
+    """
+    global _backend_name
+    name = name or os.getenv("MYPOS_JSON_BACKEND") or next(iter(_BACKENDS))
+    if name not in _BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available, choose from {available_backends()}")
+    _backend_name = name
+    logger.debug(f"Using '{name}' JSON backend")
+    return name
+
+
+def get_backend() -> str:
+    """
+    Name of the backend currently used by `loads`.
+    """
+    return _backend_name or set_backend()
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Decode a raw JSON document into Python objects with the selected backend.
+
+    Raises:
+        ValueError: The document is not valid JSON, whatever the backend.
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        return _BACKENDS[get_backend()](data)
+    except _DECODE_ERRORS as e:
+        raise ValueError(str(e)) from e
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def decode(data: Union[bytes, bytearray, str], model: Type[T]) -> T:
+    """
+    Decode raw JSON bytes straight into a schema type.
+
+    Pydantic models and other annotations (e.g. `List[Language]`) are parsed and
+    validated in a single pass by pydantic-core, without building an intermediate
+    dict first.
+
+    Args:
+        data: The raw response body.
+        model: A pydantic model class or any type understood by `TypeAdapter`.
+
+    Returns:
+        The validated object.
+    """
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return model.model_validate_json(data)
+    return _adapter(model).validate_json(data)
@@ -0,0 +1,231 @@
+import heapq
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from ..concurrency import bounded_map
+from ..dates import parse_datetime
+from .fleet import FleetDevice
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityEventType(str, Enum):
+    QUIET = "quiet"
+    RESUMED = "resumed"
+    STATUS_CHANGED = "status_changed"
+    OUTLET_CHANGED = "outlet_changed"
+
+
+class ActivityEvent(NamedTuple):
+    type: ActivityEventType
+    terminal_id: str
+    previous: FleetDevice
+    current: FleetDevice
+
+
+@dataclass(slots=True)
+class DeviceState:
+    """
+    The last observed state of a terminal and when to check it next.
+    """
+    device: FleetDevice
+    checked_at: datetime
+    next_check: datetime
+    quiet: bool = False
+    failures: int = 0
+
+
+class DeviceActivityMonitor:
+    """
+    Incrementally watch a fleet for terminals that stop transacting, change status or move outlet.
+
+    The monitor keeps the last observed `DeviceDetail` of every terminal and a
+    priority queue of when each one is due. A terminal that transacted recently
+    is checked again when it would become quiet, that is `quiet_after` after
+    its `last_transaction_date`. Every terminal is checked at least every
+    `max_interval` to notice status and outlet changes. Each `poll` only
+    fetches the terminals that are due, so the number of detail requests
+    depends on activity and on the interval, not on how often you poll.
+
+    Example:
+        monitor = DeviceActivityMonitor(client.devices.v1_1, quiet_after=timedelta(hours=3))
+        monitor.track(client.devices.v1_1.fleet.snapshot())
+        while True:
+            for event in monitor.poll():
+                alert(event)
+            time.sleep(monitor.seconds_until_due())
+    """
+
+    def __init__(
+        self,
+        devices,
+        quiet_after: timedelta = timedelta(hours=2),
+        min_interval: timedelta = timedelta(minutes=5),
+        max_interval: timedelta = timedelta(hours=6),
+        max_workers: Optional[int] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ) -> None:
+        self.devices = devices
+        self.quiet_after = quiet_after
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_workers = max_workers
+        self.clock = clock
+        self.state: Dict[str, DeviceState] = {}
+        self._heap: List[Tuple[datetime, str]] = []
+        # Added terminals whose details have not been fetched yet: when they are due
+        # and how many checks failed in a row
+        self._pending: Dict[str, Tuple[datetime, int]] = {}
+        self._lock = threading.Lock()
+
+    def _is_quiet(self, device: FleetDevice, now: datetime) -> bool:
+        last = parse_datetime(device.last_transaction_date)
+        return last is None or now - last >= self.quiet_after
+
+    def _next_check(self, device: FleetDevice, now: datetime, quiet: bool) -> datetime:
+        if quiet:
+            return now + self.max_interval
+        # Due when the terminal would become quiet without a new transaction
+        wait = parse_datetime(device.last_transaction_date) + self.quiet_after - now
+        return now + min(self.max_interval, max(self.min_interval, wait))
+
+    def _schedule(self, terminal_id: str, when: datetime) -> None:
+        heapq.heappush(self._heap, (when, terminal_id))
+
+    def track(self, devices: Iterable, checked_at: Optional[datetime] = None) -> None:
+        """
+        Start tracking devices from already fetched details, without emitting events.
+
+        Args:
+            devices: `FleetDevice` or `DeviceDetail` objects, e.g. a fleet snapshot.
+            checked_at: When the details were fetched. Defaults to now.
+        """
+        now = checked_at or self.clock()
+        with self._lock:
+            for device in devices:
+                if not isinstance(device, FleetDevice):
+                    device = FleetDevice.from_detail(device)
+                quiet = self._is_quiet(device, now)
+                next_check = self._next_check(device, now, quiet)
+                self.state[device.terminal_id] = DeviceState(device, now, next_check, quiet)
+                self._schedule(device.terminal_id, next_check)
+
+    def add(self, terminal_ids: Iterable[str]) -> None:
+        """
+        Track terminals whose details have not been fetched yet. They are due immediately,
+        and their first check emits no events.
+        """
+        now = self.clock()
+        with self._lock:
+            for terminal_id in terminal_ids:
+                if terminal_id not in self.state and terminal_id not in self._pending:
+                    self._pending[terminal_id] = (now, 0)
+                    self._schedule(terminal_id, now)
+
+    def remove(self, terminal_id: str) -> None:
+        """
+        Stop tracking a terminal.
+        """
+        with self._lock:
+            self.state.pop(terminal_id, None)
+            self._pending.pop(terminal_id, None)
+
+    def due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[str]:
+        """
+        Pop the terminals due for a check, most overdue first.
+        """
+        now = now or self.clock()
+        terminal_ids: List[str] = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and (limit is None or len(terminal_ids) < limit):
+                when, terminal_id = heapq.heappop(self._heap)
+                state = self.state.get(terminal_id)
+                # Skip entries superseded by a later reschedule or a removal
+                scheduled = state.next_check if state is not None else self._pending.get(terminal_id, (None,))[0]
+                if scheduled != when:
+                    continue
+                terminal_ids.append(terminal_id)
+        return terminal_ids
+
+    def seconds_until_due(self) -> float:
+        """
+        Seconds until the next terminal is due, 0 if one already is.
+        """
+        with self._lock:
+            if not self._heap:
+                return self.max_interval.total_seconds()
+            return max(0.0, (self._heap[0][0] - self.clock()).total_seconds())
+
+    def observe(self, device: FleetDevice, now: Optional[datetime] = None) -> List[ActivityEvent]:
+        """
+        Compare fresh details of a device with its last observed state and reschedule it.
+
+        Returns:
+            List[ActivityEvent]: The changes since the previous observation.
+        """
+        now = now or self.clock()
+        if not isinstance(device, FleetDevice):
+            device = FleetDevice.from_detail(device)
+        quiet = self._is_quiet(device, now)
+        events: List[ActivityEvent] = []
+        with self._lock:
+            previous = self.state.get(device.terminal_id)
+            self._pending.pop(device.terminal_id, None)
+            if previous is not None:
+                old = previous.device
+                if quiet and not previous.quiet:
+                    events.append(ActivityEvent(ActivityEventType.QUIET, device.terminal_id, old, device))
+                elif previous.quiet and not quiet:
+                    events.append(ActivityEvent(ActivityEventType.RESUMED, device.terminal_id, old, device))
+                if old.status != device.status:
+                    events.append(ActivityEvent(ActivityEventType.STATUS_CHANGED, device.terminal_id, old, device))
+                if old.outlet_id != device.outlet_id:
+                    events.append(ActivityEvent(ActivityEventType.OUTLET_CHANGED, device.terminal_id, old, device))
+            next_check = self._next_check(device, now, quiet)
+            self.state[device.terminal_id] = DeviceState(device, now, next_check, quiet)
+            self._schedule(device.terminal_id, next_check)
+        return events
+
+    def _failed(self, terminal_id: str, error: BaseException, now: datetime) -> None:
+        logger.warning(f"Failed to check device {terminal_id}: {error}")
+        with self._lock:
+            state = self.state.get(terminal_id)
+            if state is not None:
+                failures = state.failures + 1
+            elif terminal_id in self._pending:
+                failures = self._pending[terminal_id][1] + 1
+            else:
+                # Removed while it was being checked
+                return
+            next_check = now + min(self.max_interval, self.min_interval * 2 ** min(failures - 1, 32))
+            if state is not None:
+                state.failures = failures
+                state.next_check = next_check
+            else:
+                self._pending[terminal_id] = (next_check, failures)
+            self._schedule(terminal_id, next_check)
+
+    def poll(self, limit: Optional[int] = None) -> List[ActivityEvent]:
+        """
+        Check the terminals that are due, concurrently, and return the resulting events.
+
+        Args:
+            limit: Check at most this many terminals (optional)
+
+        Returns:
+            List[ActivityEvent]: Quiet, resumed, status and outlet changes.
+        """
+        now = self.clock()
+        terminal_ids = self.due(now, limit)
+        events: List[ActivityEvent] = []
+        for result in bounded_map(self.devices.get_device_details, terminal_ids, max_workers=self.max_workers):
+            if result.ok:
+                events.extend(self.observe(result.value, now))
+            else:
+                self._failed(result.item, result.error, now)
+        if terminal_ids:
+            logger.info(f"Checked {len(terminal_ids)} of {len(self.state)} devices, {len(events)} events")
+        return events
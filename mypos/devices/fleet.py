@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from ..concurrency import bounded_map
+from ..dates import parse_datetime
+from ..pagination import iter_items
+from ..records import _intern
+from ..schemas import DeviceDetail
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class FleetDevice:
+    """
+    Compact view of a `DeviceDetail` with the fields needed to manage a fleet.
+    """
+    terminal_id: str
+    terminal_name: str
+    serial_number: str
+    model: str
+    status: str
+    outlet_id: int
+    outlet_name: str
+    device_currency: str
+    settlement_account_number: str
+    settlement_account_name: str
+    last_transaction_date: str
+    transactions_count: int
+
+    @classmethod
+    def from_detail(cls, detail: DeviceDetail) -> "FleetDevice":
+        return cls(
+            terminal_id=detail.terminal_id,
+            terminal_name=detail.terminal_name,
+            serial_number=detail.serial_number,
+            model=_intern(detail.model),
+            status=_intern(detail.status),
+            outlet_id=detail.outlet_id,
+            outlet_name=_intern(detail.outlet_name),
+            device_currency=_intern(detail.device_currency),
+            settlement_account_number=_intern(detail.settlement_account_number),
+            settlement_account_name=_intern(detail.settlement_account_name),
+            last_transaction_date=detail.last_transaction_date,
+            transactions_count=detail.transactions_count,
+        )
+
+    @property
+    def parsed_last_transaction_date(self) -> Optional[datetime]:
+        """`last_transaction_date` as a datetime."""
+        return parse_datetime(self.last_transaction_date)
+
+
+class FleetTable:
+    """
+    A snapshot of the fleet, indexed by terminal ID, outlet and settlement account.
+    """
+
+    def __init__(self, devices: Iterable[FleetDevice], errors: Optional[Dict[str, BaseException]] = None) -> None:
+        self.by_terminal: Dict[str, FleetDevice] = {}
+        self.by_outlet: Dict[int, List[str]] = {}
+        self.by_settlement_account: Dict[str, List[str]] = {}
+        self.errors: Dict[str, BaseException] = errors or {}
+        for device in devices:
+            self.by_terminal[device.terminal_id] = device
+            self.by_outlet.setdefault(device.outlet_id, []).append(device.terminal_id)
+            self.by_settlement_account.setdefault(device.settlement_account_number, []).append(device.terminal_id)
+
+    def __len__(self) -> int:
+        return len(self.by_terminal)
+
+    def __iter__(self) -> Iterator[FleetDevice]:
+        return iter(self.by_terminal.values())
+
+    def __contains__(self, terminal_id: str) -> bool:
+        return terminal_id in self.by_terminal
+
+    def get(self, terminal_id: str) -> Optional[FleetDevice]:
+        return self.by_terminal.get(terminal_id)
+
+    def outlet(self, outlet_id: int) -> List[FleetDevice]:
+        """
+        Devices assigned to an outlet.
+        """
+        return [self.by_terminal[t] for t in self.by_outlet.get(outlet_id, [])]
+
+    def settlement_account(self, account_number: str) -> List[FleetDevice]:
+        """
+        Devices settling to an account.
+        """
+        return [self.by_terminal[t] for t in self.by_settlement_account.get(account_number, [])]
+
+
+class Fleet:
+    """
+    Fleet-wide device details without the N+1 loop over `get_device_details`.
+
+    Pages through `DevicesV1_1.list` and fans the detail requests out over a
+    thread pool as each page of terminal IDs arrives. Requests share the client's host limiter, so concurrency and
+    rate stay within the configured limits. Details are cached for `ttl`
+    seconds, so repeated snapshots only fetch new or expired devices. The
+    cache keeps at most `max_entries` devices, evicting the least recently
+    used ones.
+
+    Example:
+        fleet = client.devices.v1_1.fleet
+        table = fleet.snapshot()
+        for device in table.outlet(42):
+            print(device.terminal_id, device.status)
+    """
+
+    def __init__(self, devices, max_workers: Optional[int] = None, ttl: float = 300, page_size: int = 100, max_entries: int = 50_000) -> None:
+        self.devices = devices
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.page_size = page_size
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[float, FleetDevice]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def terminal_ids(self, model: Optional[str] = None) -> Iterator[str]:
+        """
+        Page through the device list and yield every terminal ID.
+        """
+        for device in iter_items(lambda page: self.devices.list(page=page, size=self.page_size, model=model), "devices"):
+            yield device.terminal_id
+
+    def cached(self, terminal_id: str) -> Optional[FleetDevice]:
+        """
+        The cached entry of a device, if not expired.
+        """
+        with self._lock:
+            entry = self._cache.get(terminal_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._cache[terminal_id]
+                return None
+            self._cache.move_to_end(terminal_id)
+            return entry[1]
+
+    def fetch(self, terminal_id: str) -> FleetDevice:
+        """
+        Fetch the details of one device and cache them.
+        """
+        device = FleetDevice.from_detail(self.devices.get_device_details(terminal_id))
+        with self._lock:
+            self._cache[terminal_id] = (time.monotonic(), device)
+            self._cache.move_to_end(terminal_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return device
+
+    def invalidate(self, terminal_id: Optional[str] = None) -> None:
+        """
+        Drop one device, or the whole fleet, from the cache.
+        """
+        with self._lock:
+            if terminal_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(terminal_id, None)
+
+    def details(self, terminal_ids: Iterable[str], refresh: bool = False) -> Tuple[List[FleetDevice], Dict[str, BaseException]]:
+        """
+        Get the details of many devices, fetching missing or expired ones concurrently.
+        `terminal_ids` is read lazily, so fetching starts before it is exhausted.
+
+        Returns:
+            Tuple[List[FleetDevice], Dict[str, BaseException]]: The devices, and the
+            errors of the detail requests that failed, by terminal ID.
+        """
+        devices: List[FleetDevice] = []
+
+        def missing() -> Iterator[str]:
+            # Read lazily, so detail requests start while later pages of IDs are listed
+            for terminal_id in terminal_ids:
+                device = None if refresh else self.cached(terminal_id)
+                if device is None:
+                    yield terminal_id
+                else:
+                    devices.append(device)
+
+        errors: Dict[str, BaseException] = {}
+        for result in bounded_map(self.fetch, missing(), max_workers=self.max_workers):
+            if result.ok:
+                devices.append(result.value)
+            else:
+                logger.warning(f"Failed to get details of device {result.item}: {result.error}")
+                errors[result.item] = result.error
+        return devices, errors
+
+    def snapshot(self, model: Optional[str] = None, refresh: bool = False) -> FleetTable:
+        """
+        Take a snapshot of the fleet.
+
+        Args:
+            model: Only include devices of this model (optional)
+            refresh: Ignore cached details. Default is False.
+
+        Returns:
+            FleetTable: The devices indexed by terminal ID, outlet and settlement account.
+        """
+        devices, errors = self.details(self.terminal_ids(model=model), refresh=refresh)
+        logger.info(f"Fleet snapshot: {len(devices)} devices, {len(errors)} errors")
+        return FleetTable(devices, errors)
@@ -0,0 +1,297 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+from ..pagination import iter_items, iter_newer
+from ..schemas import DeviceTransaction, ReceiptDetail
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiptCache:
+    """
+    Thread-safe LRU cache of receipts by payment reference.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, payment_reference: str) -> bool:
+        return self.get(payment_reference) is not None
+
+    def get(self, payment_reference: str) -> Optional[ReceiptDetail]:
+        with self._lock:
+            entry = self._entries.get(payment_reference)
+            if entry is None:
+                return None
+            stored_at, receipt = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[payment_reference]
+                return None
+            self._entries.move_to_end(payment_reference)
+            return receipt
+
+    def put(self, payment_reference: str, receipt: ReceiptDetail) -> None:
+        with self._lock:
+            self._entries[payment_reference] = (time.monotonic(), receipt)
+            self._entries.move_to_end(payment_reference)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class TransactionPoller:
+    """
+    Incrementally poll `DevicesV1_1.list_transactions` for transactions not seen before.
+
+    The poller keeps a watermark, the newest transaction date seen, and re-reads
+    from the watermark's day. Paging stops at the first transaction older than
+    the watermark once the listing was checked to be newest first, see
+    `mypos.pagination.iter_newer`.
+
+    Transactions are identified by terminal, STAN and date, which do not change
+    when they settle. The payment reference is only set at settlement, so
+    transactions returned without one are kept pending and returned again by
+    the first poll that shows their payment reference. Pending transactions are
+    re-read from the day of the oldest one, and given up after `pending_days`
+    days behind the watermark.
+    """
+
+    def __init__(
+        self,
+        devices,
+        terminal_id: Optional[str] = None,
+        page_size: int = 100,
+        since: Optional[datetime] = None,
+        pending_days: int = 3
+    ) -> None:
+        self.devices = devices
+        self.terminal_id = terminal_id
+        self.page_size = page_size
+        self.pending_days = pending_days
+        self.watermark = since.strftime("%Y-%m-%d %H:%M:%S") if since else datetime.now().strftime("%Y-%m-%d 00:00:00")
+        self._seen_at_watermark: Set[str] = set()
+        # Identity -> date of the transactions returned without a payment reference
+        self._pending: Dict[str, str] = {}
+
+    @staticmethod
+    def _identity(transaction: DeviceTransaction) -> str:
+        return f"{transaction.terminal_id}:{transaction.stan}:{transaction.date}"
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of transactions waiting for their payment reference.
+        """
+        return len(self._pending)
+
+    def _expire_pending(self) -> None:
+        limit = (datetime.strptime(self.watermark, "%Y-%m-%d %H:%M:%S") - timedelta(days=self.pending_days)).strftime("%Y-%m-%d %H:%M:%S")
+        expired = [identity for identity, date in self._pending.items() if date < limit]
+        for identity in expired:
+            del self._pending[identity]
+        if expired:
+            logger.warning(f"Gave up on {len(expired)} transactions without a payment reference since {limit}")
+
+    def poll(self) -> List[DeviceTransaction]:
+        """
+        Get the transactions that appeared since the last poll, and those that got
+        their payment reference since.
+        """
+        self._expire_pending()
+        cutoff = min([self.watermark, *self._pending.values()])
+        pages = iter_items(lambda page: self.devices.list_transactions(
+            page=page, size=self.page_size, from_date=cutoff[:10], terminal_id=self.terminal_id
+        ), "transactions")
+        new: List[DeviceTransaction] = []
+        for transaction in iter_newer(pages, lambda t: t.date, cutoff, self.page_size):
+            identity = self._identity(transaction)
+            if identity in self._pending:
+                if transaction.payment_reference:
+                    del self._pending[identity]
+                    new.append(transaction)
+                continue
+            if transaction.date < self.watermark:
+                continue
+            if transaction.date == self.watermark and identity in self._seen_at_watermark:
+                continue
+            new.append(transaction)
+            if not transaction.payment_reference:
+                self._pending[identity] = transaction.date
+
+        if new:
+            newest = max(t.date for t in new)
+            if newest > self.watermark:
+                self.watermark = newest
+                self._seen_at_watermark = set()
+            self._seen_at_watermark.update(self._identity(t) for t in new if t.date == self.watermark)
+        return new
+
+
+class ReceiptPrefetcher:
+    """
+    Fetch receipts ahead of time so receipt views are served from a local cache.
+
+    Payment references are queued from polled transactions (`feed_transactions`)
+    or webhook notifications (`feed_notification`) and fetched by a fixed pool
+    of worker threads. The queue is bounded: when it is full, new references
+    are dropped and fetched on demand instead, so a burst cannot grow memory or
+    request volume without limit.
+
+    Example:
+        with ReceiptPrefetcher(client.devices.v1_1, max_workers=4) as prefetcher:
+            poller = TransactionPoller(client.devices.v1_1)
+            while running:
+                prefetcher.feed_transactions(poller.poll())
+                time.sleep(5)
+
+        # In the request handler
+        receipt = prefetcher.get(payment_reference)
+    """
+
+    def __init__(
+        self,
+        devices,
+        cache: Optional[ReceiptCache] = None,
+        max_workers: int = 4,
+        max_queue: int = 1000
+    ) -> None:
+        self.devices = devices
+        self.cache = cache or ReceiptCache()
+        self.max_workers = max_workers
+        self.stats: Counter = Counter()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_queue)
+        self._in_flight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+
+    def start(self) -> "ReceiptPrefetcher":
+        """
+        Start the worker threads.
+        """
+        if not self._workers:
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._work, name=f"mypos-receipts-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        return self
+
+    def stop(self) -> None:
+        """
+        Fetch what is queued, then stop the worker threads.
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def __enter__(self) -> "ReceiptPrefetcher":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def submit(self, payment_reference: str) -> bool:
+        """
+        Queue a receipt for prefetching.
+
+        Returns:
+            bool: False if the queue is full and the reference was dropped.
+        """
+        if not payment_reference or self.cache.get(payment_reference) is not None:
+            return True
+        with self._lock:
+            if payment_reference in self._in_flight:
+                return True
+            self._in_flight[payment_reference] = threading.Event()
+        try:
+            self._queue.put_nowait(payment_reference)
+        except queue.Full:
+            with self._lock:
+                self._in_flight.pop(payment_reference).set()
+                self.stats["dropped"] += 1
+            return False
+        self._count("queued")
+        return True
+
+    def feed_transactions(self, transactions: Iterable[DeviceTransaction]) -> int:
+        """
+        Queue the receipts of new transactions. Transactions without a payment reference are
+        skipped, `TransactionPoller` returns them again once they have one.
+
+        Returns:
+            int: The number of references dropped because the queue was full.
+        """
+        return sum(not self.submit(t.payment_reference) for t in transactions if t.payment_reference)
+
+    def feed_notification(self, payload: Dict[str, Any], field: str = "payment_reference") -> bool:
+        """
+        Queue the receipt referenced by a webhook notification payload.
+
+        Args:
+            payload: The notification payload.
+            field: The payload field holding the payment reference. Default is "payment_reference".
+        """
+        payment_reference = payload.get(field)
+        return self.submit(payment_reference) if payment_reference else False
+
+    def _fetch(self, payment_reference: str) -> Optional[ReceiptDetail]:
+        try:
+            receipt = self.devices.get_receipt_details(payment_reference)
+        except Exception as e:
+            logger.warning(f"Failed to prefetch receipt {payment_reference}: {e}")
+            self._count("failed")
+            return None
+        self.cache.put(payment_reference, receipt)
+        self._count("prefetched")
+        return receipt
+
+    def _work(self) -> None:
+        while True:
+            payment_reference = self._queue.get()
+            if payment_reference is None:
+                return
+            try:
+                self._fetch(payment_reference)
+            finally:
+                with self._lock:
+                    event = self._in_flight.pop(payment_reference, None)
+                if event is not None:
+                    event.set()
+
+    def get(self, payment_reference: str, timeout: Optional[float] = 5.0) -> ReceiptDetail:
+        """
+        Get a receipt from the cache, waiting for a prefetch in progress or fetching it on demand.
+
+        Args:
+            payment_reference: The unique reference of the transaction
+            timeout: How long to wait for a queued prefetch before fetching on demand. Default is 5 seconds.
+        """
+        receipt = self.cache.get(payment_reference)
+        if receipt is not None:
+            self._count("hits")
+            return receipt
+        with self._lock:
+            event = self._in_flight.get(payment_reference)
+        if event is not None and event.wait(timeout):
+            receipt = self.cache.get(payment_reference)
+            if receipt is not None:
+                self._count("waited")
+                return receipt
+        self._count("misses")
+        receipt = self.devices.get_receipt_details(payment_reference)
+        self.cache.put(payment_reference, receipt)
+        return receipt
@@ -0,0 +1,243 @@
+import csv
+import logging
+from collections import defaultdict
+from enum import Enum
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from ..base import is_definite_failure
+from ..concurrency import bounded_map
+from ..journal import Journal
+from ..limits import RateLimiter
+from ..pagination import iter_items
+from ..schemas import DeviceTransaction
+
+logger = logging.getLogger(__name__)
+
+
+class RefundItem(NamedTuple):
+    terminal_id: str
+    reference_number: str
+    amount: float
+    key: Optional[str] = None
+
+    @property
+    def idempotency_key(self) -> str:
+        """
+        Identifies the refund in the journal. Defaults to terminal, reference number and amount,
+        set `key` to issue several refunds of the same amount on one transaction.
+        """
+        return self.key or f"{self.terminal_id}:{self.reference_number}:{self.amount:.2f}"
+
+
+class RefundStatus(str, Enum):
+    REFUNDED = "refunded"
+    ALREADY_REFUNDED = "already_refunded"
+    IN_DOUBT = "in_doubt"
+    REJECTED = "rejected"
+    FAILED = "failed"
+    VALIDATED = "validated"
+
+
+class RefundResult(NamedTuple):
+    item: RefundItem
+    status: RefundStatus
+    message: str = ""
+    original: Optional[DeviceTransaction] = None
+
+
+def load_refunds_csv(path: str) -> List[RefundItem]:
+    """
+    Read refunds from a CSV file with `terminal_id`, `reference_number`, `amount` and
+    optionally `key` columns.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        return [
+            RefundItem(row["terminal_id"].strip(), row["reference_number"].strip(), float(row["amount"]), (row.get("key") or "").strip() or None)
+            for row in csv.DictReader(f)
+        ]
+
+
+def write_report_csv(results: Iterable[RefundResult], path: str) -> None:
+    """
+    Write a per-item refund report.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["terminal_id", "reference_number", "amount", "key", "status", "message"])
+        for result in results:
+            item = result.item
+            writer.writerow([item.terminal_id, item.reference_number, item.amount, item.idempotency_key, result.status.value, result.message])
+
+
+class BatchRefunder:
+    """
+    Run many `DevicesV1_1.refund` calls safely.
+
+    Every refund is checked against its original transaction (looked up with
+    `list_device_transactions` by reference number). The refunds of a
+    transaction, including earlier ones from the journal, may not exceed its
+    amount. Before a refund is submitted, its intent is fsynced to the journal,
+    and the outcome is recorded after the API answers. Only a 4xx answer is
+    recorded as failed. A refund whose intent was recorded without an outcome
+    (a crash, a connection lost mid-request, a 5xx, an unexpected error or a
+    failure to journal the outcome) is reported as `in_doubt` and never
+    resubmitted automatically. Re-running a batch therefore never refunds an
+    item twice.
+
+    Example:
+        refunder = BatchRefunder(client.devices.v1_1, "refunds.journal", max_workers=4, rate=2)
+        results = refunder.run(load_refunds_csv("disputes.csv"))
+        write_report_csv(results, "disputes-report.csv")
+    """
+
+    def __init__(
+        self,
+        devices,
+        journal: Union[str, Journal],
+        max_workers: int = 4,
+        rate: Optional[float] = None,
+        amount_tolerance: float = 0.005
+    ) -> None:
+        self.devices = devices
+        self.journal = journal if isinstance(journal, Journal) else Journal(journal)
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate) if rate else None
+        self.amount_tolerance = amount_tolerance
+
+    def find_original(self, terminal_id: str, reference_number: str) -> Optional[DeviceTransaction]:
+        """
+        Look up the transaction a refund refers to, through every page of the terminal's
+        transactions with that reference number.
+        """
+        transactions = iter_items(lambda page: self.devices.list_device_transactions(
+            terminal_id, page=page, size=100, reference_number=reference_number
+        ), "transactions")
+        for transaction in transactions:
+            if transaction.reference_number == reference_number and transaction.amount > 0:
+                return transaction
+        return None
+
+    def _refunded_amounts(self, journal_state: Dict[str, dict]) -> Dict[Tuple[str, str], float]:
+        # Refunds that were, or may have been, submitted count against the original amount
+        refunded: Dict[Tuple[str, str], float] = defaultdict(float)
+        for record in journal_state.values():
+            if record["state"] in ("intent", "done"):
+                refunded[(record["terminal_id"], record["reference_number"])] += record["amount"]
+        return refunded
+
+    def validate(self, items: Iterable[RefundItem]) -> Tuple[List[RefundResult], List[RefundResult]]:
+        """
+        Check a batch against the journal and the original transactions.
+
+        Returns:
+            Tuple[List[RefundResult], List[RefundResult]]: The refunds that can be
+            submitted (status `validated`), and the results of those that cannot.
+        """
+        accepted, settled = self._validate(list(enumerate(items)))
+        return [result for _, result in accepted], [result for _, result in settled]
+
+    def _validate(self, items: List[Tuple[int, RefundItem]]) -> Tuple[List[Tuple[int, RefundResult]], List[Tuple[int, RefundResult]]]:
+        # Results are paired with the position of their item in the batch
+        journal_state = self.journal.latest("key")
+        refunded = self._refunded_amounts(journal_state)
+        accepted: List[Tuple[int, RefundResult]] = []
+        settled: List[Tuple[int, RefundResult]] = []
+
+        pending: List[Tuple[int, RefundItem]] = []
+        seen = set()
+        for index, item in items:
+            key = item.idempotency_key
+            record = journal_state.get(key)
+            if key in seen:
+                settled.append((index, RefundResult(item, RefundStatus.REJECTED, "Duplicate item in batch")))
+            elif record is not None and record["state"] == "done":
+                settled.append((index, RefundResult(item, RefundStatus.ALREADY_REFUNDED, f"Refunded at {record['ts']}")))
+            elif record is not None and record["state"] == "intent":
+                settled.append((index, RefundResult(item, RefundStatus.IN_DOUBT, "Submitted before without a recorded outcome, check it manually")))
+            elif item.amount <= 0:
+                settled.append((index, RefundResult(item, RefundStatus.REJECTED, "Amount must be positive")))
+            else:
+                pending.append((index, item))
+            seen.add(key)
+
+        originals: Dict[Tuple[str, str], Optional[DeviceTransaction]] = {}
+        lookups = list(dict.fromkeys((item.terminal_id, item.reference_number) for _, item in pending))
+        for result in bounded_map(lambda k: self.find_original(*k), lookups, max_workers=self.max_workers):
+            if result.ok:
+                originals[result.item] = result.value
+            else:
+                logger.warning(f"Failed to look up transaction {result.item}: {result.error}")
+                originals[result.item] = result.error
+
+        for index, item in pending:
+            original = originals[(item.terminal_id, item.reference_number)]
+            if isinstance(original, BaseException):
+                settled.append((index, RefundResult(item, RefundStatus.FAILED, f"Lookup failed: {original}")))
+                continue
+            if original is None:
+                settled.append((index, RefundResult(item, RefundStatus.REJECTED, "Original transaction not found")))
+                continue
+            transaction = (item.terminal_id, item.reference_number)
+            available = original.amount - refunded[transaction]
+            if item.amount > available + self.amount_tolerance:
+                settled.append((index, RefundResult(item, RefundStatus.REJECTED, f"Exceeds refundable amount {available:.2f} {original.currency}", original)))
+                continue
+            refunded[transaction] += item.amount
+            accepted.append((index, RefundResult(item, RefundStatus.VALIDATED, "", original)))
+        return accepted, settled
+
+    def _submit(self, validated: RefundResult) -> RefundResult:
+        item = validated.item
+        record = {
+            "key": item.idempotency_key,
+            "terminal_id": item.terminal_id,
+            "reference_number": item.reference_number,
+            "amount": item.amount,
+        }
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.journal.append({**record, "state": "intent"})
+        try:
+            self.devices.refund(item.terminal_id, item.reference_number, item.amount)
+        except Exception as e:
+            if not is_definite_failure(e):
+                # The refund may have been applied, leave the intent in place
+                logger.error(f"Refund {item.idempotency_key} is in doubt: {e}")
+                return RefundResult(item, RefundStatus.IN_DOUBT, str(e), validated.original)
+            self.journal.append({**record, "state": "failed", "error": str(e)})
+            return RefundResult(item, RefundStatus.FAILED, str(e), validated.original)
+        try:
+            self.journal.append({**record, "state": "done"})
+        except Exception as e:
+            # The refund was applied, but a rerun will only see its intent
+            logger.error(f"Refund {item.idempotency_key} was applied but its outcome was not journaled: {e}")
+            return RefundResult(item, RefundStatus.IN_DOUBT, f"Refunded, but the outcome could not be journaled: {e}", validated.original)
+        return RefundResult(item, RefundStatus.REFUNDED, "", validated.original)
+
+    def run(self, items: Iterable[RefundItem], dry_run: bool = False) -> List[RefundResult]:
+        """
+        Validate and submit a batch of refunds.
+
+        Args:
+            items: The refunds, e.g. from `load_refunds_csv`.
+            dry_run: Only validate, nothing is submitted or journaled. Default is False.
+
+        Returns:
+            List[RefundResult]: One result per item, in input order.
+        """
+        items = list(items)
+        accepted, results = self._validate(list(enumerate(items)))
+        if not dry_run:
+            submitted = bounded_map(lambda pair: (pair[0], self._submit(pair[1])), accepted, max_workers=self.max_workers)
+            for task in submitted:
+                index, validated = task.item
+                # Only what fails before the refund is sent is raised, e.g. the intent append
+                results.append(task.value if task.ok else (index, RefundResult(validated.item, RefundStatus.FAILED, str(task.error))))
+        else:
+            results.extend(accepted)
+
+        results.sort(key=lambda pair: pair[0])
+        summary = defaultdict(int)
+        for _, result in results:
+            summary[result.status.value] += 1
+        logger.info(f"Refund batch of {len(items)}: {dict(summary)}")
+        return [result for _, result in results]
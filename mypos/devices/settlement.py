@@ -0,0 +1,263 @@
+import logging
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from ..concurrency import bounded_map
+from ..dates import parse_datetime
+from ..pagination import iter_items
+from ..schemas import DeviceTransaction
+
+logger = logging.getLogger(__name__)
+
+
+def transaction_key(transaction: Any) -> str:
+    """
+    A key identifying a device transaction before and after settlement. The payment
+    reference is only set on settled transactions, so it cannot be used.
+    """
+    return f"{transaction.terminal_id}:{transaction.rrn}:{transaction.stan}:{transaction.date}"
+
+
+@dataclass(slots=True)
+class OpenTransaction:
+    """
+    The fields of an unsettled `DeviceTransaction` kept by the tracker.
+    """
+    terminal_id: str
+    date: str
+    amount: float
+    currency: str
+    tran_status: str
+    payment_status: str
+
+    @classmethod
+    def from_transaction(cls, transaction: DeviceTransaction) -> "OpenTransaction":
+        return cls(
+            transaction.terminal_id,
+            transaction.date,
+            transaction.amount,
+            sys.intern(transaction.currency),
+            sys.intern(transaction.tran_status),
+            sys.intern(transaction.payment_status),
+        )
+
+
+class SettlementEventType(str, Enum):
+    OPENED = "opened"
+    SETTLED = "settled"
+    STATUS_CHANGED = "status_changed"
+    EXPIRED = "expired"
+
+
+class SettlementEvent(NamedTuple):
+    """
+    A change of a tracked transaction. `expired` events have no `transaction`, the
+    last known state is in `previous` and its age in `lag`.
+    """
+    type: SettlementEventType
+    key: str
+    transaction: Optional[DeviceTransaction]
+    previous: Optional[OpenTransaction] = None
+    lag: Optional[timedelta] = None
+
+
+class SettlementMetrics(NamedTuple):
+    open_count: int
+    open_amounts: Dict[str, float]
+    oldest_open: Optional[str]
+    settled_count: int
+    lag_p50: Optional[timedelta]
+    lag_p90: Optional[timedelta]
+    lag_max: Optional[timedelta]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class SettlementTracker:
+    """
+    Track device transactions until they settle, without re-reading whole date ranges.
+
+    Only unsettled transactions are kept, in a compact index. `refresh` groups
+    their dates into day windows and re-queries only those windows
+    concurrently, so the work per refresh depends on how many days have open
+    transactions, not on the length of the period. Transactions settle when
+    `settlement_date` is set. Transactions still open `max_open_days` after
+    their date (e.g. declined or voided ones that never settle) expire, so they
+    do not keep their window in every refresh. Settlement lags are kept for the
+    most recent `lag_samples` settlements to report percentiles.
+
+    Example:
+        tracker = SettlementTracker(client.devices.v1_1)
+        tracker.scan("2025-01-01", "2025-01-31")
+        while tracker.open:
+            for event in tracker.refresh():
+                print(event.type, event.key, event.lag)
+            print(tracker.metrics())
+            time.sleep(3600)
+    """
+
+    def __init__(
+        self,
+        devices,
+        page_size: int = 1000,
+        max_gap_days: int = 0,
+        max_workers: Optional[int] = None,
+        lag_samples: int = 10000,
+        max_open_days: Optional[int] = 30,
+        clock: Callable[[], datetime] = datetime.now
+    ) -> None:
+        self.devices = devices
+        self.page_size = page_size
+        self.max_gap_days = max_gap_days
+        self.max_workers = max_workers
+        self.max_open_days = max_open_days
+        self.clock = clock
+        self.open: Dict[str, OpenTransaction] = {}
+        self.settled_count = 0
+        self.expired_count = 0
+        self._lags: Deque[float] = deque(maxlen=lag_samples)
+        self._lock = threading.Lock()
+
+    def ingest(self, transactions: Iterable[DeviceTransaction]) -> List[SettlementEvent]:
+        """
+        Add unsettled transactions to the index. Settled ones are ignored.
+
+        Returns:
+            List[SettlementEvent]: An `opened` event per transaction not tracked before.
+        """
+        events: List[SettlementEvent] = []
+        with self._lock:
+            for transaction in transactions:
+                if transaction.settlement_date:
+                    continue
+                key = transaction_key(transaction)
+                if key not in self.open:
+                    self.open[key] = OpenTransaction.from_transaction(transaction)
+                    events.append(SettlementEvent(SettlementEventType.OPENED, key, transaction))
+        return events
+
+    def scan(self, from_date: str, to_date: str, terminal_id: Optional[str] = None) -> List[SettlementEvent]:
+        """
+        Read a date range once and start tracking its unsettled transactions.
+
+        Args:
+            from_date: Starting date in format YYYY-MM-DD
+            to_date: End date in format YYYY-MM-DD
+            terminal_id: Only scan this terminal (optional)
+        """
+        return self.ingest(self._read(from_date, to_date, terminal_id))
+
+    def _read(self, from_date: str, to_date: str, terminal_id: Optional[str] = None) -> Iterable[DeviceTransaction]:
+        return iter_items(lambda page: self.devices.stream_transactions(
+            page=page, size=self.page_size, from_date=from_date, to_date=to_date, terminal_id=terminal_id
+        ))
+
+    def windows(self) -> List[Tuple[str, str]]:
+        """
+        The day ranges covering the open transactions. Consecutive days are one window,
+        and windows separated by at most `max_gap_days` days without open transactions
+        are merged.
+        """
+        with self._lock:
+            days = sorted({parse_datetime(t.date).date() for t in self.open.values()})
+        windows: List[Tuple[date, date]] = []
+        for day in days:
+            if windows and (day - windows[-1][1]).days <= self.max_gap_days + 1:
+                windows[-1] = (windows[-1][0], day)
+            else:
+                windows.append((day, day))
+        return [(start.isoformat(), end.isoformat()) for start, end in windows]
+
+    def _read_open(self, window: Tuple[str, str], open_keys: FrozenSet[str]) -> List[Tuple[str, DeviceTransaction]]:
+        # Runs on a worker thread, keeps only the tracked transactions of the window.
+        # `open_keys` is a snapshot, `self.open` changes under the lock meanwhile.
+        found = []
+        for transaction in self._read(*window):
+            key = transaction_key(transaction)
+            if key in open_keys:
+                found.append((key, transaction))
+        return found
+
+    def expire(self) -> List[SettlementEvent]:
+        """
+        Stop tracking the transactions open for more than `max_open_days`.
+
+        Returns:
+            List[SettlementEvent]: An `expired` event per transaction removed.
+        """
+        if self.max_open_days is None:
+            return []
+        now = self.clock()
+        cutoff = (now - timedelta(days=self.max_open_days)).strftime("%Y-%m-%d %H:%M:%S")
+        events: List[SettlementEvent] = []
+        with self._lock:
+            for key in [key for key, transaction in self.open.items() if transaction.date < cutoff]:
+                previous = self.open.pop(key)
+                self.expired_count += 1
+                events.append(SettlementEvent(SettlementEventType.EXPIRED, key, None, previous, now - parse_datetime(previous.date)))
+        if events:
+            logger.warning(f"Expired {len(events)} transactions open for more than {self.max_open_days} days")
+        return events
+
+    def refresh(self) -> List[SettlementEvent]:
+        """
+        Expire the transactions open for too long, then re-query the windows of the
+        remaining open transactions and apply the changes.
+
+        Returns:
+            List[SettlementEvent]: `expired`, `settled` and `status_changed` events.
+        """
+        events = self.expire()
+        windows = self.windows()
+        with self._lock:
+            open_keys = frozenset(self.open)
+        for result in bounded_map(lambda window: self._read_open(window, open_keys), windows, max_workers=self.max_workers):
+            if not result.ok:
+                logger.warning(f"Failed to refresh settlement window {result.item}: {result.error}")
+                continue
+            for key, transaction in result.value:
+                event = self._apply(key, transaction)
+                if event is not None:
+                    events.append(event)
+        logger.info(f"Refreshed {len(windows)} windows: {len(events)} changes, {len(self.open)} open")
+        return events
+
+    def _apply(self, key: str, transaction: DeviceTransaction) -> Optional[SettlementEvent]:
+        with self._lock:
+            previous = self.open.get(key)
+            if previous is None:
+                return None
+            if transaction.settlement_date:
+                del self.open[key]
+                self.settled_count += 1
+                lag = transaction.parsed_settlement_date - transaction.parsed_date
+                self._lags.append(lag.total_seconds())
+                return SettlementEvent(SettlementEventType.SETTLED, key, transaction, previous, lag)
+            if previous.tran_status != transaction.tran_status or previous.payment_status != transaction.payment_status:
+                self.open[key] = OpenTransaction.from_transaction(transaction)
+                return SettlementEvent(SettlementEventType.STATUS_CHANGED, key, transaction, previous)
+        return None
+
+    def metrics(self) -> SettlementMetrics:
+        """
+        Open exposure and settlement lag percentiles.
+        """
+        with self._lock:
+            amounts: Dict[str, float] = {}
+            for transaction in self.open.values():
+                amounts[transaction.currency] = amounts.get(transaction.currency, 0.0) + transaction.amount
+            oldest = min((t.date for t in self.open.values()), default=None)
+            lags = sorted(self._lags)
+            settled_count = self.settled_count
+            open_count = len(self.open)
+        seconds = [_percentile(lags, 0.5), _percentile(lags, 0.9), lags[-1]] if lags else [None] * 3
+        return SettlementMetrics(
+            open_count, amounts, oldest, settled_count,
+            *(timedelta(seconds=s) if s is not None else None for s in seconds)
+        )
@@ -0,0 +1,226 @@
+import heapq
+import logging
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+from ..concurrency import default_workers
+from ..pagination import _is_last_page
+from ..schemas import DeviceTransaction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class TerminalStats:
+    """
+    Progress and timing of the page walk of one terminal.
+    """
+    terminal_id: str
+    pages: int = 0
+    transactions: int = 0
+    seconds: float = 0.0
+    done: bool = False
+    error: Optional[BaseException] = None
+
+
+class FetchProgress(NamedTuple):
+    terminals_done: int
+    terminals_total: int
+    pages: int
+    transactions: int
+    elapsed: float
+
+
+class _Descending:
+    """Heap key inverting the order of a string."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return self.value > other.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+class MultiTerminalFetch:
+    """
+    Fetch the transactions of many terminals concurrently and merge them into one stream.
+
+    The page walks of all terminals share a thread pool. Terminals are scheduled
+    round-robin, with at most one page in flight per terminal, so a terminal with
+    thousands of transactions gets one slot per round like every other terminal
+    instead of holding the pool. Pages are fetched ahead only while a terminal's
+    buffer holds less than a page, so memory stays bounded by the number of
+    terminals times the page size.
+
+    With `ordered=True`, the streams are k-way merged into a single stream
+    ordered by date. This relies on each terminal's pages being ordered the
+    same way (newest first, the order of the API list endpoints described in
+    `mypos.pagination.iter_newer`, or oldest first with `descending=False`).
+
+    Example:
+        fetch = MultiTerminalFetch(client.devices.v1_1, max_workers=8)
+        for transaction in fetch.fetch(terminal_ids, from_date="2025-01-01", to_date="2025-01-31"):
+            report(transaction)
+        for stats in fetch.stats.values():
+            print(stats.terminal_id, stats.pages, stats.seconds)
+    """
+
+    def __init__(
+        self,
+        devices,
+        max_workers: Optional[int] = None,
+        page_size: int = 100,
+        progress: Optional[Callable[[FetchProgress], None]] = None
+    ) -> None:
+        self.devices = devices
+        self.max_workers = max_workers or default_workers()
+        self.page_size = page_size
+        self.progress = progress
+        self.stats: Dict[str, TerminalStats] = {}
+
+    def fetch(
+        self,
+        terminal_ids: Iterable[str],
+        ordered: bool = True,
+        descending: bool = True,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        from_amount: Optional[float] = None,
+        to_amount: Optional[float] = None
+    ) -> Iterator[DeviceTransaction]:
+        """
+        Iterate over the transactions of all terminals.
+
+        Args:
+            terminal_ids: The terminals to fetch.
+            ordered: Merge the terminals into a single stream ordered by date. Default is True.
+                Otherwise transactions are yielded as their pages arrive.
+            descending: Newest first. Default is True.
+            from_date: Starting date in format YYYY-MM-DD (optional)
+            to_date: End date in format YYYY-MM-DD (optional)
+            from_amount: Minimum transaction amount (optional)
+            to_amount: Maximum transaction amount (optional)
+
+        Failed terminals do not stop the fetch, their error is kept in `stats`.
+        """
+        filters = {
+            "from_date": from_date, "to_date": to_date,
+            "from_amount": from_amount, "to_amount": to_amount,
+        }
+        self.stats = {terminal_id: TerminalStats(terminal_id) for terminal_id in dict.fromkeys(terminal_ids)}
+        self._started = time.monotonic()
+        buffers: Dict[str, Deque[DeviceTransaction]] = {terminal_id: deque() for terminal_id in self.stats}
+        next_page: Dict[str, int] = dict.fromkeys(self.stats, 1)
+        queue: Deque[str] = deque(self.stats)
+        in_flight: Set[Future] = set()
+        # Terminals without a buffered transaction hold back the ordered merge
+        starved: Set[str] = set(self.stats)
+        heap: List[tuple] = []
+        sequence = 0
+        key = _Descending if descending else str
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mypos-terminals")
+        try:
+            while True:
+                self._schedule(executor, queue, buffers, next_page, in_flight, filters)
+
+                if ordered:
+                    while heap and not starved:
+                        _, _, terminal_id, transaction = heapq.heappop(heap)
+                        yield transaction
+                        buffer = buffers[terminal_id]
+                        if buffer:
+                            sequence += 1
+                            item = buffer.popleft()
+                            heapq.heappush(heap, (key(item.date), sequence, terminal_id, item))
+                        elif not self.stats[terminal_id].done:
+                            starved.add(terminal_id)
+                            break
+                    if not starved and not heap and not in_flight:
+                        return
+                elif not in_flight:
+                    return
+
+                if not in_flight:
+                    # A terminal the merge just ran out of is still queued, schedule its next page
+                    continue
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    terminal_id = future.terminal_id
+                    items = self._complete(future, next_page)
+                    stats = self.stats[terminal_id]
+                    if not stats.done:
+                        queue.append(terminal_id)
+                    if not ordered:
+                        yield from items
+                        continue
+                    buffers[terminal_id].extend(items)
+                    if terminal_id in starved and (buffers[terminal_id] or stats.done):
+                        starved.discard(terminal_id)
+                        if buffers[terminal_id]:
+                            sequence += 1
+                            item = buffers[terminal_id].popleft()
+                            heapq.heappush(heap, (key(item.date), sequence, terminal_id, item))
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _schedule(self, executor, queue, buffers, next_page, in_flight, filters) -> None:
+        # Round-robin: one page per terminal per turn, skipping terminals that are ahead
+        skipped: List[str] = []
+        while queue and len(in_flight) < self.max_workers:
+            terminal_id = queue.popleft()
+            if len(buffers[terminal_id]) >= self.page_size:
+                skipped.append(terminal_id)
+                continue
+            future = executor.submit(self._fetch_page, terminal_id, next_page[terminal_id], filters)
+            future.terminal_id = terminal_id
+            in_flight.add(future)
+        queue.extend(skipped)
+
+    def _fetch_page(self, terminal_id: str, page: int, filters: dict):
+        started = time.monotonic()
+        try:
+            response = self.devices.list_device_transactions(terminal_id, page=page, size=self.page_size, **filters)
+        finally:
+            self.stats[terminal_id].seconds += time.monotonic() - started
+        return page, response
+
+    def _complete(self, future: Future, next_page: Dict[str, int]) -> List[DeviceTransaction]:
+        terminal_id = future.terminal_id
+        stats = self.stats[terminal_id]
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Failed to list transactions of terminal {terminal_id}: {error}")
+            stats.error = error
+            stats.done = True
+            items = []
+        else:
+            page, response = future.result()
+            items = response.transactions
+            stats.pages += 1
+            stats.transactions += len(items)
+            next_page[terminal_id] = page + 1
+            stats.done = _is_last_page(response, page, len(items))
+        self._report()
+        return items
+
+    def _report(self) -> None:
+        if self.progress is None:
+            return
+        stats = self.stats.values()
+        self.progress(FetchProgress(
+            terminals_done=sum(s.done for s in stats),
+            terminals_total=len(self.stats),
+            pages=sum(s.pages for s in stats),
+            transactions=sum(s.transactions for s in stats),
+            elapsed=time.monotonic() - self._started,
+        ))
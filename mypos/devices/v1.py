@@ -1,6 +1,6 @@
 from typing import Optional
 from datetime import datetime
-from ...schemas import DeviceListResponse, DeviceTransactionListResponse, DeviceDetail, ReceiptDetail
+from ..schemas import DeviceListResponse, DeviceTransactionListResponse, DeviceDetail, ReceiptDetail
 
 class DevicesV1:
     def __init__(self, client):
@@ -26,14 +26,14 @@ class DevicesV1:
         if model:
             body["model"] = model
 
-        response_data = self.client.request(
+        return self.client.request_model(
+            DeviceListResponse,
             "GET", 
             "/v1/devices", 
             params={"size": size}, 
             json=body,
             base_url=self.base_url
         )
-        return DeviceListResponse(**response_data)
 
     def list_transactions(
         self, 
@@ -69,25 +69,25 @@ class DevicesV1:
         if reference_number:
             body["reference_number"] = reference_number
 
-        response_data = self.client.request(
+        return self.client.request_model(
+            DeviceTransactionListResponse,
             "GET", 
             f"/v1/devices/{terminal_id}/transactions", 
             params={"size": size}, 
             json=body,
             base_url=self.base_url
         )
-        return DeviceTransactionListResponse(**response_data)
 
     def get_details(self, terminal_id: str) -> DeviceDetail:
         """
         Get device details from MyPOS API (v1).
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            DeviceDetail,
             "GET", 
             f"/v1/devices/{terminal_id}",
             base_url=self.base_url
         )
-        return DeviceDetail(**response_data)
 
     def get_receipt_details(self, payment_reference: str) -> ReceiptDetail:
         """
@@ -99,9 +99,9 @@ class DevicesV1:
         Returns:
             ReceiptDetail: Receipt details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            ReceiptDetail,
             "GET",
             f"/v1/devices/receipt/{payment_reference}",
             base_url=self.base_url
         )
-        return ReceiptDetail(**response_data)
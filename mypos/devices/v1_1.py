@@ -1,11 +1,24 @@
 from typing import Optional
-from ...schemas import DeviceListResponse, DeviceTransactionListResponse, DeviceDetail, ReceiptDetail
+from ..schemas import DeviceListResponse, DeviceTransactionListResponse, DeviceDetail, ReceiptDetail, DeviceTransaction
+from ..streaming import StreamedPage
+from .fleet import Fleet
 
 class DevicesV1_1:
     def __init__(self, client):
         self.client = client
         # Devices API uses a different base URL
         self.base_url = "https://devices-api.mypos.com"
+        self.fleet = Fleet(self)
+
+    def _transaction_params(self, page: Optional[int], size: Optional[int], **filters) -> dict:
+        params = {
+            "page": page,
+            "size": size
+        }
+        for name, value in filters.items():
+            if value is not None:
+                params[name] = value
+        return params
 
     def list(
         self,
@@ -40,13 +53,13 @@ class DevicesV1_1:
         if model is not None:
             params["model"] = model
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            DeviceListResponse,
             "GET",
             "/v1.1/devices",
             params=params,
             base_url=self.base_url
         )
-        return DeviceListResponse(**response_data)
 
     def list_transactions(
         self,
@@ -81,37 +94,67 @@ class DevicesV1_1:
         Returns:
             DeviceTransactionListResponse: Object containing list of device transactions and pagination info
         """
-        params = {
-            "page": page,
-            "size": size
-        }
+        params = self._transaction_params(
+            page, size,
+            from_date=from_date, to_date=to_date,
+            from_amount=from_amount, to_amount=to_amount,
+            rrn=rrn, stan=stan,
+            terminal_name=terminal_name,
+            reference_number=reference_number,
+            terminal_id=terminal_id
+        )
         
-        if from_date is not None:
-            params["from_date"] = from_date
-        if to_date is not None:
-            params["to_date"] = to_date
-        if from_amount is not None:
-            params["from_amount"] = from_amount
-        if to_amount is not None:
-            params["to_amount"] = to_amount
-        if rrn is not None:
-            params["rrn"] = rrn
-        if stan is not None:
-            params["stan"] = stan
-        if terminal_name is not None:
-            params["terminal_name"] = terminal_name
-        if reference_number is not None:
-            params["reference_number"] = reference_number
-        if terminal_id is not None:
-            params["terminal_id"] = terminal_id
+        return self.client.request_model(
+            DeviceTransactionListResponse,
+            "GET",
+            "/v1.1/devices/transactions",
+            params=params,
+            base_url=self.base_url
+        )
+
+    def stream_transactions(
+        self,
+        page: Optional[int] = 1,
+        size: Optional[int] = 1000,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        from_amount: Optional[float] = None,
+        to_amount: Optional[float] = None,
+        rrn: Optional[str] = None,
+        stan: Optional[str] = None,
+        terminal_name: Optional[str] = None,
+        reference_number: Optional[str] = None,
+        terminal_id: Optional[str] = None
+    ) -> StreamedPage[DeviceTransaction]:
+        """
+        Stream one page of device transactions, validating each record as it is
+        read from the socket. Use instead of `list_transactions` for large pages.
+
+        Args:
+            Same as `list_transactions`. Default size is 1000.
+
+        Returns:
+            StreamedPage[DeviceTransaction]: Iterable of device transactions. Its pagination
+            info is available once iteration has finished.
+        """
+        params = self._transaction_params(
+            page, size,
+            from_date=from_date, to_date=to_date,
+            from_amount=from_amount, to_amount=to_amount,
+            rrn=rrn, stan=stan,
+            terminal_name=terminal_name,
+            reference_number=reference_number,
+            terminal_id=terminal_id
+        )
         
-        response_data = self.client.request(
+        return self.client.request_stream(
+            "transactions",
+            DeviceTransaction,
             "GET",
             "/v1.1/devices/transactions",
             params=params,
             base_url=self.base_url
         )
-        return DeviceTransactionListResponse(**response_data)
 
     def get_device_details(self, terminal_id: str) -> DeviceDetail:
         """
@@ -123,12 +166,12 @@ class DevicesV1_1:
         Returns:
             DeviceDetail: Device details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            DeviceDetail,
             "GET",
             f"/v1.1/devices/{terminal_id}",
             base_url=self.base_url
         )
-        return DeviceDetail(**response_data)
 
     def get_receipt_details(self, payment_reference: str) -> ReceiptDetail:
         """
@@ -140,12 +183,12 @@ class DevicesV1_1:
         Returns:
             ReceiptDetail: Receipt details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            ReceiptDetail,
             "GET",
             f"/v1.1/devices/receipt/{payment_reference}",
             base_url=self.base_url
         )
-        return ReceiptDetail(**response_data)
 
     def list_device_transactions(
         self,
@@ -178,33 +221,62 @@ class DevicesV1_1:
         Returns:
             DeviceTransactionListResponse: Object containing list of device transactions and pagination info
         """
-        params = {
-            "page": page,
-            "size": size
-        }
+        params = self._transaction_params(
+            page, size,
+            from_date=from_date, to_date=to_date,
+            from_amount=from_amount, to_amount=to_amount,
+            rrn=rrn, stan=stan,
+            reference_number=reference_number
+        )
         
-        if from_date is not None:
-            params["from_date"] = from_date
-        if to_date is not None:
-            params["to_date"] = to_date
-        if from_amount is not None:
-            params["from_amount"] = from_amount
-        if to_amount is not None:
-            params["to_amount"] = to_amount
-        if rrn is not None:
-            params["rrn"] = rrn
-        if stan is not None:
-            params["stan"] = stan
-        if reference_number is not None:
-            params["reference_number"] = reference_number
+        return self.client.request_model(
+            DeviceTransactionListResponse,
+            "GET",
+            f"/v1.1/devices/{terminal_id}/transactions",
+            params=params,
+            base_url=self.base_url
+        )
+
+    def stream_device_transactions(
+        self,
+        terminal_id: str,
+        page: Optional[int] = 1,
+        size: Optional[int] = 1000,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        from_amount: Optional[float] = None,
+        to_amount: Optional[float] = None,
+        rrn: Optional[str] = None,
+        stan: Optional[str] = None,
+        reference_number: Optional[str] = None
+    ) -> StreamedPage[DeviceTransaction]:
+        """
+        Stream one page of transactions for a specific device, validating each
+        record as it is read from the socket.
+
+        Args:
+            Same as `list_device_transactions`. Default size is 1000.
+
+        Returns:
+            StreamedPage[DeviceTransaction]: Iterable of device transactions. Its pagination
+            info is available once iteration has finished.
+        """
+        params = self._transaction_params(
+            page, size,
+            from_date=from_date, to_date=to_date,
+            from_amount=from_amount, to_amount=to_amount,
+            rrn=rrn, stan=stan,
+            reference_number=reference_number
+        )
         
-        response_data = self.client.request(
+        return self.client.request_stream(
+            "transactions",
+            DeviceTransaction,
             "GET",
             f"/v1.1/devices/{terminal_id}/transactions",
             params=params,
             base_url=self.base_url
         )
-        return DeviceTransactionListResponse(**response_data)
 
     def refund(
         self,
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from . import decoding
+
+logger = logging.getLogger(__name__)
+
+
+class Journal:
+    """
+    Append-only JSON Lines journal for crash-safe batch operations.
+
+    Every `append` is flushed and fsynced before it returns, so a record that was
+    written before a crash is read back by `replay`. A torn last line left by a
+    crash is ignored.
+
+    Example:
+        journal = Journal("refunds.journal")
+        state = journal.latest("key")
+        journal.append({"key": "90000001:REF1", "state": "intent"})
+    """
+
+    def __init__(self, path: str, sync: bool = True) -> None:
+        self.path = path
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Durably append a record. A `ts` field with the current time is added if missing.
+        """
+        if "ts" not in record:
+            record = {**record, "ts": round(time.time(), 3)}
+        line = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            f = self._open()
+            f.write(line)
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the records in the order they were written.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield decoding.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring unreadable record on line {number} of {self.path}")
+
+    def latest(self, key: str) -> Dict[Any, Dict[str, Any]]:
+        """
+        The last record of every value of the `key` field.
+        """
+        state: Dict[Any, Dict[str, Any]] = {}
+        for record in self.replay():
+            if key in record:
+                state[record[key]] = record
+        return state
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> Optional[bool]:
+        self.close()
+        return None
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` acquisitions per second with bursts of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take one token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """
+    Per-host concurrency and rate limits shared by every request a client makes,
+    including requests fanned out from worker threads.
+
+    The limits default to the MYPOS_MAX_CONCURRENCY (8) and MYPOS_RATE_LIMIT
+    (requests per second, unlimited if unset) environment variables.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, rate: Optional[float] = None) -> None:
+        self.max_concurrency = max_concurrency or int(os.getenv("MYPOS_MAX_CONCURRENCY") or 8)
+        if rate is None and os.getenv("MYPOS_RATE_LIMIT"):
+            rate = float(os.getenv("MYPOS_RATE_LIMIT"))
+        self.rate = rate
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _host_limits(self, host: str):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.max_concurrency)
+                if self.rate:
+                    self._rate_limiters[host] = RateLimiter(self.rate)
+            return semaphore, self._rate_limiters.get(host)
+
+    def acquire(self, url: str) -> Callable[[], None]:
+        """
+        Take one of the host's concurrency slots, after waiting for its rate limit.
+
+        Returns:
+            Callable[[], None]: Releases the slot. Calling it again does nothing.
+        """
+        semaphore, rate_limiter = self._host_limits(urlsplit(url).netloc)
+        semaphore.acquire()
+        try:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+        except BaseException:
+            semaphore.release()
+            raise
+        once = threading.Lock()
+
+        def release() -> None:
+            if once.acquire(blocking=False):
+                semaphore.release()
+        return release
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        """
+        Hold one of the host's concurrency slots, after waiting for its rate limit.
+        """
+        release = self.acquire(url)
+        try:
+            yield
+        finally:
+            release()
@@ -0,0 +1,136 @@
+import logging
+import math
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+from .concurrency import bounded_map
+from .streaming import StreamedPage
+
+logger = logging.getLogger(__name__)
+
+
+def _is_last_page(response: Any, page: int, count: int) -> bool:
+    pagination = getattr(response, "pagination", None)
+    if count == 0 or pagination is None:
+        return True
+    page_size = pagination.page_size or pagination.size or count
+    return page * page_size >= pagination.total
+
+
+def iter_pages(fetch: Callable[[int], Any], key: str, start_page: int = 1, max_pages: Optional[int] = None) -> Iterator[Any]:
+    """
+    Iterate over the pages of a paginated list endpoint until the last one.
+
+    Args:
+        fetch: Called with the page number, returns a list response.
+        key: The name of the list field of the response, e.g. "transactions".
+        start_page: The first page to fetch. Default is 1.
+        max_pages: Stop after this many pages (optional)
+
+    Example:
+        iter_pages(lambda page: client.devices.v1_1.list(page=page, size=100), "devices")
+    """
+    page = start_page
+    while True:
+        response = fetch(page)
+        yield response
+        if _is_last_page(response, page, len(getattr(response, key))):
+            return
+        if max_pages is not None and page - start_page + 1 >= max_pages:
+            return
+        page += 1
+
+
+def iter_items(fetch: Callable[[int], Any], key: Optional[str] = None, start_page: int = 1, max_pages: Optional[int] = None) -> Iterator[Any]:
+    """
+    Iterate over the items of every page of a paginated list endpoint.
+
+    `fetch` may return a list response, in which case `key` names its list field,
+    or a `StreamedPage`, in which case records are yielded as they are read.
+
+    Example:
+        iter_items(lambda page: client.devices.v1_1.stream_transactions(page=page, from_date="2025-01-01"))
+    """
+    page = start_page
+    while True:
+        response = fetch(page)
+        items = response if isinstance(response, StreamedPage) else getattr(response, key)
+        count = 0
+        for item in items:
+            count += 1
+            yield item
+        if _is_last_page(response, page, count):
+            return
+        if max_pages is not None and page - start_page + 1 >= max_pages:
+            return
+        page += 1
+
+
+def iter_newer(
+    items: Iterable[Any],
+    date: Callable[[Any], Any],
+    cutoff: Any,
+    sample: int,
+    patience: int = 1
+) -> Iterator[Any]:
+    """
+    The items of a listing that are not older than `cutoff`, stopping early once the
+    listing has moved past it.
+
+    List endpoints of the API (`list_transactions`, `list_device_transactions`,
+    `list_notifications`) return records newest first. Incremental readers rely on
+    this order to stop paging early: `TransactionPoller`, `NotificationBackfill` and
+    the ordered merge of `MultiTerminalFetch`. The order is not documented, so it is
+    checked here rather than assumed. Paging only stops once the first `sample`
+    items (a page) were read newest first, and `patience` consecutive items were
+    older than `cutoff`. As soon as an item is newer than the one before it, the
+    listing is read to the end and older items are only filtered out.
+
+    Args:
+        items: The items, e.g. from `iter_items`.
+        date: Gives the date of an item, comparable to `cutoff`. Items without a date are kept.
+        cutoff: Items older than this are skipped.
+        sample: The number of items the order is checked on before stopping early, usually the page size.
+        patience: The number of consecutive older items to stop at. Default is 1.
+    """
+    ordered = True
+    previous = None
+    # One item tells nothing about the order
+    sample = max(sample, 2)
+    count = older = 0
+    for item in items:
+        count += 1
+        value = date(item)
+        if value is None:
+            yield item
+            continue
+        if ordered and previous is not None and value > previous:
+            ordered = False
+            logger.warning("Listing is not ordered newest first, reading it to the end")
+        previous = value
+        if value >= cutoff:
+            older = 0
+            yield item
+            continue
+        older += 1
+        if ordered and count >= sample and older >= patience:
+            return
+
+
+def fetch_all(fetch: Callable[[int], Any], key: str, max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Get the items of every page of a paginated list endpoint. The first page gives
+    the total, then the remaining pages are fetched concurrently.
+
+    Example:
+        fetch_all(lambda page: client.webhooks.v1.list(page=page, size=100), "webhooks")
+    """
+    first = fetch(1)
+    items = list(getattr(first, key))
+    if _is_last_page(first, 1, len(items)):
+        return items
+    page_size = first.pagination.page_size or first.pagination.size or len(items)
+    pages = {1: items}
+    for result in bounded_map(fetch, range(2, math.ceil(first.pagination.total / page_size) + 1), max_workers=max_workers):
+        if not result.ok:
+            raise result.error
+        pages[result.item] = getattr(result.value, key)
+    return [item for page in sorted(pages) for item in pages[page]]
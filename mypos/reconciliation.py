@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import tempfile
+import zlib
+from collections import Counter
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from . import decoding
+from .pagination import iter_items
+from .schemas import TransactionType
+
+logger = logging.getLogger(__name__)
+
+
+class ReconciliationStatus(str, Enum):
+    MATCHED = "matched"
+    AMOUNT_MISMATCH = "amount_mismatch"
+    MISSING_IN_LEDGER = "missing_in_ledger"
+    MISSING_ON_DEVICE = "missing_on_device"
+    UNSETTLED = "unsettled"
+
+
+class LedgerRow(NamedTuple):
+    """The join-relevant fields of an account `Transaction`."""
+    payment_reference: str
+    terminal_id: str
+    reference_number: Optional[str]
+    amount: float
+    currency: str
+    date: str
+
+
+class DeviceRow(NamedTuple):
+    """The join-relevant fields of a `DeviceTransaction`."""
+    payment_reference: Optional[str]
+    terminal_id: str
+    reference_number: Optional[str]
+    amount: float
+    currency: str
+    date: str
+    settled: bool
+
+
+class ReconciliationResult(NamedTuple):
+    status: ReconciliationStatus
+    ledger: Optional[LedgerRow]
+    device: Optional[DeviceRow]
+
+
+def ledger_row(transaction: Any) -> Optional[LedgerRow]:
+    """
+    Project a `Transaction` (or `TransactionRecord`) on the join keys.
+    Returns None for ledger entries that were not made on a POS device.
+    """
+    if not transaction.terminal_id:
+        return None
+    return LedgerRow(
+        transaction.payment_reference,
+        transaction.terminal_id,
+        transaction.reference_number or None,
+        abs(transaction.original_amount),
+        transaction.original_currency,
+        transaction.date,
+    )
+
+
+def device_row(transaction: Any) -> DeviceRow:
+    """
+    Project a `DeviceTransaction` (or `DeviceTransactionRecord`) on the join keys.
+    """
+    return DeviceRow(
+        transaction.payment_reference or None,
+        transaction.terminal_id,
+        transaction.reference_number or None,
+        abs(transaction.amount),
+        transaction.currency,
+        transaction.date,
+        bool(transaction.settlement_date),
+    )
+
+
+class _DeviceIndex:
+    """
+    Hash indexes of device rows on `payment_reference` and on (`terminal_id`, `reference_number`).
+    """
+
+    def __init__(self) -> None:
+        self.rows: Dict[int, DeviceRow] = {}
+        self._next_id = 0
+        self.by_payment_reference: Dict[str, int] = {}
+        self.by_reference_number: Dict[Tuple[str, str], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def add(self, row: DeviceRow) -> None:
+        row_id = self._next_id
+        self._next_id += 1
+        self.rows[row_id] = row
+        if row.payment_reference:
+            self.by_payment_reference[row.payment_reference] = row_id
+        if row.reference_number:
+            self.by_reference_number.setdefault((row.terminal_id, row.reference_number), []).append(row_id)
+
+    def pop_match(self, row: LedgerRow) -> Optional[DeviceRow]:
+        row_id = self.by_payment_reference.pop(row.payment_reference, None)
+        if row_id is not None and row_id in self.rows:
+            return self.rows.pop(row_id)
+        if row.reference_number:
+            candidates = self.by_reference_number.get((row.terminal_id, row.reference_number))
+            while candidates:
+                row_id = candidates.pop(0)
+                if row_id in self.rows:
+                    return self.rows.pop(row_id)
+        return None
+
+    def remaining(self) -> Iterator[DeviceRow]:
+        return iter(self.rows.values())
+
+
+class Reconciler:
+    """
+    Hash-join reconciliation of the account ledger (`TransactionsV1_1.list`) against
+    the terminal view (`DevicesV1_1.list_transactions`).
+
+    Device rows are indexed on `payment_reference` and on (`terminal_id`,
+    `reference_number`), then ledger rows are streamed against the index. When the
+    device side exceeds `max_rows`, both sides are spilled to disk in partitions by
+    `terminal_id` and joined one partition at a time (grace hash join), so memory
+    stays bounded for a month of transactions across thousands of terminals.
+
+    Example:
+        reconciler = Reconciler()
+        for result in reconciler.reconcile(ledger_transactions, device_transactions):
+            if result.status != ReconciliationStatus.MATCHED:
+                report(result)
+        print(reconciler.summary)
+    """
+
+    def __init__(self, max_rows: int = 500_000, partitions: int = 64, amount_tolerance: float = 0.005, spill_dir: Optional[str] = None) -> None:
+        self.max_rows = max_rows
+        self.partitions = partitions
+        self.amount_tolerance = amount_tolerance
+        self.spill_dir = spill_dir
+        self.summary: Counter = Counter()
+
+    def reconcile(self, ledger: Iterable[Any], device: Iterable[Any]) -> Iterator[ReconciliationResult]:
+        """
+        Join the two sides and yield one result per ledger or device row.
+
+        Args:
+            ledger: Account transactions (`Transaction` or `TransactionRecord`). Entries
+                without a terminal_id (transfers, ...) are skipped.
+            device: Device transactions (`DeviceTransaction` or `DeviceTransactionRecord`).
+
+        Returns:
+            Iterator[ReconciliationResult]: Matched, amount-mismatched, missing and unsettled rows.
+        """
+        self.summary = Counter()
+        index = _DeviceIndex()
+        device_rows = (device_row(t) for t in device)
+        for row in device_rows:
+            index.add(row)
+            if len(index) > self.max_rows:
+                logger.info(f"Device side exceeds {self.max_rows} rows, spilling to disk")
+                yield from self._reconcile_spilled(ledger, index.remaining(), device_rows)
+                return
+
+        yield from self._join(index, (r for r in map(ledger_row, ledger) if r is not None))
+
+    def reconcile_range(
+        self,
+        client,
+        from_date: datetime,
+        to_date: datetime,
+        size: int = 1000,
+        transaction_types: Optional[List[TransactionType]] = None
+    ) -> Iterator[ReconciliationResult]:
+        """
+        Stream both sides of a date range from the API and reconcile them.
+
+        Args:
+            client: A `MyPOS` client.
+            from_date: Start of the range.
+            to_date: End of the range.
+            size: Page size used for both list endpoints. Default is 1000.
+            transaction_types: Restrict the ledger side to these types (optional)
+        """
+        ledger = iter_items(lambda page: client.transactions.v1_1.stream_list(
+            page=page, size=size, from_date=from_date, to_date=to_date, transaction_types=transaction_types
+        ))
+        device = iter_items(lambda page: client.devices.v1_1.stream_transactions(
+            page=page, size=size, from_date=from_date.strftime("%Y-%m-%d"), to_date=to_date.strftime("%Y-%m-%d")
+        ))
+        return self.reconcile(ledger, device)
+
+    def _join(self, index: _DeviceIndex, ledger_rows: Iterable[LedgerRow]) -> Iterator[ReconciliationResult]:
+        for row in ledger_rows:
+            match = index.pop_match(row)
+            if match is None:
+                result = ReconciliationResult(ReconciliationStatus.MISSING_ON_DEVICE, row, None)
+            elif abs(match.amount - row.amount) > self.amount_tolerance or match.currency != row.currency:
+                result = ReconciliationResult(ReconciliationStatus.AMOUNT_MISMATCH, row, match)
+            elif not match.settled:
+                result = ReconciliationResult(ReconciliationStatus.UNSETTLED, row, match)
+            else:
+                result = ReconciliationResult(ReconciliationStatus.MATCHED, row, match)
+            self.summary[result.status.value] += 1
+            yield result
+
+        for match in index.remaining():
+            status = ReconciliationStatus.MISSING_IN_LEDGER if match.settled else ReconciliationStatus.UNSETTLED
+            self.summary[status.value] += 1
+            yield ReconciliationResult(status, None, match)
+
+    def _partition(self, terminal_id: str) -> int:
+        return zlib.crc32(terminal_id.encode("utf-8")) % self.partitions
+
+    def _reconcile_spilled(self, ledger: Iterable[Any], *device_rows: Iterable[DeviceRow]) -> Iterator[ReconciliationResult]:
+        with tempfile.TemporaryDirectory(prefix="mypos-reconcile-", dir=self.spill_dir) as directory:
+            device_files = self._spill(directory, "device", (row for rows in device_rows for row in rows))
+            ledger_files = self._spill(directory, "ledger", (r for r in map(ledger_row, ledger) if r is not None))
+            self.summary["spilled_partitions"] = self.partitions
+            for partition in range(self.partitions):
+                index = _DeviceIndex()
+                for row in self._read(device_files[partition]):
+                    index.add(DeviceRow(*row))
+                yield from self._join(index, (LedgerRow(*row) for row in self._read(ledger_files[partition])))
+
+    def _spill(self, directory: str, side: str, rows: Iterable[tuple]) -> List[str]:
+        paths = [os.path.join(directory, f"{side}-{p:04d}.jsonl") for p in range(self.partitions)]
+        files = [open(path, "w", encoding="utf-8") for path in paths]
+        try:
+            for row in rows:
+                files[self._partition(row.terminal_id)].write(json.dumps(row, separators=(",", ":")) + "\n")
+        finally:
+            for f in files:
+                f.close()
+        return paths
+
+    def _read(self, path: str) -> Iterator[list]:
+        with open(path, "rb") as f:
+            for line in f:
+                yield decoding.loads(line)
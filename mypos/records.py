@@ -0,0 +1,192 @@
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+from . import decoding
+from .dates import parse_datetime
+from .schemas import DeviceTransaction, ReferenceNumberType, Transaction, TransactionType
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Low-cardinality strings (currencies, terminals, outlets, statuses) repeat across
+    # hundreds of thousands of records, keep a single shared copy of each
+    return sys.intern(value) if value.__class__ is str else value
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionRecord:
+    """
+    Memory-compact, immutable variant of `Transaction` for bulk ingestion.
+    """
+    id: Optional[int]
+    payment_reference: str
+    transaction_type: Optional[TransactionType]
+    transaction_amount: float
+    transaction_currency: str
+    original_amount: float
+    original_currency: str
+    sign: str
+    date: str
+    operation_type: Optional[str] = None
+    reference_number: Optional[str] = None
+    reference_number_type: Optional[ReferenceNumberType] = None
+    terminal_id: Optional[str] = None
+    serial_number: Optional[str] = None
+    account_number: Optional[str] = None
+    ruid: Optional[str] = None
+    billing_descriptor: Optional[str] = None
+    pan: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TransactionRecord":
+        """
+        Build a record from a decoded API object, interning low-cardinality strings.
+        """
+        transaction_type = data.get("transaction_type")
+        reference_number_type = data.get("reference_number_type")
+        return cls(
+            id=data.get("id"),
+            payment_reference=data["payment_reference"],
+            transaction_type=None if transaction_type is None else TransactionType(transaction_type),
+            transaction_amount=float(data["transaction_amount"]),
+            transaction_currency=_intern(data["transaction_currency"]),
+            original_amount=float(data["original_amount"]),
+            original_currency=_intern(data["original_currency"]),
+            sign=_intern(data["sign"]),
+            date=data["date"],
+            operation_type=_intern(data.get("operation_type")),
+            reference_number=data.get("reference_number"),
+            reference_number_type=None if reference_number_type is None else ReferenceNumberType(reference_number_type),
+            terminal_id=_intern(data.get("terminal_id")),
+            serial_number=_intern(data.get("serial_number")),
+            account_number=_intern(data.get("account_number")),
+            ruid=data.get("ruid"),
+            billing_descriptor=_intern(data.get("billing_descriptor")),
+            pan=data.get("pan"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: Union[bytes, str]) -> "TransactionRecord":
+        """
+        Build a record from the raw JSON of a single transaction.
+        """
+        return cls.from_dict(decoding.loads(raw))
+
+    @classmethod
+    def from_model(cls, model: Transaction) -> "TransactionRecord":
+        """
+        Build a record from a `Transaction` model.
+        """
+        return cls.from_dict({name: getattr(model, name) for name in _TRANSACTION_FIELDS})
+
+    @property
+    def parsed_date(self) -> Optional[datetime]:
+        """The `date` of the transaction as a datetime."""
+        return parse_datetime(self.date)
+
+    def to_model(self) -> Transaction:
+        """
+        Convert back to a `Transaction` model.
+        """
+        return Transaction(**{name: getattr(self, name) for name in _TRANSACTION_FIELDS})
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceTransactionRecord:
+    """
+    Memory-compact, immutable variant of `DeviceTransaction` for bulk ingestion.
+    """
+    terminal_id: str
+    terminal_name: str
+    outlet_name: str
+    amount: float
+    currency: str
+    fee: float
+    pan: str
+    card_scheme: str
+    rrn: str
+    stan: str
+    date: str
+    settlement_date: str
+    settlement_amount: str
+    settlement_currency: str
+    tran_status: str
+    payment_status: str
+    payment_reference: str
+    reference_number: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DeviceTransactionRecord":
+        """
+        Build a record from a decoded API object, interning low-cardinality strings.
+        """
+        return cls(
+            terminal_id=_intern(data["terminal_id"]),
+            terminal_name=_intern(data["terminal_name"]),
+            outlet_name=_intern(data["outlet_name"]),
+            amount=float(data["amount"]),
+            currency=_intern(data["currency"]),
+            fee=float(data["fee"]),
+            pan=data["pan"],
+            card_scheme=_intern(data["card_scheme"]),
+            rrn=data["rrn"],
+            stan=data["stan"],
+            date=data["date"],
+            settlement_date=data["settlement_date"],
+            settlement_amount=data["settlement_amount"],
+            settlement_currency=_intern(data["settlement_currency"]),
+            tran_status=_intern(data["tran_status"]),
+            payment_status=_intern(data["payment_status"]),
+            payment_reference=data["payment_reference"],
+            reference_number=data.get("reference_number"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: Union[bytes, str]) -> "DeviceTransactionRecord":
+        """
+        Build a record from the raw JSON of a single device transaction.
+        """
+        return cls.from_dict(decoding.loads(raw))
+
+    @classmethod
+    def from_model(cls, model: DeviceTransaction) -> "DeviceTransactionRecord":
+        """
+        Build a record from a `DeviceTransaction` model.
+        """
+        return cls.from_dict({name: getattr(model, name) for name in _DEVICE_TRANSACTION_FIELDS})
+
+    @property
+    def parsed_date(self) -> Optional[datetime]:
+        """The `date` of the transaction as a datetime."""
+        return parse_datetime(self.date)
+
+    @property
+    def parsed_settlement_date(self) -> Optional[datetime]:
+        """`settlement_date` as a datetime. None while unsettled."""
+        return parse_datetime(self.settlement_date)
+
+    def to_model(self) -> DeviceTransaction:
+        """
+        Convert back to a `DeviceTransaction` model.
+        """
+        return DeviceTransaction(**{name: getattr(self, name) for name in _DEVICE_TRANSACTION_FIELDS})
+
+
+_TRANSACTION_FIELDS = tuple(f.name for f in fields(TransactionRecord))
+_DEVICE_TRANSACTION_FIELDS = tuple(f.name for f in fields(DeviceTransactionRecord))
+
+
+def iter_transaction_records(raw_items: Iterable[bytes]) -> Iterator[TransactionRecord]:
+    """
+    Build transaction records from raw JSON items, e.g. `StreamedPage.raw()`.
+    """
+    for raw in raw_items:
+        yield TransactionRecord.from_json(raw)
+
+
+def iter_device_transaction_records(raw_items: Iterable[bytes]) -> Iterator[DeviceTransactionRecord]:
+    """
+    Build device transaction records from raw JSON items, e.g. `StreamedPage.raw()`.
+    """
+    for raw in raw_items:
+        yield DeviceTransactionRecord.from_json(raw)
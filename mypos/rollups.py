@@ -0,0 +1,220 @@
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEDGER = "ledger"
+DEVICE = "device"
+
+# Columns a query can group by, in bucket key order
+DIMENSIONS = ("day", "source", "account", "terminal", "currency", "type", "sign")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    day TEXT NOT NULL,
+    source TEXT NOT NULL,
+    account TEXT NOT NULL,
+    terminal TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    type TEXT NOT NULL,
+    sign TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    fee REAL NOT NULL,
+    PRIMARY KEY (day, source, account, terminal, currency, type, sign)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seen (
+    identity TEXT PRIMARY KEY,
+    day TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS seen_day ON seen (day);
+"""
+
+_UPSERT = """
+INSERT INTO buckets (day, source, account, terminal, currency, type, sign, count, amount, fee)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, source, account, terminal, currency, type, sign) DO UPDATE SET
+    count = count + excluded.count,
+    amount = amount + excluded.amount,
+    fee = fee + excluded.fee
+"""
+
+
+class RollupRow(NamedTuple):
+    """
+    One aggregated row. Dimensions that were not grouped by are None.
+    """
+    day: Optional[str]
+    source: Optional[str]
+    account: Optional[str]
+    terminal: Optional[str]
+    currency: Optional[str]
+    type: Optional[str]
+    sign: Optional[str]
+    count: int
+    amount: float
+    fee: float
+    net: float
+
+
+def bucket_key(transaction: Any) -> Tuple[Tuple[str, ...], str, float, float]:
+    """
+    The bucket, identity, amount and fee of a `Transaction` or `DeviceTransaction`
+    (or their records from `mypos.records`).
+
+    Account transactions are bucketed by day, account, terminal, currency,
+    transaction type and sign. Device transactions have no account or type,
+    and their sign is that of the amount. They are identified by terminal,
+    STAN and date, which do not change when they settle, unlike their payment
+    reference, which is only set then.
+    """
+    if hasattr(transaction, "transaction_amount"):
+        transaction_type = transaction.transaction_type
+        key = (
+            transaction.date[:10], LEDGER, transaction.account_number or "", transaction.terminal_id or "",
+            transaction.transaction_currency, transaction_type.value if transaction_type is not None else "",
+            transaction.sign or "",
+        )
+        return key, f"{LEDGER}:{transaction.payment_reference}", abs(transaction.transaction_amount), 0.0
+    amount = transaction.amount
+    identity = f"{transaction.terminal_id}:{transaction.stan}:{transaction.date}"
+    key = (transaction.date[:10], DEVICE, "", transaction.terminal_id, transaction.currency, "", "D" if amount < 0 else "C")
+    return key, f"{DEVICE}:{identity}", abs(amount), transaction.fee or 0.0
+
+
+class RollupStore:
+    """
+    Daily rollups of transactions per terminal, account and currency, kept up to
+    date incrementally in SQLite.
+
+    `add` folds new `Transaction` and `DeviceTransaction` records, e.g. from an
+    incremental poll or a webhook handler, into pre-aggregated daily buckets
+    with their count, amount and fee, by transaction type and sign. Every
+    transaction is folded at most once: its identity (the payment reference of
+    account transactions, terminal, STAN and date of device transactions,
+    whether settled or not) is recorded
+    in the same SQLite transaction as the bucket update, so replaying a sync
+    window or a redelivered notification does not count it twice.
+
+    Queries read buckets only, so their cost depends on the number of days,
+    terminals and accounts, not on the number of transactions.
+
+    Example:
+        store = RollupStore("rollups.db")
+        store.add(poller.poll())
+        for row in store.query("2026-10-01", "2026-10-19", by=("day", "terminal")):
+            print(row.day, row.terminal, row.count, row.net)
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, transactions: Iterable[Any]) -> int:
+        """
+        Fold transactions into their daily buckets, skipping those already folded.
+
+        Returns:
+            int: The number of transactions that were new.
+        """
+        rows = [bucket_key(transaction) for transaction in transactions]
+        if not rows:
+            return 0
+        deltas: Dict[Tuple[str, ...], List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                for key, identity, amount, fee in rows:
+                    cursor.execute("INSERT OR IGNORE INTO seen (identity, day) VALUES (?, ?)", (identity, key[0]))
+                    if cursor.rowcount == 0:
+                        continue
+                    delta = deltas[key]
+                    delta[0] += 1
+                    delta[1] += amount
+                    delta[2] += fee
+                cursor.executemany(_UPSERT, [(*key, *delta) for key, delta in deltas.items()])
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        added = sum(int(delta[0]) for delta in deltas.values())
+        logger.debug(f"Folded {added} of {len(rows)} transactions into {len(deltas)} buckets")
+        return added
+
+    def query(
+        self,
+        from_day: Optional[str] = None,
+        to_day: Optional[str] = None,
+        by: Sequence[str] = ("day", "terminal", "currency"),
+        **filters: Optional[str]
+    ) -> List[RollupRow]:
+        """
+        Aggregate buckets over a period.
+
+        Args:
+            from_day: First day, YYYY-MM-DD (optional)
+            to_day: Last day, included (optional)
+            by: Dimensions to group by, from `DIMENSIONS`. Default is day, terminal and currency.
+            filters: Keep only buckets with these dimension values, e.g. `source="device"`,
+                `terminal="90000001"` or `type="008"`.
+
+        Returns:
+            List[RollupRow]: One row per group. `net` is the amount of credits minus debits.
+        """
+        unknown = [name for name in (*by, *filters) if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown rollup dimensions {unknown}, choose from {DIMENSIONS}")
+        conditions, parameters = [], []
+        if from_day:
+            conditions.append("day >= ?")
+            parameters.append(from_day[:10])
+        if to_day:
+            conditions.append("day <= ?")
+            parameters.append(to_day[:10])
+        for name, value in filters.items():
+            conditions.append(f"{name} = ?")
+            parameters.append(value or "")
+        columns = [name if name in by else "NULL" for name in DIMENSIONS]
+        sql = (
+            f"SELECT {', '.join(columns)}, SUM(count), SUM(amount), SUM(fee), "
+            "SUM(CASE WHEN sign = 'D' THEN -amount ELSE amount END) FROM buckets"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + (f" GROUP BY {', '.join(by)} ORDER BY {', '.join(by)}" if by else "")
+        )
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [RollupRow(*row) for row in rows if row[len(DIMENSIONS)] is not None]
+
+    def daily_revenue(self, from_day: Optional[str] = None, to_day: Optional[str] = None, terminal: Optional[str] = None) -> List[RollupRow]:
+        """
+        Net card revenue per day, terminal and currency, from device transactions.
+        """
+        filters = {"source": DEVICE}
+        if terminal is not None:
+            filters["terminal"] = terminal
+        return self.query(from_day, to_day, by=("day", "terminal", "currency"), **filters)
+
+    def prune(self, before_day: str) -> int:
+        """
+        Forget the identities of transactions before a day, to bound the size of the
+        store. Transactions of those days that arrive again are counted twice, so only
+        prune days that no sync or notification can still deliver.
+
+        Returns:
+            int: The number of identities removed.
+        """
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM seen WHERE day < ?", (before_day[:10],))
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
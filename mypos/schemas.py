@@ -1,6 +1,9 @@
+from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
+from .dates import parse_datetime
 
 class TransactionType(Enum):
     FEE = "001"
@@ -79,6 +82,11 @@ class Transaction(BaseModel):
     billing_descriptor: Optional[str] = Field(None, description="Merchant billing descriptor")
     pan: Optional[str] = Field(None, description="Last four digits of the card number")
 
+    @cached_property
+    def parsed_date(self) -> Optional[datetime]:
+        """The `date` of the transaction as a datetime, parsed on first access."""
+        return parse_datetime(self.date)
+
 class TransactionDetail(BaseModel):
     label: str = Field(..., description="The type of the detail or the title of a section of details")
     value: str = Field(..., description="The value of the detail")
@@ -182,6 +190,11 @@ class PaymentRequest(BaseModel):
     booking_text: str = Field(..., description="Custom name of the payment request as seen in the myPOS account")
     status: PaymentRequestStatus = Field(..., description="Status of the payment request")
 
+    @cached_property
+    def parsed_added_on(self) -> Optional[datetime]:
+        """`added_on` as a datetime, parsed on first access."""
+        return parse_datetime(self.added_on)
+
 class PaymentRequestDetails(BaseModel):
     code: str = Field(..., description="The code of the payment request")
     url: str = Field(..., description="Url address of created payment request")
@@ -198,6 +211,16 @@ class PaymentRequestDetails(BaseModel):
     gsm: str = Field(..., description="The phone number to which the payment request was sent")
     status: PaymentRequestStatus = Field(..., description="Status of the payment request")
 
+    @cached_property
+    def parsed_added_on(self) -> Optional[datetime]:
+        """`added_on` as a datetime, parsed on first access."""
+        return parse_datetime(self.added_on)
+
+    @cached_property
+    def parsed_expiry_on(self) -> Optional[datetime]:
+        """`expiry_on` as a datetime, parsed on first access."""
+        return parse_datetime(self.expiry_on)
+
 class SettlementData(BaseModel):
     settlement_currency: str = Field(..., description="Settlement currency")
     account: Optional[Account] = Field(None, description="Current associated account with this settlement currency")
@@ -210,14 +233,6 @@ class AccountListResponse(BaseModel):
     accounts: List[Account] = Field(..., description="A list of account objects")
     pagination: Pagination = Field(..., description="Information about the paginated results")
 
-class DeviceListResponse(BaseModel):
-    devices: List[Device] = Field(..., description="A list of device objects")
-    pagination: Pagination = Field(..., description="Information about the paginated results")
-
-class DeviceTransactionListResponse(BaseModel):
-    transactions: List[DeviceTransaction] = Field(..., description="A list of device transaction objects")
-    pagination: Pagination = Field(..., description="Information about the paginated results")
-
 class PaymentButtonListResponse(BaseModel):
     items: List[PaymentButton] = Field(..., description="A list of payment buttons")
     pagination: Pagination = Field(..., description="Information about the paginated results")
@@ -260,6 +275,11 @@ class DeviceDetail(BaseModel):
     card_topup_enabled: Optional[int] = Field(None, description="Flag for card topup enabled")
     receipt_address_preference: Optional[int] = Field(None, description="Receipt address preference")
 
+    @cached_property
+    def parsed_last_transaction_date(self) -> Optional[datetime]:
+        """`last_transaction_date` as a datetime, parsed on first access."""
+        return parse_datetime(self.last_transaction_date)
+
 class ReceiptDetail(BaseModel):
     is_declined: int = Field(..., description="A flag to determine whether the transactions has been declined")
     receipt_layout_version: int = Field(..., description="A enumrator of the layout version of the receipt")
@@ -328,6 +348,24 @@ class DeviceTransaction(BaseModel):
     payment_reference: str = Field(..., description="The payment reference of successfully settled transactions")
     reference_number: Optional[str] = Field(None, description="The reference number of a transaction. Can be filtered by custom client reference")
 
+    @cached_property
+    def parsed_date(self) -> Optional[datetime]:
+        """The `date` of the transaction as a datetime, parsed on first access."""
+        return parse_datetime(self.date)
+
+    @cached_property
+    def parsed_settlement_date(self) -> Optional[datetime]:
+        """`settlement_date` as a datetime, parsed on first access. None while unsettled."""
+        return parse_datetime(self.settlement_date)
+
+class DeviceListResponse(BaseModel):
+    devices: List[Device] = Field(..., description="A list of device objects")
+    pagination: Pagination = Field(..., description="Information about the paginated results")
+
+class DeviceTransactionListResponse(BaseModel):
+    transactions: List[DeviceTransaction] = Field(..., description="A list of device transaction objects")
+    pagination: Pagination = Field(..., description="Information about the paginated results")
+
 class WebhookEvent(BaseModel):
     id: str = Field(..., description="The ID of the event")
     name: str = Field(..., description="The name of the event")
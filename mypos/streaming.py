@@ -0,0 +1,201 @@
+import re
+import logging
+from typing import Generic, Iterable, Iterator, List, Optional, Type, TypeVar
+from . import decoding
+from .schemas import Pagination
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A complete or truncated string literal, or a structural character. Strings are
+# consumed whole so brackets inside them are never seen as structure.
+_TOKEN = re.compile(rb'"(?:[^"\\]++|\\.)*+(")?|[][{}]', re.S)
+# Fast path for the common case: a complete array element that is an object
+# without nested objects or arrays, matched in one go.
+_FLAT_ELEMENT = re.compile(rb'[\s,]*+(\{(?:[^][{}"]++|"(?:[^"\\]++|\\.)*+")*+\})', re.S)
+
+_QUOTE = ord('"')
+_OPEN = (ord("{"), ord("["))
+_LBRACKET = ord("[")
+_RBRACKET = ord("]")
+
+_HEAD, _ARRAY, _TAIL = range(3)
+
+
+class JSONArrayScanner:
+    """
+    Incremental scanner that extracts the elements of one top-level array from a
+    JSON object fed in arbitrary chunks.
+
+    The elements are returned as raw JSON bytes, so only the element currently
+    being received is buffered. Everything outside the array (e.g. `pagination`)
+    is kept as a small skeleton document with the array replaced by `[]`.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._key_pattern = re.compile(rb'"%s"\s*:\s*$' % re.escape(key.encode("utf-8")))
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._mode = _HEAD
+        self._element_start: Optional[int] = None
+        self._skeleton = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """
+        Feed the next chunk of the document.
+
+        Returns:
+            List[bytes]: The array elements completed by this chunk.
+        """
+        buf = self._buf
+        buf += chunk
+        if self._mode == _TAIL:
+            return []
+
+        items = []
+        pos = self._pos
+        while True:
+            if self._mode == _ARRAY and self._depth == 2:
+                m = _FLAT_ELEMENT.match(buf, pos)
+                if m is not None:
+                    items.append(bytes(m.group(1)))
+                    pos = m.end()
+                    continue
+            m = _TOKEN.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            i = m.start()
+            c = buf[i]
+            if c == _QUOTE:
+                if m.group(1) is None:
+                    # The string continues in the next chunk
+                    pos = i
+                    break
+                pos = m.end()
+                continue
+            pos = i + 1
+            if c in _OPEN:
+                if self._mode == _HEAD and self._depth == 1 and c == _LBRACKET and self._key_pattern.search(buf, 0, i):
+                    # Start of the target array: everything before it is skeleton.
+                    # The match object pins the buffer, release it before resizing.
+                    m = None
+                    self._skeleton += buf[:pos]
+                    del buf[:pos]
+                    pos = 0
+                    self._mode = _ARRAY
+                elif self._mode == _ARRAY and self._depth == 2:
+                    self._element_start = i
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._mode != _ARRAY:
+                continue
+            if self._depth == 2 and self._element_start is not None:
+                items.append(bytes(buf[self._element_start:pos]))
+                self._element_start = None
+            elif self._depth == 1 and c == _RBRACKET:
+                # End of the target array: the rest of the document is skeleton
+                m = None
+                self._skeleton += b"]"
+                del buf[:pos]
+                self._mode = _TAIL
+                self._pos = 0
+                return items
+
+        m = None
+        if self._mode == _ARRAY:
+            # Only keep the element currently being received
+            keep = self._element_start if self._element_start is not None else pos
+            del buf[:keep]
+            pos -= keep
+            if self._element_start is not None:
+                self._element_start = 0
+        self._pos = pos
+        return items
+
+    def skeleton(self) -> bytes:
+        """
+        The document without the array elements. Only complete once all chunks have been fed.
+        """
+        if self._mode == _HEAD:
+            return bytes(self._buf)
+        if self._mode == _TAIL:
+            return bytes(self._skeleton + self._buf)
+        raise ValueError(f"Unterminated '{self.key}' array in response")
+
+
+def iter_array(chunks: Iterable[bytes], key: str) -> Iterator[bytes]:
+    """
+    Yield the raw JSON of every element of the top-level array `key` from a chunked document.
+    """
+    scanner = JSONArrayScanner(key)
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+
+
+class StreamedPage(Generic[T]):
+    """
+    A list response whose records are parsed and validated one by one while the
+    body is read from the socket.
+
+    Iterate over the page to get the records. The remaining fields of the
+    response, such as `pagination`, are available once iteration has finished.
+    Peak memory depends on the size of a record, not the size of the page.
+    """
+
+    def __init__(self, response, key: str, model: Type[T], chunk_size: int = 64 * 1024) -> None:
+        self.response = response
+        self.key = key
+        self.model = model
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.extra: Optional[dict] = None
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[T]:
+        for raw in self.raw():
+            yield decoding.decode(raw, self.model)
+
+    def raw(self) -> Iterator[bytes]:
+        """
+        Iterate over the raw JSON of each record, without validating it.
+        """
+        if self._consumed:
+            raise ValueError("A streamed page can only be iterated once")
+        self._consumed = True
+        scanner = JSONArrayScanner(self.key)
+        try:
+            for chunk in self.response.iter_content(chunk_size=self.chunk_size):
+                for raw in scanner.feed(chunk):
+                    self.count += 1
+                    yield raw
+            skeleton = scanner.skeleton()
+            # An empty body (e.g. 204 No Content) has no records and no pagination
+            self.extra = decoding.loads(skeleton) if skeleton.strip() else {}
+        finally:
+            self.close()
+
+    @property
+    def pagination(self) -> Optional[Pagination]:
+        """
+        Pagination info of the page, available after iteration.
+        """
+        if not self.extra or "pagination" not in self.extra:
+            return None
+        return Pagination(**self.extra["pagination"])
+
+    def close(self) -> None:
+        """
+        Release the underlying connection.
+        """
+        self.response.close()
+
+    def __enter__(self) -> "StreamedPage[T]":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
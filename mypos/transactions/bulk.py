@@ -0,0 +1,270 @@
+import csv
+import hashlib
+import json
+import logging
+import typing
+from collections import Counter, deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+from ..base import is_definite_failure
+from ..concurrency import bounded_map
+from ..journal import Journal
+from ..limits import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class BulkOperation(str, Enum):
+    CREATE_LINK = "create_payment_link"
+    UPDATE_LINK = "update_payment_link"
+    DELETE_LINK = "delete_payment_link"
+    CREATE_BUTTON = "create_payment_button"
+    UPDATE_BUTTON = "update_payment_button"
+    DELETE_BUTTON = "delete_payment_button"
+
+    @property
+    def creates(self) -> bool:
+        return self in (BulkOperation.CREATE_LINK, BulkOperation.CREATE_BUTTON)
+
+
+class BulkItem(NamedTuple):
+    operation: BulkOperation
+    params: Dict[str, Any]
+    key: Optional[str] = None
+
+    @property
+    def idempotency_key(self) -> str:
+        """
+        Identifies the item in the checkpoint journal. Deletes default to the operation
+        and code, updates to the code and a digest of their parameters, so a later
+        change of the same link runs again, and creates to a digest of their
+        parameters. Set `key` to create several identical links or buttons.
+        """
+        if self.key:
+            return self.key
+        if self.operation in (BulkOperation.DELETE_LINK, BulkOperation.DELETE_BUTTON):
+            return f"{self.operation.value}:{self.params['code']}"
+        digest = hashlib.blake2b(json.dumps(self.params, sort_keys=True, default=str).encode("utf-8"), digest_size=12).hexdigest()
+        if not self.operation.creates:
+            return f"{self.operation.value}:{self.params['code']}:{digest}"
+        return f"{self.operation.value}:{digest}"
+
+
+class BulkStatus(str, Enum):
+    DONE = "done"
+    ALREADY_DONE = "already_done"
+    IN_DOUBT = "in_doubt"
+    FAILED = "failed"
+
+
+class BulkResult(NamedTuple):
+    item: BulkItem
+    status: BulkStatus
+    value: Any = None
+    message: str = ""
+
+
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+
+def _boolean(value: str) -> bool:
+    normalized = value.strip().lower()
+    if normalized in _TRUE:
+        return True
+    if normalized in _FALSE:
+        return False
+    raise ValueError(f"Invalid boolean '{value}', use one of {sorted(_TRUE | _FALSE)}")
+
+
+def _converter(annotation: Any) -> Callable[[str], Any]:
+    # Optional[X] -> X
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if args:
+        annotation = args[0]
+    if annotation is bool:
+        return _boolean
+    if annotation in (int, float):
+        return annotation
+    return str
+
+
+def parameter_converters(method: Callable) -> Dict[str, Callable[[str], Any]]:
+    """
+    Converters of CSV cells to the annotated types of a method's parameters.
+    """
+    hints = typing.get_type_hints(method)
+    return {name: _converter(hint) for name, hint in hints.items() if name != "return"}
+
+
+def load_bulk_csv(path: str, operation: Optional[Union[BulkOperation, str]] = None) -> List[BulkItem]:
+    """
+    Read bulk operations from a CSV file.
+
+    Columns are the parameters of the `TransactionsV1_1` method, e.g. `item_name`,
+    `item_price`, `currency`, `account_number`, `custom_name` and `quantity` for payment
+    links, or `code` for updates and deletes. Values are converted to the types of the
+    method's parameters, and empty cells are left out. Booleans are 1/true/yes/y or
+    0/false/no/n, anything else raises ValueError. An `operation` column (e.g.
+    `create_payment_link`) may replace the `operation` argument, and a `key` column sets
+    the idempotency key.
+    """
+    from .v1_1 import TransactionsV1_1
+
+    converters: Dict[BulkOperation, Dict[str, Callable[[str], Any]]] = {}
+    items: List[BulkItem] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            op = BulkOperation((row.pop("operation", None) or "").strip() or operation)
+            if op not in converters:
+                converters[op] = parameter_converters(getattr(TransactionsV1_1, op.value))
+            key = (row.pop("key", None) or "").strip() or None
+            params = {}
+            for name, value in row.items():
+                if value is None or not value.strip():
+                    continue
+                if name not in converters[op]:
+                    raise ValueError(f"Unknown column '{name}' for {op.value}")
+                params[name] = converters[op][name](value.strip())
+            items.append(BulkItem(op, params, key))
+    return items
+
+
+def write_bulk_report_csv(results: Iterable[BulkResult], path: str) -> None:
+    """
+    Write a per-item report. For creates, `value` is the response with the URL of the link or button.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["operation", "key", "code", "status", "value", "message"])
+        for result in results:
+            item = result.item
+            value = result.value.model_dump_json() if hasattr(result.value, "model_dump_json") else json.dumps(result.value, default=str)
+            writer.writerow([item.operation.value, item.idempotency_key, item.params.get("code", ""), result.status.value, value, result.message])
+
+
+class BulkRunner:
+    """
+    Runs payment link and button operations in bulk, with a checkpoint journal.
+
+    Items run concurrently under the host limiter of the client, and an
+    optional extra `rate` in requests per second. Results are yielded as items
+    complete. Every operation is journaled before it is sent and after the API
+    answers. Only a 4xx answer is recorded as failed: after a 5xx, a lost
+    connection or an unexpected error the operation may have been applied, and
+    the item is reported as `in_doubt`, as is an applied operation whose
+    outcome could not be journaled. A rerun of the same batch skips
+    completed items and returns their recorded result. Updates and deletes
+    that failed or were in doubt are retried, because they are idempotent.
+    Creates in doubt are never resubmitted, so a rerun cannot create duplicates.
+
+    Example:
+        runner = BulkRunner(client.transactions.v1_1, "links.journal", max_workers=16)
+        results = list(runner.run_items(load_bulk_csv("partner-links.csv", "create_payment_link")))
+        write_bulk_report_csv(results, "partner-links-report.csv")
+    """
+
+    def __init__(
+        self,
+        transactions,
+        journal: Union[str, Journal],
+        max_workers: int = 8,
+        rate: Optional[float] = None
+    ) -> None:
+        self.transactions = transactions
+        self.journal = journal if isinstance(journal, Journal) else Journal(journal)
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate) if rate else None
+
+    def _execute(self, item: BulkItem) -> BulkResult:
+        key = item.idempotency_key
+        record = {"key": key, "operation": item.operation.value}
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.journal.append({**record, "state": "intent"})
+        try:
+            value = getattr(self.transactions, item.operation.value)(**item.params)
+        except Exception as e:
+            if not is_definite_failure(e):
+                # The operation may have been applied, leave the intent in place
+                logger.error(f"{item.operation.value} {key} is in doubt: {e}")
+                return BulkResult(item, BulkStatus.IN_DOUBT, None, str(e))
+            self.journal.append({**record, "state": "failed", "error": str(e)})
+            return BulkResult(item, BulkStatus.FAILED, None, str(e))
+        try:
+            stored = value.model_dump(mode="json") if hasattr(value, "model_dump") else value
+            self.journal.append({**record, "state": "done", "result": stored})
+        except Exception as e:
+            # The operation was applied, but a rerun will only see its intent
+            logger.error(f"{item.operation.value} {key} was applied but its outcome was not journaled: {e}")
+            return BulkResult(item, BulkStatus.IN_DOUBT, value, f"Applied, but the outcome could not be journaled: {e}")
+        return BulkResult(item, BulkStatus.DONE, value)
+
+    def run_items(self, items: Iterable[BulkItem]) -> Iterator[BulkResult]:
+        """
+        Run bulk items, yielding one result per item as they complete.
+        """
+        checkpoint = self.journal.latest("key")
+        summary: Counter = Counter()
+        seen = set()
+        # Updates of one code in one batch would race, only the first is run
+        codes = set()
+        # Items settled from the checkpoint, yielded between the results of submitted items
+        settled: Deque[BulkResult] = deque()
+
+        def pending() -> Iterator[BulkItem]:
+            for item in items:
+                key = item.idempotency_key
+                if key in seen:
+                    # Two identical creates in one batch need distinct keys
+                    settled.append(BulkResult(item, BulkStatus.FAILED, None, "Duplicate item in batch"))
+                    continue
+                seen.add(key)
+                if not item.operation.creates and "code" in item.params:
+                    code = (item.operation, item.params["code"])
+                    if code in codes:
+                        settled.append(BulkResult(item, BulkStatus.FAILED, None, f"Code {item.params['code']} changed twice in batch"))
+                        continue
+                    codes.add(code)
+                record = checkpoint.get(key)
+                if record is not None and record["state"] == "done":
+                    settled.append(BulkResult(item, BulkStatus.ALREADY_DONE, record.get("result"), f"Done at {record['ts']}"))
+                elif record is not None and record["state"] == "intent" and item.operation.creates:
+                    settled.append(BulkResult(item, BulkStatus.IN_DOUBT, None, "Submitted before without a recorded outcome, check it manually"))
+                else:
+                    yield item
+
+        for task in bounded_map(self._execute, pending(), max_workers=self.max_workers):
+            while settled:
+                result = settled.popleft()
+                summary[result.status.value] += 1
+                yield result
+            result = task.value if task.ok else BulkResult(task.item, BulkStatus.FAILED, None, str(task.error))
+            summary[result.status.value] += 1
+            yield result
+        while settled:
+            result = settled.popleft()
+            summary[result.status.value] += 1
+            yield result
+        logger.info(f"Bulk run: {dict(summary)}")
+
+    def run(self, operation: Union[BulkOperation, str], rows: Iterable[Union[Dict[str, Any], BulkItem]]) -> Iterator[BulkResult]:
+        """
+        Run one operation on many items.
+
+        Args:
+            operation: e.g. `BulkOperation.CREATE_LINK` or "create_payment_link".
+            rows: The parameters of every call as dicts, an optional `key` entry setting
+                the idempotency key, or `BulkItem`s.
+        """
+        operation = BulkOperation(operation)
+
+        def items() -> Iterator[BulkItem]:
+            for row in rows:
+                if isinstance(row, BulkItem):
+                    yield row
+                else:
+                    params = dict(row)
+                    key = params.pop("key", None)
+                    yield BulkItem(operation, params, key)
+        return self.run_items(items())
@@ -0,0 +1,304 @@
+import csv
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+from ..base import is_definite_failure
+from ..concurrency import bounded_map
+from ..journal import Journal
+from ..limits import RateLimiter
+from ..pagination import iter_items
+from ..schemas import PaymentRequestStatus
+from .bulk import parameter_converters
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignItem(NamedTuple):
+    """
+    One payment request of a campaign. `key` identifies the payer within the campaign, e.g.
+    a driver ID, and `params` are the arguments of `create_payment_request`.
+    """
+    key: str
+    params: Dict[str, Any]
+    gsm: Optional[str] = None
+    email: Optional[str] = None
+
+
+class CampaignStatus(str, Enum):
+    CREATED = "created"
+    ALREADY_CREATED = "already_created"
+    IN_DOUBT = "in_doubt"
+    FAILED = "failed"
+
+
+class CampaignResult(NamedTuple):
+    item: CampaignItem
+    status: CampaignStatus
+    code: Optional[str] = None
+    url: Optional[str] = None
+    message: str = ""
+
+
+@dataclass
+class CampaignReport:
+    campaign: str
+    created: int = 0
+    in_doubt: int = 0
+    failed: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    reminders: int = 0
+    paid_after_reminder: int = 0
+    created_per_second: Optional[float] = None
+
+    @property
+    def paid(self) -> int:
+        return self.statuses.get(PaymentRequestStatus.PAID.name.lower(), 0)
+
+    @property
+    def conversion(self) -> Optional[float]:
+        """
+        Share of the created payment requests that were paid.
+        """
+        return self.paid / self.created if self.created else None
+
+
+def load_campaign_csv(path: str) -> List[CampaignItem]:
+    """
+    Read a campaign dataset from a CSV file with a `key` column, the parameters of
+    `create_payment_request` (e.g. `amount`, `currency`, `client_name`, `reason`,
+    `payment_request_lang`) and optional `gsm` and `email` columns to send reminders to.
+    `qr_generated` defaults to false.
+    """
+    from .v1_1 import TransactionsV1_1
+
+    converters = parameter_converters(TransactionsV1_1.create_payment_request)
+    items: List[CampaignItem] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = row.pop("key").strip()
+            gsm = (row.pop("gsm", None) or "").strip() or None
+            email = (row.pop("email", None) or "").strip() or None
+            params: Dict[str, Any] = {"qr_generated": False}
+            for name, value in row.items():
+                if value is None or not value.strip():
+                    continue
+                if name not in converters:
+                    raise ValueError(f"Unknown column '{name}' for create_payment_request")
+                params[name] = converters[name](value.strip())
+            items.append(CampaignItem(key, params, gsm, email))
+    return items
+
+
+class Campaign:
+    """
+    Creates the payment requests of a campaign concurrently and chases the unpaid ones.
+
+    Every request is journaled before it is created and with its code once it
+    is. Running the campaign again skips the payers that already have a
+    request, so a rerun never creates duplicates. Only a 4xx answer is
+    recorded as failed and retried by a rerun. A creation that was sent
+    without a recorded answer (a crash, a lost connection, a 5xx, an
+    unexpected error or a failure to journal the answer) is reported as
+    `in_doubt` and not retried.
+    Reminders go out in batches, under their own rate limit, to requests that
+    are still pending or seen. Statuses are looked up with one filtered
+    listing per status, not per code.
+
+    Example:
+        campaign = Campaign(client.transactions.v1_1, "fees-2026-10", "campaigns.journal", rate=5, reminder_rate=1)
+        results = list(campaign.create(load_campaign_csv("driver-fees.csv")))
+        ...
+        campaign.send_reminders(batch_size=100)
+        print(campaign.report())
+    """
+
+    def __init__(
+        self,
+        transactions,
+        name: str,
+        journal: Union[str, Journal],
+        max_workers: int = 8,
+        rate: Optional[float] = None,
+        reminder_rate: Optional[float] = 1.0,
+        page_size: int = 1000
+    ) -> None:
+        self.transactions = transactions
+        self.name = name
+        self.journal = journal if isinstance(journal, Journal) else Journal(journal)
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate) if rate else None
+        self.reminder_limiter = RateLimiter(reminder_rate) if reminder_rate else None
+        self.page_size = page_size
+
+    def _key(self, item_key: str) -> str:
+        return f"{self.name}:{item_key}"
+
+    def _records(self) -> Dict[str, Dict[str, Any]]:
+        # The last record of every payer of this campaign, and of their reminders
+        prefix = f"{self.name}:"
+        return {key: record for key, record in self.journal.latest("key").items() if key.startswith(prefix)}
+
+    def _create(self, item: CampaignItem) -> CampaignResult:
+        record = {"key": self._key(item.key), "campaign": self.name, "item": item.key, "gsm": item.gsm, "email": item.email}
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        self.journal.append({**record, "state": "intent"})
+        try:
+            response = self.transactions.create_payment_request(**item.params)
+        except Exception as e:
+            if not is_definite_failure(e):
+                # The request may have been created, leave the intent unresolved
+                logger.error(f"Payment request for {item.key} is in doubt: {e}")
+                return CampaignResult(item, CampaignStatus.IN_DOUBT, message=str(e))
+            self.journal.append({**record, "state": "failed", "error": str(e)})
+            return CampaignResult(item, CampaignStatus.FAILED, message=str(e))
+        code = url = None
+        try:
+            code = response.get("code")
+            url = response.get("payment_request_url")
+            self.journal.append({**record, "state": "created", "code": code, "url": url})
+        except Exception as e:
+            # The request was created, but a rerun will only see its intent
+            logger.error(f"Payment request for {item.key} was created but not journaled: {e}")
+            return CampaignResult(item, CampaignStatus.IN_DOUBT, code, url, f"Created, but the answer could not be journaled: {e}")
+        return CampaignResult(item, CampaignStatus.CREATED, code, url)
+
+    def create(self, items: Iterable[CampaignItem]) -> Iterator[CampaignResult]:
+        """
+        Create the payment requests of the payers that do not have one yet, yielding results
+        as they complete.
+        """
+        records = self._records()
+        pending: List[CampaignItem] = []
+        seen = set()
+        for item in items:
+            record = records.get(self._key(item.key))
+            if item.key in seen:
+                yield CampaignResult(item, CampaignStatus.FAILED, message="Duplicate key in dataset")
+            elif record is not None and record["state"] == "created":
+                yield CampaignResult(item, CampaignStatus.ALREADY_CREATED, record["code"], record.get("url"))
+            elif record is not None and record["state"] == "intent":
+                yield CampaignResult(item, CampaignStatus.IN_DOUBT, message="Sent before without a recorded answer, check it manually")
+            else:
+                pending.append(item)
+            seen.add(item.key)
+
+        start = time.perf_counter()
+        summary: Counter = Counter()
+        for task in bounded_map(self._create, pending, max_workers=self.max_workers):
+            result = task.value if task.ok else CampaignResult(task.item, CampaignStatus.FAILED, message=str(task.error))
+            summary[result.status.value] += 1
+            yield result
+        if pending:
+            elapsed = time.perf_counter() - start
+            logger.info(f"Campaign {self.name}: {dict(summary)} in {elapsed:.1f} s ({len(pending) / elapsed:.1f} requests/s)")
+
+    def codes(self) -> Dict[str, str]:
+        """
+        The payment request code of every payer with a created request.
+        """
+        return {record["item"]: record["code"] for record in self._records().values() if record.get("state") == "created" and record.get("code")}
+
+    def statuses(self) -> Dict[str, PaymentRequestStatus]:
+        """
+        The current status of the campaign's payment requests, by code.
+        """
+        records = [record for record in self._records().values() if record.get("state") == "created"]
+        if not records:
+            return {}
+        codes = {record["code"] for record in records}
+        from_date = datetime.fromtimestamp(min(record["ts"] for record in records)).strftime("%Y-%m-%d")
+
+        def listing(status: PaymentRequestStatus) -> List[str]:
+            return [
+                request.code for request in iter_items(lambda page: self.transactions.stream_payment_requests(
+                    page=page, size=self.page_size, status=status, from_date=from_date
+                ))
+                if request.code in codes
+            ]
+
+        found: Dict[str, PaymentRequestStatus] = {}
+        for result in bounded_map(listing, list(PaymentRequestStatus), max_workers=self.max_workers):
+            if not result.ok:
+                raise result.error
+            for code in result.value:
+                found[code] = result.item
+        return found
+
+    def send_reminders(self, batch_size: int = 100, min_interval: float = 3 * 86400, max_reminders: int = 3) -> List[str]:
+        """
+        Send one batch of reminders to the payers whose request is still pending or seen.
+
+        Args:
+            batch_size: Maximum number of reminders sent by this call.
+            min_interval: Seconds since the request was created or last reminded. Default is 3 days.
+            max_reminders: Stop reminding a payer after this many reminders. Default is 3.
+
+        Returns:
+            List[str]: The codes that were reminded.
+        """
+        records = self._records()
+        statuses = self.statuses()
+        now = time.time()
+        due = []
+        for key, record in records.items():
+            if record.get("state") != "created" or statuses.get(record["code"]) not in (PaymentRequestStatus.PENDING, PaymentRequestStatus.SEEN):
+                continue
+            if not record.get("gsm") and not record.get("email"):
+                continue
+            reminded = records.get(f"{key}:reminder")
+            count = reminded["count"] if reminded else 0
+            last = reminded["ts"] if reminded else record["ts"]
+            if count < max_reminders and now - last >= min_interval:
+                due.append((last, key, record, count))
+        due.sort(key=lambda entry: entry[0])
+
+        def remind(entry) -> str:
+            _, key, record, count = entry
+            if self.reminder_limiter is not None:
+                self.reminder_limiter.acquire()
+            self.transactions.send_payment_request_reminder(record["code"], gsm=record.get("gsm"), email=record.get("email"))
+            self.journal.append({"key": f"{key}:reminder", "campaign": self.name, "code": record["code"], "state": "reminded", "count": count + 1})
+            return record["code"]
+
+        sent = []
+        for task in bounded_map(remind, due[:batch_size], max_workers=self.max_workers):
+            if task.ok:
+                sent.append(task.value)
+            else:
+                logger.warning(f"Failed to send a reminder for {task.item[2]['code']}: {task.error}")
+        logger.info(f"Campaign {self.name}: sent {len(sent)} reminders, {max(0, len(due) - batch_size)} still due")
+        return sent
+
+    def report(self) -> CampaignReport:
+        """
+        Creation throughput and conversion of the campaign so far.
+        """
+        records = self._records()
+        report = CampaignReport(self.name)
+        reminded_codes = set()
+        for key, record in records.items():
+            state = record.get("state")
+            if state == "created":
+                report.created += 1
+            elif state == "intent":
+                report.in_doubt += 1
+            elif state == "failed":
+                report.failed += 1
+            elif state == "reminded":
+                report.reminders += record["count"]
+                reminded_codes.add(record["code"])
+
+        statuses = self.statuses()
+        report.statuses = dict(Counter(status.name.lower() for status in statuses.values()))
+        report.paid_after_reminder = sum(1 for code in reminded_codes if statuses.get(code) is PaymentRequestStatus.PAID)
+
+        # Wall-clock creation rate, from the journal of every run
+        created = [record["ts"] for record in self.journal.replay() if record.get("campaign") == self.name and record.get("state") in ("intent", "created")]
+        if len(created) > 1 and max(created) > min(created):
+            report.created_per_second = report.created / (max(created) - min(created))
+        return report
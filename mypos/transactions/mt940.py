@@ -0,0 +1,366 @@
+import io
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+DOCUMENT_TYPES = {0: "multicash", 1: "swift", 2: "structured"}
+
+_TAG = re.compile(r":(\d{2}[A-Z]?):")
+# The customer reference may contain "/", the bank reference follows the first "//"
+_LINE_61 = re.compile(r"(\d{6})(\d{4})?(R?[CD])([A-Z])?(\d+,\d*)([NSF][A-Z0-9]{3})(.*?)(?://(.*))?")
+_BALANCE = re.compile(r"([CD])(\d{6})([A-Z]{3})(\d+,\d*)")
+_STATEMENT_NUMBER = re.compile(r"(\d+)(?:/(\d+))?")
+# Multicash (?20?21...) and structured (/EREF/.../REMI/...) information to account owner
+_QUESTION_SUBFIELD = re.compile(r"\?(\d{2})")
+_SLASH_SUBFIELD = re.compile(r"/([A-Z][A-Z0-9]{1,4})/")
+_REFERENCE_TOKEN = re.compile(r"[A-Za-z0-9]{6,}")
+# Number of Entry fields before `details`
+_DETAILS = 12
+
+
+@dataclass(frozen=True, slots=True)
+class Balance:
+    mark: str
+    date: str
+    currency: str
+    amount: float
+
+    @property
+    def signed_amount(self) -> float:
+        return -self.amount if self.mark == "D" else self.amount
+
+
+@dataclass(frozen=True, slots=True)
+class Entry:
+    """
+    One statement line (:61:) and its information to account owner (:86:).
+    """
+    account: Optional[str]
+    statement_reference: Optional[str]
+    value_date: str
+    entry_date: Optional[str]
+    mark: str
+    amount: float
+    currency: Optional[str]
+    transaction_type: str
+    customer_reference: str
+    bank_reference: Optional[str] = None
+    funds_code: Optional[str] = None
+    supplementary: Optional[str] = None
+    details: Optional[str] = None
+    fields: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def signed_amount(self) -> float:
+        # C and RD (reversal of debit) increase the balance
+        return self.amount if self.mark in ("C", "RD") else -self.amount
+
+    def references(self) -> Iterator[str]:
+        """
+        Candidate references of the entry: its customer and bank references, the
+        values of its structured fields and the alphanumeric tokens of its details.
+        Empty values are skipped.
+        """
+        if self.customer_reference and self.customer_reference != "NONREF":
+            yield self.customer_reference
+        if self.bank_reference:
+            yield self.bank_reference
+        for value in self.fields.values():
+            value = value.strip()
+            if value:
+                yield value
+        for text in (self.supplementary, self.details):
+            if text:
+                yield from _REFERENCE_TOKEN.findall(text)
+
+
+@dataclass(frozen=True, slots=True)
+class Statement:
+    """
+    A statement (:20: to :62F:), yielded after its entries.
+    """
+    reference: Optional[str]
+    account: Optional[str]
+    number: Optional[str]
+    sequence: Optional[str]
+    opening_balance: Optional[Balance]
+    closing_balance: Optional[Balance]
+    closing_available_balance: Optional[Balance] = None
+    related_reference: Optional[str] = None
+    information: Optional[str] = None
+    entries: int = 0
+    credits: float = 0.0
+    debits: float = 0.0
+
+    @property
+    def balanced(self) -> Optional[bool]:
+        """
+        Whether the opening balance plus the entries gives the closing balance.
+        """
+        if self.opening_balance is None or self.closing_balance is None:
+            return None
+        expected = self.opening_balance.signed_amount + self.credits - self.debits
+        return abs(expected - self.closing_balance.signed_amount) < 0.005
+
+
+def _date(value: str) -> str:
+    return f"20{value[0:2]}-{value[2:4]}-{value[4:6]}"
+
+
+def _amount(value: str) -> float:
+    return float(value.replace(",", "."))
+
+
+def _balance(value: str) -> Optional[Balance]:
+    match = _BALANCE.match(value)
+    if match is None:
+        return None
+    mark, day, currency, amount = match.groups()
+    return Balance(mark, _date(day), currency, _amount(amount))
+
+
+def _entry_date(value_date: str, entry: Optional[str]) -> Optional[str]:
+    # The entry date has no year, it can fall in the year before or after the value date
+    if not entry:
+        return None
+    year = int(value_date[:4])
+    month = int(entry[:2])
+    value_month = int(value_date[5:7])
+    if value_month == 12 and month == 1:
+        year += 1
+    elif value_month == 1 and month == 12:
+        year -= 1
+    return f"{year}-{entry[:2]}-{entry[2:]}"
+
+
+def parse_information(details: str) -> Dict[str, str]:
+    """
+    Split structured information to account owner (:86:) into its subfields.
+
+    Multicash subfields (`166?00TRANSFER?20...`) are keyed by their number,
+    with the leading transaction code as `code`. Structured subfields
+    (`/EREF/.../REMI/...`) are keyed by their code. Unstructured text gives an
+    empty dict.
+    """
+    text = details.replace("\n", "")
+    if "?" in text[:4]:
+        parts = _QUESTION_SUBFIELD.split(text)
+        fields = {"code": parts[0]} if parts[0] else {}
+        for i in range(1, len(parts) - 1, 2):
+            key = parts[i]
+            fields[key] = fields[key] + parts[i + 1] if key in fields else parts[i + 1]
+        return fields
+    if text.startswith("/") and _SLASH_SUBFIELD.match(text):
+        parts = _SLASH_SUBFIELD.split(text)
+        fields = {}
+        for i in range(1, len(parts) - 1, 2):
+            fields[parts[i]] = parts[i + 1].rstrip("/")
+        return fields
+    return {}
+
+
+def _lines(source: Any, encoding: str) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)) and "\n" not in str(source):
+        with open(source, encoding=encoding, errors="replace") as f:
+            yield from f
+        return
+    if isinstance(source, str):
+        yield from io.StringIO(source)
+        return
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif hasattr(source, "iter_lines"):
+        # A streamed HTTP response
+        source = source.iter_lines()
+    for line in source:
+        yield line.decode(encoding, errors="replace") if isinstance(line, (bytes, bytearray)) else line
+
+
+def _fields(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    # Groups lines into (tag, value) fields. A field continues until the next tag;
+    # "-" or "-}" ends a message and is reported as the "-" tag.
+    tag: Optional[str] = None
+    value: List[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] == "{":
+            # SWIFT basic/application header blocks, the text block starts after {4:
+            position = line.find("{4:")
+            line = line[position + 3:] if position >= 0 else ""
+        if not line:
+            continue
+        if line[0] == ":" and (match := _TAG.match(line)) is not None:
+            if tag is not None:
+                yield tag, "\n".join(value)
+            tag, value = match.group(1), [line[match.end():]]
+        elif line[0] == "-" and line.rstrip() in ("-", "-}"):
+            if tag is not None:
+                yield tag, "\n".join(value)
+            tag, value = None, []
+            yield "-", ""
+        elif tag is not None:
+            value.append(line)
+    if tag is not None:
+        yield tag, "\n".join(value)
+
+
+class MT940Parser:
+    """
+    Incremental MT940 parser for Multicash, Swift and structured statements
+    (`document_type` 0, 1 and 2 of `generate_mt940_statement`).
+
+    Lines are read one at a time and records are yielded as soon as they are
+    complete: an `Entry` for every :61: line with its :86: information, then a
+    `Statement` with the balances and totals once the statement ends. Memory
+    use does not depend on the size of the file. Entries carry the account and
+    statement reference, so they can be processed without the statement.
+
+    Example:
+        for record in MT940Parser().parse("statements/4010000001/2026-09-30.swift.sta"):
+            if isinstance(record, Entry):
+                print(record.value_date, record.signed_amount, record.fields.get("REMI"))
+    """
+
+    def __init__(self, encoding: str = "utf-8", structured: bool = True) -> None:
+        self.encoding = encoding
+        self.structured = structured
+
+    def parse(self, source: Any) -> Iterator[Union[Entry, Statement]]:
+        """
+        Parse statements from a file path, bytes, a binary or text file, a streamed
+        response or an iterable of lines. A string containing newlines is parsed as the
+        statement text itself, e.g. the value of `generate_mt940_statement`.
+        """
+        header: Dict[str, Any] = {}
+        # The arguments of the pending Entry, in field order
+        entry: Optional[List[Any]] = None
+        totals = [0, 0.0, 0.0]
+
+        def flush_entry() -> Optional[Entry]:
+            nonlocal entry
+            if entry is None:
+                return None
+            record = Entry(*entry)
+            entry = None
+            totals[0] += 1
+            if record.signed_amount >= 0:
+                totals[1] += record.signed_amount
+            else:
+                totals[2] -= record.signed_amount
+            return record
+
+        def flush_statement() -> Optional[Statement]:
+            nonlocal header, totals
+            if not header:
+                return None
+            record = Statement(
+                header.get("20"), header.get("25"), header.get("number"), header.get("sequence"),
+                header.get("60"), header.get("62"), header.get("64"), header.get("21"), header.get("86"),
+                totals[0], round(totals[1], 2), round(totals[2], 2)
+            )
+            header, totals = {}, [0, 0.0, 0.0]
+            return record
+
+        for tag, value in _fields(_lines(source, self.encoding)):
+            if tag == "86" and entry is not None and len(entry) == _DETAILS:
+                entry.append(value)
+                if self.structured:
+                    entry.append(parse_information(value))
+                continue
+            record = flush_entry()
+            if record is not None:
+                yield record
+
+            if tag == "61":
+                entry = self._entry(value, header)
+            elif tag == "20" or tag == "-":
+                statement = flush_statement()
+                if statement is not None:
+                    yield statement
+                if tag == "20":
+                    header["20"] = value.strip()
+            elif tag == "25":
+                header["25"] = value.strip()
+            elif tag == "28C" or tag == "28":
+                match = _STATEMENT_NUMBER.match(value.strip())
+                if match is not None:
+                    header["number"], header["sequence"] = match.groups()
+            elif tag in ("60F", "60M"):
+                header["60"] = _balance(value)
+            elif tag in ("62F", "62M"):
+                header["62"] = _balance(value)
+            elif tag == "64":
+                header["64"] = _balance(value)
+            elif tag == "21":
+                header["21"] = value.strip()
+            elif tag == "86":
+                header["86"] = value
+
+        record = flush_entry()
+        if record is not None:
+            yield record
+        statement = flush_statement()
+        if statement is not None:
+            yield statement
+
+    @staticmethod
+    def _entry(value: str, header: Dict[str, Any]) -> List[Any]:
+        line, _, supplementary = value.partition("\n")
+        match = _LINE_61.fullmatch(line)
+        if match is None:
+            raise ValueError(f"Invalid :61: statement line '{line}'")
+        value_date, entry_date, mark, funds_code, amount, transaction_type, customer_reference, bank_reference = match.groups()
+        value_date = _date(value_date)
+        opening = header.get("60")
+        return [
+            header.get("25"),
+            header.get("20"),
+            value_date,
+            _entry_date(value_date, entry_date),
+            mark,
+            _amount(amount),
+            opening.currency if opening is not None else None,
+            transaction_type,
+            customer_reference.strip(),
+            bank_reference.strip() if bank_reference else None,
+            funds_code,
+            supplementary or None,
+        ]
+
+
+def parse_mt940(source: Any, encoding: str = "utf-8") -> Iterator[Union[Entry, Statement]]:
+    """
+    Parse MT940 statements incrementally, see `MT940Parser.parse`.
+    """
+    return MT940Parser(encoding).parse(source)
+
+
+def iter_entries(source: Any, encoding: str = "utf-8") -> Iterator[Entry]:
+    """
+    The entries of every statement of an MT940 file, in constant memory.
+    """
+    return (record for record in parse_mt940(source, encoding) if isinstance(record, Entry))
+
+
+def match_transactions(entries: Iterable[Entry], transactions: Iterable[Any]) -> Iterator[Tuple[Entry, Optional[Any]]]:
+    """
+    Join statement entries to transactions by `payment_reference`.
+
+    The transactions, e.g. from `TransactionsV1_1.stream_list` or `TransactionRecord`s,
+    are indexed by payment reference, leaving out unsettled transactions, whose
+    payment reference is empty. Each entry is matched on the first of its
+    `references()` found in the index, so the reference may appear in the
+    :61: references, a structured :86: subfield or its free text.
+
+    Yields:
+        (entry, transaction) pairs, with None for entries without a matching transaction.
+    """
+    index = {transaction.payment_reference: transaction for transaction in transactions if transaction.payment_reference}
+    for entry in entries:
+        match = None
+        for reference in entry.references():
+            match = index.get(reference)
+            if match is not None:
+                break
+        yield entry, match
@@ -0,0 +1,178 @@
+import logging
+import os
+import time
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+from ..concurrency import bounded_map
+from ..limits import RateLimiter
+from ..pagination import fetch_all
+from ..schemas import Account
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_TYPES = {0: "multicash", 1: "swift", 2: "structured"}
+
+
+class StatementJob(NamedTuple):
+    account_number: str
+    date: str
+    document_type: int
+
+
+class StatementStatus(str, Enum):
+    DOWNLOADED = "downloaded"
+    EXISTS = "exists"
+    FAILED = "failed"
+
+
+class StatementResult(NamedTuple):
+    job: StatementJob
+    status: StatementStatus
+    path: str
+    size: int = 0
+    message: str = ""
+
+
+def _day(value: Union[str, date]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def date_range(from_date: Union[str, date], to_date: Union[str, date]) -> List[str]:
+    """
+    Every day from `from_date` to `to_date`, both included, as YYYY-MM-DD.
+    """
+    start, end = _day(from_date), _day(to_date)
+    return [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range((end - start).days + 1)]
+
+
+class StatementDownloader:
+    """
+    Downloads the MT940 statements of many accounts, days and document types concurrently.
+
+    Every account × day × document type is one `download_mt940_statement` call,
+    streamed straight to its file, so memory use does not grow with the size of
+    the statements. Statements already on disk are skipped, and files only
+    appear once complete, so an interrupted month-end run can simply be
+    started again. Requests go through the host limiter of the client, and an
+    optional extra `rate` in requests per second.
+
+    Files are named by `pattern`, formatted with `account_number`, `date`,
+    `document_type` and `format` (multicash, swift or structured), relative to
+    `directory`.
+
+    Example:
+        downloader = StatementDownloader(client.transactions.v1_1, "statements", max_workers=16)
+        for result in downloader.run("2026-09-01", "2026-09-30", document_types=[1, 2]):
+            if result.status is StatementStatus.FAILED:
+                print(result.job, result.message)
+    """
+
+    def __init__(
+        self,
+        transactions,
+        directory: str,
+        pattern: str = "{account_number}/{date}.{format}.sta",
+        max_workers: int = 8,
+        rate: Optional[float] = None,
+        page_size: int = 100
+    ) -> None:
+        self.transactions = transactions
+        self.directory = directory
+        self.pattern = pattern
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(rate) if rate else None
+        self.page_size = page_size
+
+    def accounts(self, include_reserve: bool = False) -> List[Account]:
+        """
+        Every account of the merchant, from `list_accounts`.
+        """
+        accounts = fetch_all(lambda page: self.transactions.list_accounts(page=page, size=self.page_size), "accounts", max_workers=self.max_workers)
+        return [account for account in accounts if include_reserve or not account.is_reserve]
+
+    def path(self, job: StatementJob) -> str:
+        name = self.pattern.format(
+            account_number=job.account_number, date=job.date, document_type=job.document_type,
+            format=DOCUMENT_TYPES.get(job.document_type, job.document_type)
+        )
+        return os.path.join(self.directory, name)
+
+    def jobs(self, account_numbers: Iterable[str], dates: Iterable[str], document_types: Iterable[int] = (1,)) -> Iterator[StatementJob]:
+        dates, document_types = list(dates), list(document_types)
+        for account_number in account_numbers:
+            for day in dates:
+                for document_type in document_types:
+                    yield StatementJob(account_number, day, document_type)
+
+    def _download(self, job: StatementJob) -> StatementResult:
+        path = self.path(job)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        size = self.transactions.download_mt940_statement(job.document_type, job.date, job.account_number, path)
+        return StatementResult(job, StatementStatus.DOWNLOADED, path, size)
+
+    def download(self, jobs: Iterable[StatementJob]) -> Iterator[StatementResult]:
+        """
+        Download statements, yielding one result per job as they complete.
+        """
+        summary: Counter = Counter()
+        existing: Deque[StatementResult] = deque()
+
+        def pending() -> Iterator[StatementJob]:
+            for job in jobs:
+                path = self.path(job)
+                if os.path.exists(path):
+                    existing.append(StatementResult(job, StatementStatus.EXISTS, path, os.path.getsize(path)))
+                else:
+                    yield job
+
+        start = time.perf_counter()
+        downloaded = 0
+        for task in bounded_map(self._download, pending(), max_workers=self.max_workers):
+            while existing:
+                result = existing.popleft()
+                summary[result.status.value] += 1
+                yield result
+            if task.ok:
+                result = task.value
+                downloaded += result.size
+            else:
+                logger.warning(f"Failed to download statement {task.item}: {task.error}")
+                result = StatementResult(task.item, StatementStatus.FAILED, self.path(task.item), message=str(task.error))
+            summary[result.status.value] += 1
+            yield result
+        while existing:
+            result = existing.popleft()
+            summary[result.status.value] += 1
+            yield result
+        elapsed = time.perf_counter() - start
+        logger.info(f"Statements: {dict(summary)}, {downloaded / 1e6:.1f} MB in {elapsed:.1f} s")
+
+    def run(
+        self,
+        from_date: Union[str, date],
+        to_date: Union[str, date],
+        document_types: Sequence[int] = (1,),
+        account_numbers: Optional[Iterable[str]] = None,
+        include_reserve: bool = False
+    ) -> Iterator[StatementResult]:
+        """
+        Download the statements of every account for every day of a period.
+
+        Args:
+            from_date: First day, YYYY-MM-DD or a date.
+            to_date: Last day, included.
+            document_types: 0 = Multicash, 1 = Swift, 2 = Structured. Default is Swift only.
+            account_numbers: Only these accounts. Defaults to every account from `list_accounts`.
+            include_reserve: Also download the statements of reserve accounts. Default is False.
+        """
+        if account_numbers is None:
+            account_numbers = [account.account_number for account in self.accounts(include_reserve)]
+        return self.download(self.jobs(account_numbers, date_range(from_date, to_date), document_types))
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from ...schemas import TransactionType, TransactionListResponse, TransactionDetailsResponse
+from ..schemas import TransactionType, TransactionListResponse, TransactionDetailsResponse
 
 class TransactionsV1:
     def __init__(self, client):
@@ -30,17 +30,16 @@ class TransactionsV1:
         if last_transaction_id:
             body["last_transaction_id"] = last_transaction_id
 
-        response_data = self.client.request(
+        return self.client.request_model(
+            TransactionListResponse,
             "GET", 
             "/v1/transactions", 
             params={"size": size}, 
             json=body
         )
-        return TransactionListResponse(**response_data)
 
     def get_details(self, payment_reference: str) -> TransactionDetailsResponse:
         """
         Get transaction details from MyPOS API (v1).
         """
-        response_data = self.client.request("GET", f"/v1/transactions/{payment_reference}")
-        return TransactionDetailsResponse(**response_data)
+        return self.client.request_model(TransactionDetailsResponse, "GET", f"/v1/transactions/{payment_reference}")
@@ -1,6 +1,9 @@
+import os
 from typing import Optional, List
 from datetime import datetime
-from ...schemas import MultipleTransactionDetailsResponse, AccountListResponse, TransactionType, TransactionListResponse, TransactionDetailsResponse, Language, PaymentButtonListResponse, PaymentButtonStatus, PaymentLinkListResponse, PaymentLinkStatus, PaymentButtonDetails, PaymentLinkDetails, SettlementData, PaymentRequestDetails, PaymentRequestListResponse, PaymentRequestStatus
+from ..schemas import Transaction, PaymentRequest, MultipleTransactionDetailsResponse, AccountListResponse, TransactionType, TransactionListResponse, TransactionDetailsResponse, Language, PaymentButtonListResponse, PaymentButtonStatus, PaymentLinkListResponse, PaymentLinkStatus, PaymentButtonDetails, PaymentLinkDetails, SettlementData, PaymentRequestDetails, PaymentRequestListResponse, PaymentRequestStatus
+from .. import decoding
+from ..streaming import StreamedPage
 
 class TransactionsV1_1:
     def __init__(self, client):
@@ -31,6 +34,52 @@ class TransactionsV1_1:
         Returns:
             TransactionListResponse: Object containing list of transactions and pagination info.
         """
+        return self.client.request_model(
+            TransactionListResponse,
+            "GET", 
+            "/v1.1/transactions", 
+            params=self._list_params(page, size, order, from_date, to_date, transaction_types, start_trn_id)
+        )
+
+    def stream_list(
+        self, 
+        page: Optional[int] = 1,
+        size: Optional[int] = 1000,
+        order: Optional[int] = 1,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        transaction_types: Optional[List[TransactionType]] = None,
+        start_trn_id: Optional[int] = None
+    ) -> StreamedPage[Transaction]:
+        """
+        Stream one page of transactions, validating each record as it is read
+        from the socket. Use instead of `list` for large pages.
+
+        Args:
+            Same as `list`. Default size is 1000.
+
+        Returns:
+            StreamedPage[Transaction]: Iterable of transactions. Its pagination info is
+            available once iteration has finished.
+        """
+        return self.client.request_stream(
+            "transactions",
+            Transaction,
+            "GET", 
+            "/v1.1/transactions", 
+            params=self._list_params(page, size, order, from_date, to_date, transaction_types, start_trn_id)
+        )
+
+    def _list_params(
+        self,
+        page: Optional[int],
+        size: Optional[int],
+        order: Optional[int],
+        from_date: Optional[datetime],
+        to_date: Optional[datetime],
+        transaction_types: Optional[List[TransactionType]],
+        start_trn_id: Optional[int]
+    ) -> dict:
         params = {
             "page": page,
             "size": size,
@@ -45,20 +94,13 @@ class TransactionsV1_1:
             params["transaction_types"] = ",".join([t.value for t in transaction_types])
         if start_trn_id:
             params["start_trn_id"] = start_trn_id
-
-        response_data = self.client.request(
-            "GET", 
-            "/v1.1/transactions", 
-            params=params
-        )
-        return TransactionListResponse(**response_data)
+        return params
 
     def get_details(self, payment_reference: str) -> TransactionDetailsResponse:
         """
         Get transaction details from MyPOS API (v1.1).
         """
-        response_data = self.client.request("GET", f"/v1.1/transactions/{payment_reference}")
-        return TransactionDetailsResponse(**response_data)
+        return self.client.request_model(TransactionDetailsResponse, "GET", f"/v1.1/transactions/{payment_reference}")
 
     def get_multiple_details(self, payment_references: List[str]) -> MultipleTransactionDetailsResponse:
         """
@@ -67,12 +109,12 @@ class TransactionsV1_1:
         if len(payment_references) > 5:
             raise ValueError("Maximum 5 payment references allowed")
 
-        response_data = self.client.request(
+        return self.client.request_model(
+            MultipleTransactionDetailsResponse,
             "GET", 
             "/v1.1/transactions/details", 
             params={"references": ",".join(payment_references)}
         )
-        return MultipleTransactionDetailsResponse(**response_data)
 
     def list_accounts(
         self, 
@@ -82,12 +124,12 @@ class TransactionsV1_1:
         """
         Get accounts from MyPOS API (v1.1).
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            AccountListResponse,
             "GET", 
             "/v1.1/accounts", 
             params={"page": page, "size": size}
         )
-        return AccountListResponse(**response_data)
 
     def generate_mt940_statement(
         self,
@@ -106,20 +148,71 @@ class TransactionsV1_1:
         Returns:
             str: The contents of the MT940 generated file
         """
-        data = {
+        response = self.client.send("POST", "/v1.1/accounts/statement", json=self._statement_params(document_type, date, account_number))
+        return self._statement_text(response.content, response.headers.get("Content-Type"))
+
+    def download_mt940_statement(
+        self,
+        document_type: int,
+        date: str,
+        account_number: str,
+        path: str,
+        chunk_size: int = 64 * 1024
+    ) -> int:
+        """
+        Generate MT940 statement for an account and stream it to a file, without holding
+        the statement in memory. The file is written under a temporary name and renamed
+        when complete, so an interrupted download never leaves a partial statement at `path`.
+
+        Args:
+            document_type: The type of the MT940. 0 = Multicash, 1 = Swift, 2 = Structured
+            date: The date for which to generate the statement in format YYYY-MM-DD
+            account_number: The number of the account for which to generate the statement
+            path: The file to write the statement to
+            chunk_size: Bytes read from the socket at a time. Default is 64 KiB.
+
+        Returns:
+            int: The size of the statement in bytes
+        """
+        response = self.client.send(
+            "POST", "/v1.1/accounts/statement", json=self._statement_params(document_type, date, account_number), stream=True
+        )
+        temporary = f"{path}.part"
+        size = 0
+        try:
+            with open(temporary, "wb") as f:
+                if "json" in (response.headers.get("Content-Type") or ""):
+                    # A JSON string has to be decoded as a whole
+                    size = f.write(self._statement_text(response.content, "application/json").encode("utf-8"))
+                else:
+                    for chunk in response.iter_content(chunk_size):
+                        size += f.write(chunk)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        finally:
+            response.close()
+        return size
+
+    @staticmethod
+    def _statement_params(document_type: int, date: str, account_number: str) -> dict:
+        return {
             "document_type": document_type,
             "date": date,
             "account_number": account_number
         }
-        
-        response_data = self.client.request(
-            "POST",
-            "/v1.1/accounts/statement",
-            json=data
-        )
-        
-        # The response is a plain string (MT940 file contents)
-        return response_data if isinstance(response_data, str) else str(response_data)
+
+    @staticmethod
+    def _statement_text(content: bytes, content_type: Optional[str]) -> str:
+        # The statement is a plain string (MT940 file contents), possibly sent as a JSON string
+        if "json" not in (content_type or ""):
+            return content.decode("utf-8", errors="replace")
+        statement = decoding.loads(content)
+        if not isinstance(statement, str):
+            raise Exception(f"Unexpected MT940 statement response: {content[:200]!r}")
+        return statement
 
     def create_payment_button(
         self,
@@ -280,12 +373,11 @@ class TransactionsV1_1:
         Returns:
             List[Language]: List of supported languages
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            List[Language],
             "GET",
             "/v1.1/online-payments/languages"
         )
-        # Response is a list of language objects
-        return [Language(**lang) for lang in response_data]
 
     def list_payment_buttons(
         self,
@@ -312,12 +404,12 @@ class TransactionsV1_1:
         if status is not None:
             params["status"] = status.value
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentButtonListResponse,
             "GET",
             "/v1.1/online-payments/buttons",
             params=params
         )
-        return PaymentButtonListResponse(**response_data)
 
     def list_payment_links(
         self,
@@ -344,12 +436,12 @@ class TransactionsV1_1:
         if status is not None:
             params["status"] = status.value
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentLinkListResponse,
             "GET",
             "/v1.1/online-payments/links",
             params=params
         )
-        return PaymentLinkListResponse(**response_data)
 
     def get_payment_button_details(self, code: str) -> PaymentButtonDetails:
         """
@@ -361,11 +453,11 @@ class TransactionsV1_1:
         Returns:
             PaymentButtonDetails: Payment button details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentButtonDetails,
             "GET",
             f"/v1.1/online-payments/button/{code}"
         )
-        return PaymentButtonDetails(**response_data)
 
     def get_payment_link_details(self, code: str) -> PaymentLinkDetails:
         """
@@ -377,11 +469,11 @@ class TransactionsV1_1:
         Returns:
             PaymentLinkDetails: Payment link details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentLinkDetails,
             "GET",
             f"/v1.1/online-payments/link/{code}"
         )
-        return PaymentLinkDetails(**response_data)
 
     def delete_payment_button(self, code: str) -> None:
         """
@@ -420,12 +512,11 @@ class TransactionsV1_1:
         Returns:
             List[SettlementData]: List of settlement data objects
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            List[SettlementData],
             "GET",
             "/v1.1/online-payments/settlement-data"
         )
-        # Response is a list of settlement data objects
-        return [SettlementData(**item) for item in response_data]
 
     def update_payment_button(
         self,
@@ -496,12 +587,12 @@ class TransactionsV1_1:
         if enable is not None:
             data["enable"] = enable
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentButtonDetails,
             "PATCH",
             f"/v1.1/online-payments/button/{code}",
             json=data
         )
-        return PaymentButtonDetails(**response_data)
 
     def update_payment_link(
         self,
@@ -556,12 +647,12 @@ class TransactionsV1_1:
         if expired_date is not None:
             data["expired_date"] = expired_date
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentLinkDetails,
             "PATCH",
             f"/v1.1/online-payments/link/{code}",
             json=data
         )
-        return PaymentLinkDetails(**response_data)
 
     def create_payment_request(
         self,
@@ -646,12 +737,12 @@ class TransactionsV1_1:
         if email is not None:
             data["email"] = email
         
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentRequestDetails,
             "PATCH",
             f"/v1.1/online-payments/payment-request/{code}/reminder",
             json=data
         )
-        return PaymentRequestDetails(**response_data)
 
     def list_payment_requests(
         self,
@@ -688,39 +779,77 @@ class TransactionsV1_1:
         Returns:
             PaymentRequestListResponse: Object containing list of payment requests and pagination info
         """
+        params = self._payment_request_params(
+            page, size,
+            status=status, code=code,
+            from_amount=from_amount, to_amount=to_amount,
+            currency=currency,
+            from_date=from_date, to_date=to_date,
+            client_name=client_name, reason=reason, booking_text=booking_text
+        )
+        
+        return self.client.request_model(
+            PaymentRequestListResponse,
+            "GET",
+            "/v1.1/online-payments/payment-requests",
+            params=params
+        )
+
+    def stream_payment_requests(
+        self,
+        page: Optional[int] = 1,
+        size: Optional[int] = 1000,
+        status: Optional[PaymentRequestStatus] = None,
+        code: Optional[str] = None,
+        from_amount: Optional[float] = None,
+        to_amount: Optional[float] = None,
+        currency: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        client_name: Optional[str] = None,
+        reason: Optional[str] = None,
+        booking_text: Optional[str] = None
+    ) -> StreamedPage[PaymentRequest]:
+        """
+        Stream one page of payment requests, validating each record as it is read
+        from the socket. Use instead of `list_payment_requests` for large pages.
+
+        Args:
+            Same as `list_payment_requests`. Default size is 1000.
+
+        Returns:
+            StreamedPage[PaymentRequest]: Iterable of payment requests. Its pagination info
+            is available once iteration has finished.
+        """
+        params = self._payment_request_params(
+            page, size,
+            status=status, code=code,
+            from_amount=from_amount, to_amount=to_amount,
+            currency=currency,
+            from_date=from_date, to_date=to_date,
+            client_name=client_name, reason=reason, booking_text=booking_text
+        )
+        
+        return self.client.request_stream(
+            "items",
+            PaymentRequest,
+            "GET",
+            "/v1.1/online-payments/payment-requests",
+            params=params
+        )
+
+    def _payment_request_params(self, page: Optional[int], size: Optional[int], status: Optional[PaymentRequestStatus] = None, **filters) -> dict:
         params = {
             "page": page,
             "size": size
         }
         
-        # Add optional filters
         if status is not None:
             params["status"] = status.value
-        if code is not None:
-            params["code"] = code
-        if from_amount is not None:
-            params["from_amount"] = from_amount
-        if to_amount is not None:
-            params["to_amount"] = to_amount
-        if currency is not None:
-            params["currency"] = currency
-        if from_date is not None:
-            params["from_date"] = from_date
-        if to_date is not None:
-            params["to_date"] = to_date
-        if client_name is not None:
-            params["client_name"] = client_name
-        if reason is not None:
-            params["reason"] = reason
-        if booking_text is not None:
-            params["booking_text"] = booking_text
-        
-        response_data = self.client.request(
-            "GET",
-            "/v1.1/online-payments/payment-requests",
-            params=params
-        )
-        return PaymentRequestListResponse(**response_data)
+        for name, value in filters.items():
+            if value is not None:
+                params[name] = value
+        return params
 
     def get_payment_request_details(self, code: str) -> PaymentRequestDetails:
         """
@@ -732,8 +861,8 @@ class TransactionsV1_1:
         Returns:
             PaymentRequestDetails: Payment request details object
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            PaymentRequestDetails,
             "GET",
             f"/v1.1/online-payments/payment-request/{code}"
         )
-        return PaymentRequestDetails(**response_data)
@@ -0,0 +1,227 @@
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+from ..concurrency import bounded_map
+from ..dates import parse_datetime
+from ..pagination import iter_items
+from ..schemas import PaymentRequest, PaymentRequestDetails, PaymentRequestStatus
+
+logger = logging.getLogger(__name__)
+
+OUTSTANDING = (PaymentRequestStatus.PENDING, PaymentRequestStatus.SEEN)
+FINAL = (PaymentRequestStatus.PAID, PaymentRequestStatus.EXPIRED, PaymentRequestStatus.CANCELLED, PaymentRequestStatus.FAILED)
+
+
+class PaymentRequestEvent(NamedTuple):
+    code: str
+    previous: PaymentRequestStatus
+    current: PaymentRequestStatus
+    request: PaymentRequest
+
+
+@dataclass(slots=True)
+class WatchedRequest:
+    """
+    The last known status of an outstanding payment request.
+    """
+    code: str
+    status: PaymentRequestStatus
+    added_on: Optional[datetime] = None
+    expiry_on: Optional[datetime] = None
+
+
+def _advance(status: PaymentRequestStatus) -> int:
+    # When a request shows up in several listings, the most advanced status wins
+    return 2 if status in FINAL else 1 if status is PaymentRequestStatus.SEEN else 0
+
+
+class PaymentRequestWatcher:
+    """
+    Watch many outstanding payment requests for status changes with a few list calls.
+
+    Instead of `get_payment_request_details` for every code, each refresh
+    streams `list_payment_requests` once per watched status (seen, paid,
+    expired, cancelled, failed), restricted to the date window of the tracked
+    requests. The listings run concurrently. Only tracked codes that show up
+    in them have changed, so a refresh costs a few requests however many codes
+    are tracked. Requests that reach a final status are emitted as events and
+    untracked.
+
+    The refresh interval adapts. It starts at `min_interval` and doubles after
+    every refresh without changes, up to `max_interval`. It is reset by changes
+    and newly tracked requests, and shortened so that a refresh follows soon
+    after the next `expiry_on`.
+
+    Example:
+        watcher = PaymentRequestWatcher(client.transactions.v1_1)
+        for details in outstanding_requests:
+            watcher.track_details(details)
+        watcher.run(lambda event: print(event.code, event.current.name))
+    """
+
+    def __init__(
+        self,
+        transactions,
+        min_interval: timedelta = timedelta(seconds=30),
+        max_interval: timedelta = timedelta(minutes=15),
+        expiry_grace: timedelta = timedelta(minutes=1),
+        page_size: int = 1000,
+        max_workers: Optional[int] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ) -> None:
+        self.transactions = transactions
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.expiry_grace = expiry_grace
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.clock = clock
+        self.requests: Dict[str, WatchedRequest] = {}
+        self.refreshed_at: Optional[datetime] = None
+        self._quiet_refreshes = 0
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        code: str,
+        status: PaymentRequestStatus = PaymentRequestStatus.PENDING,
+        added_on: Union[str, datetime, None] = None,
+        expiry_on: Union[str, datetime, None] = None
+    ) -> None:
+        """
+        Start watching a payment request, e.g. with the code returned by `create_payment_request`.
+
+        Without `added_on`, the request is taken to be created now. Pass it for requests
+        created earlier, or they are missed by listings that start on their creation day.
+        """
+        if status in FINAL:
+            return
+        added_on = parse_datetime(added_on) if isinstance(added_on, str) else added_on
+        with self._lock:
+            self.requests[code] = WatchedRequest(
+                code, status,
+                added_on or self.clock(),
+                parse_datetime(expiry_on) if isinstance(expiry_on, str) else expiry_on,
+            )
+            self._quiet_refreshes = 0
+
+    def track_details(self, request: Union[PaymentRequest, PaymentRequestDetails]) -> None:
+        """
+        Start watching a payment request from its listed or detailed record.
+        """
+        self.track(request.code, request.status, request.added_on, getattr(request, "expiry_on", None))
+
+    def untrack(self, code: str) -> None:
+        with self._lock:
+            self.requests.pop(code, None)
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def _window(self) -> Tuple[Optional[str], Optional[str]]:
+        with self._lock:
+            added = [request.added_on for request in self.requests.values() if request.added_on is not None]
+        if not added:
+            return None, None
+        return min(added).strftime("%Y-%m-%d"), self.clock().strftime("%Y-%m-%d")
+
+    def _list(self, query: Tuple[PaymentRequestStatus, Optional[str], Optional[str]]) -> List[PaymentRequest]:
+        status, from_date, to_date = query
+        return [
+            request for request in iter_items(lambda page: self.transactions.stream_payment_requests(
+                page=page, size=self.page_size, status=status, from_date=from_date, to_date=to_date
+            ))
+            if request.code in self.requests
+        ]
+
+    def _watched_statuses(self) -> List[PaymentRequestStatus]:
+        statuses = list(FINAL)
+        if any(request.status is PaymentRequestStatus.PENDING for request in self.requests.values()):
+            statuses.append(PaymentRequestStatus.SEEN)
+        return statuses
+
+    def refresh(self) -> List[PaymentRequestEvent]:
+        """
+        Look up the status of every tracked request and emit the changes.
+        """
+        now = self.clock()
+        if not self.requests:
+            self.refreshed_at = now
+            return []
+        from_date, to_date = self._window()
+        queries = [(status, from_date, to_date) for status in self._watched_statuses()]
+
+        found: Dict[str, PaymentRequest] = {}
+        failed = False
+        for result in bounded_map(self._list, queries, max_workers=self.max_workers):
+            if not result.ok:
+                failed = True
+                logger.warning(f"Failed to list {result.item[0].name.lower()} payment requests: {result.error}")
+                continue
+            for request in result.value:
+                current = found.get(request.code)
+                if current is None or _advance(request.status) > _advance(current.status):
+                    found[request.code] = request
+
+        events: List[PaymentRequestEvent] = []
+        with self._lock:
+            for code, request in found.items():
+                watched = self.requests.get(code)
+                if watched is None or watched.status is request.status:
+                    continue
+                events.append(PaymentRequestEvent(code, watched.status, request.status, request))
+                if request.status in FINAL:
+                    del self.requests[code]
+                else:
+                    watched.status = request.status
+            self.refreshed_at = now
+            if events or failed:
+                self._quiet_refreshes = 0
+            else:
+                self._quiet_refreshes += 1
+        return events
+
+    def next_interval(self) -> timedelta:
+        """
+        The time to wait between the last refresh and the next one.
+        """
+        interval = min(self.max_interval, self.min_interval * 2 ** min(self._quiet_refreshes, 32))
+        now = self.clock()
+        expiries = [request.expiry_on for request in self.requests.values() if request.expiry_on is not None and request.expiry_on + self.expiry_grace > now]
+        if expiries and self.refreshed_at is not None:
+            # Refresh soon after the next request expires
+            interval = min(interval, max(self.min_interval, min(expiries) + self.expiry_grace - self.refreshed_at))
+        return interval
+
+    def seconds_until_due(self) -> float:
+        if self.refreshed_at is None:
+            return 0.0
+        return max(0.0, (self.refreshed_at + self.next_interval() - self.clock()).total_seconds())
+
+    def poll(self) -> List[PaymentRequestEvent]:
+        """
+        Refresh if the next refresh is due, otherwise return no events.
+        """
+        if self.seconds_until_due() > 0:
+            return []
+        return self.refresh()
+
+    def run(self, on_event: Callable[[PaymentRequestEvent], None], stop: Optional[threading.Event] = None, until_settled: bool = False) -> None:
+        """
+        Refresh on the adaptive interval and call `on_event` for every change.
+
+        Args:
+            on_event: Called with each event.
+            stop: Stop when set (optional)
+            until_settled: Return once no request is outstanding. Default is False.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for event in self.poll():
+                on_event(event)
+            if until_settled and not self.requests:
+                return
+            stop.wait(self.seconds_until_due())
+
@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from .. import decoding
+from ..dates import parse_datetime
+from ..pagination import iter_items, iter_newer
+from ..schemas import Notification
+from .payloads import LazyPayload
+from .receiver import WebhookDelivery, WebhookReceiver
+
+logger = logging.getLogger(__name__)
+
+# An index file record is <16 byte digest><time it was processed>
+_ENTRY = struct.Struct("<16sd")
+
+
+def event_key(event: str, payload: Any, sent_on: Optional[str] = None) -> bytes:
+    """
+    Identify a notification by its event name, its `sent_on` time when known and a digest
+    of its payload. The payload is serialised canonically, so the same notification gives
+    the same key when it was received and when it is listed.
+
+    Without `sent_on`, two notifications with identical payloads share a key. It is only
+    known for delivered notifications whose body carries it, so a listed notification is
+    looked up both with and without it (see `ProcessedIndex.seen`).
+
+    A `LazyPayload`, as passed to handlers of events with a model, is keyed by its raw payload.
+    """
+    if isinstance(payload, LazyPayload):
+        payload = payload.raw
+    if isinstance(payload, (bytes, str)):
+        payload = decoding.loads(payload)
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    if sent_on is not None:
+        parsed = parse_datetime(sent_on)
+        canonical = f"{parsed.isoformat(sep=' ') if parsed else sent_on}\0{canonical}"
+    return hashlib.blake2b(f"{event}\0{canonical}".encode("utf-8"), digest_size=16).digest()
+
+
+def _sent_on(body: bytes) -> Optional[str]:
+    # Delivered bodies may follow the `Notification` schema, sent_on included
+    if b'"sent_on"' not in body:
+        return None
+    try:
+        document = decoding.loads(body)
+    except ValueError:
+        return None
+    sent_on = document.get("sent_on") if isinstance(document, dict) else None
+    return str(sent_on) if sent_on else None
+
+
+class ProcessedIndex:
+    """
+    Compact, persistent set of processed notifications: 24 bytes per event on disk and
+    one dict entry in memory. Entries older than `retention` seconds are dropped by `compact`.
+
+    Register `record` as a catch-all handler after the others, so an event is only
+    recorded once its handlers succeeded:
+
+        index = ProcessedIndex("processed.idx")
+        receiver.on("*")(index.record)
+    """
+
+    def __init__(self, path: Optional[str] = None, retention: float = 30 * 86400) -> None:
+        self.path = path
+        self.retention = retention
+        self._seen: Dict[bytes, float] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            # A torn last entry is ignored
+            for offset in range(0, len(data) - _ENTRY.size + 1, _ENTRY.size):
+                key, processed_at = _ENTRY.unpack_from(data, offset)
+                self._seen[key] = processed_at
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._seen
+
+    def seen(self, event: str, payload: Any, sent_on: Optional[str] = None) -> bool:
+        """
+        Whether a notification was processed, recorded with or without its `sent_on`.
+        """
+        return (sent_on is not None and event_key(event, payload, sent_on) in self._seen) or event_key(event, payload) in self._seen
+
+    def add(self, event: str, payload: Any, sent_on: Optional[str] = None) -> None:
+        """
+        Mark a notification as processed.
+        """
+        key = event_key(event, payload, sent_on)
+        now = time.time()
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen[key] = now
+            if self.path is not None:
+                if self._file is None:
+                    self._file = open(self.path, "ab")
+                self._file.write(_ENTRY.pack(key, now))
+                self._file.flush()
+
+    def record(self, delivery: WebhookDelivery) -> None:
+        """
+        Handler recording a delivery as processed, with the `sent_on` of its body if any.
+        """
+        self.add(delivery.event, delivery.payload, _sent_on(delivery.body))
+
+    def compact(self) -> int:
+        """
+        Drop the entries older than the retention and rewrite the index file.
+
+        Returns:
+            int: The number of entries dropped.
+        """
+        cutoff = time.time() - self.retention
+        with self._lock:
+            before = len(self._seen)
+            self._seen = {key: processed_at for key, processed_at in self._seen.items() if processed_at >= cutoff}
+            if self.path is not None:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                temporary = self.path + ".tmp"
+                with open(temporary, "wb") as f:
+                    f.write(b"".join(_ENTRY.pack(key, processed_at) for key, processed_at in self._seen.items()))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporary, self.path)
+            return before - len(self._seen)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+@dataclass
+class BackfillReport:
+    scanned: int = 0
+    missing: int = 0
+    replayed: int = 0
+    failed: int = 0
+    pages: int = 0
+    watermark: Optional[str] = None
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class NotificationBackfill:
+    """
+    Finds the notifications myPOS sent that were never processed, e.g. while the endpoint
+    was down, and replays their payloads into the handlers of a `WebhookReceiver`.
+
+    `list_notifications` is streamed page by page and compared against a
+    `ProcessedIndex`. The newest `sent_on` seen is kept as a watermark in
+    `state_path`, and the next run stops once it reaches notifications older
+    than the watermark minus `overlap` seconds, so each run only scans the new
+    tail of the history. Stopping early needs the history to be listed newest
+    first, which is checked, see `mypos.pagination.iter_newer`.
+
+    Example:
+        backfill = NotificationBackfill(client.webhooks.v1, receiver, index, state_path="backfill.json")
+        report = asyncio.run(backfill.run())
+    """
+
+    def __init__(
+        self,
+        webhooks,
+        receiver: WebhookReceiver,
+        index: ProcessedIndex,
+        state_path: Optional[str] = None,
+        page_size: int = 100,
+        overlap: float = 3600
+    ) -> None:
+        self.webhooks = webhooks
+        self.receiver = receiver
+        self.index = index
+        self.state_path = state_path
+        self.page_size = page_size
+        self.overlap = overlap
+        self.watermark: Optional[str] = None
+        if state_path is not None and os.path.exists(state_path):
+            with open(state_path) as f:
+                self.watermark = json.load(f).get("watermark")
+
+    def _save_watermark(self, watermark: Optional[str]) -> None:
+        self.watermark = watermark
+        if self.state_path is None or watermark is None:
+            return
+        temporary = self.state_path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump({"watermark": watermark}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.state_path)
+
+    def scan(self, report: Optional[BackfillReport] = None) -> List[Notification]:
+        """
+        List the notifications newer than the watermark that are not in the index.
+
+        Returns:
+            List[Notification]: The missing notifications, oldest first.
+        """
+        report = report or BackfillReport()
+        watermark = parse_datetime(self.watermark)
+        cutoff = watermark - timedelta(seconds=self.overlap) if watermark else None
+        missing: List[Notification] = []
+        newest: Optional[datetime] = None
+
+        def fetch(page: int):
+            report.pages += 1
+            return self.webhooks.list_notifications(page=page, size=self.page_size)
+
+        notifications = iter_items(fetch, "notifications")
+        if cutoff is not None:
+            # A whole page past the cutoff: the rest of the history was scanned before
+            notifications = iter_newer(notifications, lambda n: parse_datetime(n.sent_on), cutoff, self.page_size, self.page_size)
+        for notification in notifications:
+            sent_on = parse_datetime(notification.sent_on)
+            if sent_on is not None and (newest is None or sent_on > newest):
+                newest = sent_on
+            report.scanned += 1
+            if not self.index.seen(notification.event, notification.payload, notification.sent_on):
+                missing.append(notification)
+        report.missing += len(missing)
+        if newest is not None and (watermark is None or newest > watermark):
+            report.watermark = newest.isoformat(sep=" ")
+        else:
+            report.watermark = self.watermark
+        missing.reverse()
+        return missing
+
+    async def replay(self, notifications: List[Notification], report: Optional[BackfillReport] = None) -> BackfillReport:
+        """
+        Dispatch notifications to the receiver's handlers, in order, and record them in the index.
+        """
+        report = report or BackfillReport()
+        for notification in notifications:
+            body = json.dumps({"event": notification.event, "payload": notification.payload}, separators=(",", ":")).encode("utf-8")
+            delivery = WebhookDelivery(notification.event, notification.payload, body, {}, time.time())
+            try:
+                await self.receiver.dispatch(delivery)
+            except Exception as e:
+                report.failed += 1
+                report.errors.append((notification.sent_on, str(e)))
+                logger.exception(f"Replaying the {notification.event!r} notification sent on {notification.sent_on} failed")
+                continue
+            self.index.add(notification.event, notification.payload, notification.sent_on)
+            report.replayed += 1
+        return report
+
+    async def run(self, dry_run: bool = False) -> BackfillReport:
+        """
+        Scan for missing notifications and replay them.
+
+        The watermark only advances past the notifications that were replayed:
+        after a failure it stays before the oldest failed one, so the next run
+        tries it again.
+
+        Args:
+            dry_run: Only scan, replay nothing and keep the watermark.
+        """
+        report = BackfillReport()
+        missing = await asyncio.get_running_loop().run_in_executor(None, self.scan, report)
+        if dry_run:
+            return report
+        await self.replay(missing, report)
+        if report.errors:
+            failures = [parse_datetime(sent_on) for sent_on, _ in report.errors]
+            if None in failures:
+                report.watermark = self.watermark
+            else:
+                # Rescanned from there on the next run, as the overlap reaches before it
+                report.watermark = min(failures).isoformat(sep=" ")
+        self._save_watermark(report.watermark)
+        logger.info(f"Backfill scanned {report.scanned} notifications in {report.pages} pages, replayed {report.replayed} of {report.missing} missing")
+        return report
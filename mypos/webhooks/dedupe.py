@@ -0,0 +1,195 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Protocol, Union, runtime_checkable
+
+
+@runtime_checkable
+class DedupeBackend(Protocol):
+    """
+    Storage of recently seen delivery keys.
+
+    `add` records a key for `ttl` seconds and returns True if it was not already
+    there. It may be a coroutine, e.g. for a backend shared between processes.
+    Backends may also implement `discard(key)` to forget a key again.
+    """
+
+    def add(self, key: bytes, ttl: float) -> Union[bool, Awaitable[bool]]:
+        ...
+
+
+class MemoryBackend:
+    """
+    Exact, time-ordered LRU of seen keys in process memory.
+
+    Keys are kept in insertion order, so expired keys are evicted from the
+    front in O(1). When `max_entries` is reached the oldest key is evicted
+    early, keeping memory bounded under a flood.
+    """
+
+    def __init__(self, max_entries: int = 100_000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.clock = clock
+        self._expiry: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, key: bytes, ttl: float) -> bool:
+        now = self.clock()
+        with self._lock:
+            expiry = self._expiry
+            while expiry:
+                oldest, expires = next(iter(expiry.items()))
+                if expires > now and len(expiry) < self.max_entries:
+                    break
+                del expiry[oldest]
+            if key in expiry:
+                if expiry[key] > now:
+                    return False
+                del expiry[key]
+            expiry[key] = now + ttl
+            return True
+
+    def discard(self, key: bytes) -> None:
+        with self._lock:
+            self._expiry.pop(key, None)
+
+
+class _BloomFilter:
+    __slots__ = ("bits", "size", "hashes", "count")
+
+    def __init__(self, size: int, hashes: int) -> None:
+        self.bits = bytearray((size + 7) // 8)
+        self.size = size
+        self.hashes = hashes
+        self.count = 0
+
+    def positions(self, digest: bytes):
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def contains(self, positions) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def add(self, positions) -> None:
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class RotatingBloomFilter:
+    """
+    Approximate seen-key set in fixed memory.
+
+    Two Bloom filters are kept: keys are added to the current one and looked up
+    in both. The current one is rotated out when it holds `capacity` keys or
+    is older than the ttl, so a key is remembered for at least one ttl. Memory
+    is fixed at about 2 * 1.44 * log2(1 / error_rate) bits per key of capacity.
+
+    Unlike `MemoryBackend`, a new key is reported as seen with probability
+    `error_rate`, so a delivery may be dropped as a false duplicate.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 1e-6, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.clock = clock
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._current = _BloomFilter(self._size, self._hashes)
+        self._previous = _BloomFilter(self._size, self._hashes)
+        self._rotated_at = self.clock()
+        self._lock = threading.Lock()
+
+    def add(self, key: bytes, ttl: float) -> bool:
+        positions = self._current.positions(hashlib.blake2b(key, digest_size=16).digest())
+        with self._lock:
+            if self._current.count >= self.capacity or self.clock() - self._rotated_at >= ttl:
+                self._previous = self._current
+                self._current = _BloomFilter(self._size, self._hashes)
+                self._rotated_at = self.clock()
+            if self._current.contains(positions) or self._previous.contains(positions):
+                return False
+            self._current.add(positions)
+            return True
+
+
+class RedisBackend:
+    """
+    Backend shared between processes, on any client with a redis-py compatible
+    `set(name, value, nx=True, ex=seconds)`. Pass an asyncio client to avoid blocking
+    the receiver's event loop.
+    """
+
+    def __init__(self, client: Any, prefix: str = "mypos:webhook:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, key: bytes, ttl: float) -> Union[bool, Awaitable[bool]]:
+        result = self.client.set(self.prefix + key.hex(), 1, nx=True, ex=max(1, math.ceil(ttl)))
+        if hasattr(result, "__await__"):
+            async def added() -> bool:
+                return bool(await result)
+            return added()
+        return bool(result)
+
+    def discard(self, key: bytes) -> Union[None, Awaitable[None]]:
+        return self.client.delete(self.prefix + key.hex())
+
+
+def body_key(body: bytes, signature_header: Optional[str]) -> bytes:
+    """
+    Identify a delivery by its body, so retries of a notification are recognised
+    even when they are signed again with a new timestamp.
+    """
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def signature_key(body: bytes, signature_header: Optional[str]) -> bytes:
+    """
+    Identify a delivery by its signature header, which only catches replays of the same request.
+    """
+    return hashlib.blake2b((signature_header or "").encode("latin-1") + body, digest_size=16).digest()
+
+
+class Deduplicator:
+    """
+    Drops webhook deliveries that were already accepted within `ttl` seconds.
+
+    Example:
+        receiver = WebhookReceiver(secret, dedupe=Deduplicator(MemoryBackend(max_entries=200_000), ttl=900))
+    """
+
+    def __init__(
+        self,
+        backend: Optional[DedupeBackend] = None,
+        ttl: float = 600,
+        key: Callable[[bytes, Optional[str]], bytes] = body_key
+    ) -> None:
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.key = key
+
+    def first_seen(self, body: bytes, signature_header: Optional[str] = None) -> Union[bool, Awaitable[bool]]:
+        """
+        Record a delivery. Returns True the first time it is seen within the ttl.
+        """
+        return self.backend.add(self.key(body, signature_header), self.ttl)
+
+    def forget(self, body: bytes, signature_header: Optional[str] = None) -> Union[None, Awaitable[None]]:
+        """
+        Forget a delivery that could not be accepted after all, so its retry is not a duplicate.
+        Backends without `discard` (the Bloom filter) cannot forget.
+        """
+        discard = getattr(self.backend, "discard", None)
+        if discard is not None:
+            return discard(self.key(body, signature_header))
+        return None
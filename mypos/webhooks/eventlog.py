@@ -0,0 +1,377 @@
+import asyncio
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Every record is framed as <length><crc32 of the data><data>
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".log"
+_CONSUMERS = "consumers"
+
+
+def _segment_name(base: int) -> str:
+    return f"{base:020d}{_SEGMENT_SUFFIX}"
+
+
+def _list_segments(directory: str) -> List[int]:
+    return sorted(int(name[:-len(_SEGMENT_SUFFIX)]) for name in os.listdir(directory) if name.endswith(_SEGMENT_SUFFIX))
+
+
+def _fsync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _scan(data, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    # Yields (position, record) of every complete, intact record, stops at a torn one
+    position = start
+    size = len(data)
+    while position + _HEADER.size <= size:
+        length, crc = _HEADER.unpack_from(data, position)
+        begin = position + _HEADER.size
+        if begin + length > size:
+            return
+        record = data[begin:begin + length]
+        if zlib.crc32(record) != crc:
+            return
+        yield position, record
+        position = begin + length
+
+
+class EventLog:
+    """
+    Durable, append-only log of webhook notifications, split in segment files.
+
+    Records are framed with their length and a CRC32, so a record torn by a
+    crash is detected and truncated when the writer opens the log again.
+    Processes that only read or compact the log open it with `read_only=True`,
+    which never truncates: the torn tail they see may be a record the writer
+    is appending right now. `append_many`
+    returns once its records are fsynced. Concurrent appenders share one fsync
+    (group commit), so throughput does not collapse to one event per disk
+    flush. Offsets are byte positions in the log, and each segment file is
+    named after the offset of its first record.
+
+    Example:
+        log = EventLog("/var/lib/mypos/webhooks")
+        offset = log.append(body)
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 2**20, fsync: bool = True, read_only: bool = False) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.read_only = read_only
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        os.makedirs(os.path.join(directory, _CONSUMERS), exist_ok=True)
+        self._recover()
+
+    def _recover(self) -> None:
+        segments = _list_segments(self.directory)
+        if not segments and self.read_only:
+            self._file = None
+            self._base = self._end = self._synced = 0
+            return
+        if not segments:
+            segments = [0]
+            open(os.path.join(self.directory, _segment_name(0)), "ab").close()
+        self._base = segments[-1]
+        path = os.path.join(self.directory, _segment_name(self._base))
+        with open(path, "rb") as f:
+            data = f.read()
+        valid = 0
+        for position, record in _scan(data):
+            valid = position + _HEADER.size + len(record)
+        if self.read_only:
+            # Only the writer recovers, the tail may be a record it is appending
+            self._file = None
+        else:
+            if valid < len(data):
+                logger.warning(f"Truncating {len(data) - valid} bytes of torn records at the end of {path}")
+                with open(path, "r+b") as f:
+                    f.truncate(valid)
+                    os.fsync(f.fileno())
+            self._file = open(path, "ab")
+        self._end = self._base + valid
+        self._synced = self._end
+
+    @property
+    def end_offset(self) -> int:
+        """
+        The offset the next record will be written at. A read-only log gives the end
+        of its intact records when it was opened.
+        """
+        return self._end
+
+    def _roll(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._base = self._end
+        self._file = open(os.path.join(self.directory, _segment_name(self._base)), "ab")
+        _fsync_directory(self.directory)
+
+    def append_many(self, records: List[bytes]) -> List[int]:
+        """
+        Durably append records.
+
+        Returns:
+            List[int]: The offset of every record.
+        """
+        if self.read_only:
+            raise ValueError(f"Event log {self.directory} is open read-only")
+        offsets = []
+        with self._write_lock:
+            if self._file is None:
+                raise ValueError(f"Event log {self.directory} is closed")
+            for record in records:
+                if self._end - self._base >= self.segment_bytes:
+                    self._roll()
+                offsets.append(self._end)
+                self._file.write(_HEADER.pack(len(record), zlib.crc32(record)))
+                self._file.write(record)
+                self._end += _HEADER.size + len(record)
+            self._file.flush()
+            end = self._end
+        self._sync(end)
+        return offsets
+
+    def append(self, record: bytes) -> int:
+        """
+        Durably append a record and return its offset.
+        """
+        return self.append_many([record])[0]
+
+    def _sync(self, end: int) -> None:
+        if not self.fsync:
+            return
+        with self._sync_lock:
+            # A concurrent appender may already have synced past our records
+            if self._synced >= end:
+                return
+            with self._write_lock:
+                if self._file is None:
+                    # Closing synced everything
+                    return
+                target = self._end
+                # A duplicate descriptor stays valid if the segment is rolled meanwhile
+                fileno = os.dup(self._file.fileno())
+            try:
+                os.fsync(fileno)
+            finally:
+                os.close(fileno)
+            self._synced = target
+
+    def consumer_offsets(self) -> Dict[str, int]:
+        """
+        The committed offset of every consumer.
+        """
+        offsets = {}
+        directory = os.path.join(self.directory, _CONSUMERS)
+        for name in os.listdir(directory):
+            if not name.endswith(".tmp"):
+                with open(os.path.join(directory, name)) as f:
+                    offsets[name] = int(f.read().strip() or 0)
+        return offsets
+
+    def compact(self) -> int:
+        """
+        Delete the segments every consumer has committed past. The active (last) segment
+        is kept, so a read-only log can compact while the writer appends.
+
+        Returns:
+            int: The number of segments deleted.
+        """
+        offsets = self.consumer_offsets()
+        if not offsets:
+            return 0
+        low = min(offsets.values())
+        with self._write_lock:
+            segments = _list_segments(self.directory)
+            deleted = 0
+            for base, next_base in zip(segments, segments[1:]):
+                if next_base > low or (not self.read_only and base == self._base):
+                    break
+                os.remove(os.path.join(self.directory, _segment_name(base)))
+                deleted += 1
+        if deleted:
+            logger.info(f"Compacted {deleted} segments below offset {low}")
+        return deleted
+
+    def close(self) -> None:
+        """
+        Flush and fsync the active segment and close it. Closing twice is a no-op,
+        appending afterwards raises ValueError.
+        """
+        with self._write_lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._synced = self._end
+
+
+class AsyncAppender:
+    """
+    Batches appends from many coroutines into one `append_many` (and one fsync) on a thread.
+    While a batch is being written, the next one accumulates.
+    """
+
+    def __init__(self, log: EventLog, max_batch: int = 1000) -> None:
+        self.log = log
+        self.max_batch = max_batch
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def append(self, record: bytes) -> int:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((record, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            try:
+                offsets = await loop.run_in_executor(None, self.log.append_many, [record for record, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), offset in zip(batch, offsets):
+                if not future.done():
+                    future.set_result(offset)
+
+    async def close(self) -> None:
+        """
+        Wait for the pending appends, then close the log.
+        """
+        if self._flusher is not None:
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await asyncio.get_running_loop().run_in_executor(None, self.log.close)
+
+
+class EventLogReader:
+    """
+    Memory-mapped reader of an `EventLog` directory, safe to use from other processes
+    while the log is being written.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._maps: Dict[int, Tuple[mmap.mmap, int]] = {}
+
+    def _map(self, base: int) -> Optional[mmap.mmap]:
+        path = os.path.join(self.directory, _segment_name(base))
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+        cached = self._maps.get(base)
+        if cached is not None and cached[1] == size:
+            return cached[0]
+        if cached is not None:
+            cached[0].close()
+            del self._maps[base]
+        if size == 0:
+            return None
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps[base] = (mapped, size)
+        return mapped
+
+    def read(self, offset: int = 0, max_records: Optional[int] = None) -> List[Tuple[int, bytes]]:
+        """
+        Read the records from `offset` on.
+
+        Returns:
+            List[Tuple[int, bytes]]: (offset, record) pairs. The offset following the last
+            record is `offset + 8 + len(record)`.
+        """
+        segments = _list_segments(self.directory)
+        if not segments:
+            return []
+        index = max(0, bisect.bisect_right(segments, offset) - 1)
+        if offset < segments[0]:
+            logger.warning(f"Offset {offset} was compacted, resuming at {segments[0]}")
+            offset = segments[0]
+        records: List[Tuple[int, bytes]] = []
+        for base in segments[index:]:
+            mapped = self._map(base)
+            if mapped is not None:
+                for position, record in _scan(mapped, max(0, offset - base)):
+                    records.append((base + position, record))
+                    if max_records is not None and len(records) >= max_records:
+                        return records
+        return records
+
+    def close(self) -> None:
+        for mapped, _ in self._maps.values():
+            mapped.close()
+        self._maps = {}
+
+
+class Consumer:
+    """
+    Reads an `EventLog` from its committed offset. Process the records of `poll`, then
+    `commit` them: after a crash, uncommitted records are read again (at least once).
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.name = name
+        self.reader = EventLogReader(directory)
+        self._path = os.path.join(directory, _CONSUMERS, name)
+        self.offset = 0
+        if os.path.exists(self._path):
+            with open(self._path) as f:
+                self.offset = int(f.read().strip() or 0)
+        self.position = self.offset
+
+    def poll(self, max_records: int = 100) -> List[Tuple[int, bytes]]:
+        """
+        The next records after those already polled.
+        """
+        records = self.reader.read(self.position, max_records)
+        if records:
+            last_offset, last = records[-1]
+            self.position = last_offset + _HEADER.size + len(last)
+        return records
+
+    def commit(self, offset: Optional[int] = None) -> None:
+        """
+        Durably record that everything before `offset` (default: everything polled) is processed.
+        """
+        self.offset = self.position if offset is None else offset
+        temporary = self._path + ".tmp"
+        with open(temporary, "w") as f:
+            f.write(str(self.offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self._path)
+
+    def rewind(self) -> None:
+        """
+        Poll again from the committed offset, e.g. after a failed batch.
+        """
+        self.position = self.offset
+
+    def close(self) -> None:
+        self.reader.close()
@@ -0,0 +1,133 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+from typing import Any, Callable, Optional, Tuple, Type
+from pydantic import BaseModel
+from .. import decoding
+from .payloads import LazyPayload
+from .receiver import WebhookDelivery, default_event_name
+
+logger = logging.getLogger(__name__)
+
+
+def _call(
+    handler: Callable[[WebhookDelivery], Any],
+    body: bytes,
+    received_at: float,
+    event_name: Callable[[Any], Tuple[str, Any]],
+    model: Optional[Type[BaseModel]]
+) -> Any:
+    # Runs in the worker process: only the raw body crosses the process boundary
+    event, payload = event_name(decoding.loads(body))
+    if model is not None:
+        payload = LazyPayload(model, payload)
+    return handler(WebhookDelivery(event, payload, body, {}, received_at))
+
+
+def _ready() -> bool:
+    # Unpickling this function imports the module, and with it pydantic and the decoder
+    return True
+
+
+def _interpreter_pool() -> Optional[type]:
+    return getattr(concurrent.futures, "InterpreterPoolExecutor", None)
+
+
+class ProcessDispatcher:
+    """
+    Runs CPU-bound webhook handlers in worker processes, so they do not hold the
+    GIL of the receiver.
+
+    Only the raw notification body is sent to the worker, which decodes it
+    itself. At most `max_pending` deliveries are submitted at a time. Beyond
+    that the receiver's worker tasks wait, its queue fills up and it answers
+    503, so a CPU-bound backlog turns into myPOS retries instead of memory.
+    Give the receiver at least `max_pending` workers to keep the pool busy.
+
+    Handlers must be module-level functions, so they can be pickled by
+    reference. Register the offloaded handler, not a decorated one:
+
+        pool = ProcessDispatcher(max_workers=4)
+        receiver.add_handler("transaction", pool.offload(score_transaction))
+
+    On Python 3.14+, `interpreters=True` uses subinterpreters instead of
+    processes. Workers import pydantic (and orjson when installed), whose
+    compiled extensions may refuse to load in a subinterpreter. The pool is
+    checked on first use, and processes are used instead when its workers
+    cannot import this module.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        interpreters: bool = False,
+        executor: Optional[concurrent.futures.Executor] = None
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 2
+        self.interpreters = interpreters
+        self._executor = executor
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            pool = _interpreter_pool() if self.interpreters else None
+            if pool is not None:
+                self._executor = pool(max_workers=self.max_workers)
+                try:
+                    self._executor.submit(_ready).result()
+                except Exception as e:
+                    logger.warning(f"Webhook handlers cannot run in subinterpreters, using processes: {e}")
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            logger.debug(f"Offloading webhook handlers to a {type(self._executor).__name__} of {self.max_workers} workers")
+        return self._executor
+
+    async def submit(
+        self,
+        handler: Callable[[WebhookDelivery], Any],
+        delivery: WebhookDelivery,
+        event_name: Callable[[Any], Tuple[str, Any]] = default_event_name,
+        model: Optional[Type[BaseModel]] = None
+    ) -> Any:
+        """
+        Run a handler on a delivery in the pool, waiting for a free slot first.
+
+        Returns:
+            The value returned by the handler.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, _call, handler, delivery.body, delivery.received_at, event_name, model
+            )
+
+    def offload(
+        self,
+        handler: Callable[[WebhookDelivery], Any],
+        model: Optional[Type[BaseModel]] = None,
+        event_name: Callable[[Any], Tuple[str, Any]] = default_event_name
+    ) -> Callable[[WebhookDelivery], Any]:
+        """
+        Wrap a handler to run in the pool.
+
+        Args:
+            handler: A module-level function taking a `WebhookDelivery`.
+            model: Pass the payload to the handler as a `LazyPayload` of this model (optional)
+            event_name: Splits the body into event name and payload, as in the receiver.
+        """
+        async def offloaded(delivery: WebhookDelivery) -> Any:
+            return await self.submit(handler, delivery, event_name, model)
+        offloaded.__name__ = getattr(handler, "__name__", "offloaded")
+        return offloaded
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,106 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Type, Union
+from pydantic import BaseModel, ConfigDict
+
+
+class EventPayload(BaseModel):
+    """
+    Base for webhook payload models. Fields the model does not declare are kept, so
+    a model keeps validating when myPOS adds fields to an event.
+    """
+    model_config = ConfigDict(extra="allow")
+
+
+class LazyPayload:
+    """
+    A webhook payload that is validated into its model on first field access.
+
+    Handlers that only forward the event, or only read a key or two with `[]`,
+    never pay for validation. The raw payload stays available as `raw`, and
+    the validated model as `value`. A validation error is raised at the first
+    attribute access, inside the handler.
+    """
+
+    __slots__ = ("model", "raw", "_value")
+
+    def __init__(self, model: Type[BaseModel], raw: Union[Mapping[str, Any], bytes, str]) -> None:
+        self.model = model
+        self.raw = raw
+        self._value: Optional[BaseModel] = None
+
+    @property
+    def value(self) -> BaseModel:
+        """
+        The validated model, validated on first access.
+        """
+        if self._value is None:
+            if isinstance(self.raw, (bytes, str)):
+                self._value = self.model.model_validate_json(self.raw)
+            else:
+                self._value = self.model.model_validate(self.raw)
+        return self._value
+
+    @property
+    def validated(self) -> bool:
+        return self._value is not None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for names that are not slots or properties, i.e. model fields.
+        # Private and special names, e.g. `__setstate__` looked up by pickle and copy
+        # before the slots are set, are not model fields.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __repr__(self) -> str:
+        return f"LazyPayload({self.model.__name__}, validated={self.validated})"
+
+
+class PayloadRegistry:
+    """
+    Dispatch table from event names to payload models.
+
+    Example:
+        registry = PayloadRegistry()
+
+        @registry.register("transaction")
+        class TransactionEvent(EventPayload):
+            terminal_id: str
+            amount: float
+
+        receiver = WebhookReceiver(secret, payloads=registry)
+    """
+
+    def __init__(self, models: Optional[Mapping[str, Type[BaseModel]]] = None) -> None:
+        self._models: Dict[str, Type[BaseModel]] = dict(models or {})
+
+    def register(self, event: str, model: Optional[Type[BaseModel]] = None) -> Union[Type[BaseModel], Callable[[Type[BaseModel]], Type[BaseModel]]]:
+        """
+        Register the payload model of an event name. Used directly, or as a class decorator.
+        """
+        if model is not None:
+            self._models[event] = model
+            return model
+
+        def decorator(cls: Type[BaseModel]) -> Type[BaseModel]:
+            self._models[event] = cls
+            return cls
+        return decorator
+
+    def get(self, event: str) -> Optional[Type[BaseModel]]:
+        return self._models.get(event)
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._models
+
+    def wrap(self, event: str, payload: Any) -> Any:
+        """
+        The payload as a `LazyPayload` of its registered model, or unchanged if there is none.
+        """
+        model = self._models.get(event)
+        return payload if model is None else LazyPayload(model, payload)
+
+
+registry = PayloadRegistry()
@@ -0,0 +1,404 @@
+import asyncio
+import inspect
+import logging
+import struct
+import time
+import zlib
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+from pydantic import BaseModel
+from .. import decoding
+from .dedupe import Deduplicator
+from .eventlog import AsyncAppender, Consumer, EventLog
+from .payloads import LazyPayload, PayloadRegistry, registry
+from .signature import SIGNATURE_HEADER, SignatureVerifier, signature_header
+
+logger = logging.getLogger(__name__)
+
+# An event log record is <received_at><length of the signature header><signature header><body>
+_ENVELOPE = struct.Struct("<dH")
+
+
+class WebhookDelivery(NamedTuple):
+    event: str
+    payload: Any
+    body: bytes
+    headers: Dict[str, str]
+    received_at: float
+
+
+Handler = Callable[[WebhookDelivery], Union[None, Awaitable[None]]]
+
+
+def default_event_name(document: Any) -> Tuple[str, Any]:
+    """
+    Split a notification body into event name and payload, following the `Notification`
+    schema: {"event": ..., "payload": {...}}. Bodies without a payload field are passed whole.
+    """
+    if isinstance(document, dict):
+        return document.get("event") or "", document.get("payload", document)
+    return "", document
+
+
+def encode_record(body: bytes, headers: Dict[str, str], received_at: float) -> bytes:
+    signature = (signature_header(headers) or "").encode("latin-1")
+    return _ENVELOPE.pack(received_at, len(signature)) + signature + body
+
+
+def decode_record(record: bytes) -> Tuple[bytes, Dict[str, str], float]:
+    received_at, length = _ENVELOPE.unpack_from(record)
+    begin = _ENVELOPE.size + length
+    signature = bytes(record[_ENVELOPE.size:begin]).decode("latin-1")
+    return bytes(record[begin:]), {SIGNATURE_HEADER: signature} if signature else {}, received_at
+
+
+class WebhookReceiver:
+    """
+    ASGI application receiving myPOS webhook notifications.
+
+    A notification is verified, acknowledged right away and queued, then
+    processed by a pool of worker tasks. Slow handlers therefore do not delay
+    the response to myPOS, and bursts do not pile up retries. The queue is
+    bounded: when it is full the receiver answers 503 so myPOS delivers the
+    notification again later, instead of buffering without limit.
+
+    Handlers are registered per event name and may be sync or async. Sync
+    handlers run in the default thread pool. With a model, either given to
+    `on` or registered for the event in the `PayloadRegistry`, the payload is
+    passed as a `LazyPayload`, validated on first field access and at most
+    once per delivery. Handlers registered with `raw=True` get the decoded
+    payload as is.
+
+    With a `Deduplicator`, retried and replayed deliveries are acknowledged
+    without being queued again.
+
+    Bodies larger than `max_body` bytes (1 MiB by default) are answered with
+    413 before they are read in full, so unauthenticated clients cannot make
+    the receiver buffer them.
+
+    With an `EventLog`, notifications are appended to the log instead of the
+    in-memory queue, and acknowledged only once they are on disk. They are
+    then processed by an `EventLogWorker`, possibly in another process, and
+    survive restarts and crashes.
+
+    Example:
+        receiver = WebhookReceiver(secret=os.environ["MYPOS_WEBHOOK_SECRET"], workers=8)
+
+        @receiver.on("payment.completed")
+        async def payment_completed(delivery):
+            ...
+
+        # uvicorn app:receiver
+    """
+
+    def __init__(
+        self,
+        secret: Union[str, Sequence[str]],
+        workers: int = 4,
+        max_queue: int = 1000,
+        path: Optional[str] = None,
+        tolerance: int = 300,
+        event_name: Callable[[Any], Tuple[str, Any]] = default_event_name,
+        dedupe: Optional[Deduplicator] = None,
+        event_log: Optional[EventLog] = None,
+        payloads: Optional[PayloadRegistry] = None,
+        max_body: int = 1 << 20
+    ) -> None:
+        self.verifier = SignatureVerifier(secret, tolerance)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.path = path
+        self.event_name = event_name
+        self.dedupe = dedupe
+        self.event_log = event_log
+        self.payloads = registry if payloads is None else payloads
+        self.max_body = max_body
+        self.stats: Counter = Counter()
+        self._handlers: Dict[str, List[Tuple[Handler, Optional[Type[BaseModel]], bool]]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._appender: Optional[AsyncAppender] = None
+
+    def on(self, event: str, model: Optional[Type[BaseModel]] = None, raw: bool = False) -> Callable[[Handler], Handler]:
+        """
+        Register a handler for an event name, or "*" for every event.
+
+        Args:
+            event: The event name.
+            model: The payload model, instead of the one registered for the event (optional)
+            raw: Pass the decoded payload as is, e.g. to forward events. Default is False.
+        """
+        def register(handler: Handler) -> Handler:
+            self.add_handler(event, handler, model, raw)
+            return handler
+        return register
+
+    def add_handler(self, event: str, handler: Handler, model: Optional[Type[BaseModel]] = None, raw: bool = False) -> None:
+        self._handlers.setdefault(event, []).append((handler, model, raw))
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks. Called on ASGI lifespan startup, or on the first request.
+        """
+        if self.event_log is not None:
+            if self._appender is None:
+                self._appender = AsyncAppender(self.event_log)
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._tasks = [asyncio.create_task(self._work(), name=f"mypos-webhook-{i}") for i in range(self.workers)]
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the worker tasks, after processing the queued notifications if `drain` is True.
+        With an event log, wait for the pending appends and close the log.
+        """
+        if self._appender is not None:
+            await self._appender.close()
+            self._appender = None
+        if self._queue is None:
+            return
+        if drain:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    async def join(self) -> None:
+        """
+        Wait until every queued notification has been processed.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    def verify(self, body: bytes, headers: Dict[str, str]) -> bool:
+        return self.verifier.verify(body, headers)
+
+    async def accept(self, body: bytes, headers: Dict[str, str]) -> int:
+        """
+        Verify and queue a notification.
+
+        Returns:
+            int: The HTTP status to answer with.
+        """
+        await self.start()
+        self.stats["received"] += 1
+        if not self.verify(body, headers):
+            self.stats["rejected"] += 1
+            return 401
+        try:
+            event, payload = self.event_name(decoding.loads(body))
+        except ValueError:
+            self.stats["rejected"] += 1
+            return 400
+        # Checked before recording the delivery as seen, so the retry of a 503 is not a duplicate
+        if self._queue is not None and self._queue.full():
+            self.stats["overloaded"] += 1
+            return 503
+        if self.dedupe is not None:
+            first_seen = self.dedupe.first_seen(body, signature_header(headers))
+            if inspect.isawaitable(first_seen):
+                first_seen = await first_seen
+            if not first_seen:
+                self.stats["duplicate"] += 1
+                return 200
+        if self._appender is not None:
+            return await self._log(body, headers)
+        # Only waits if an async dedupe backend yielded while the queue filled up
+        await self._queue.put(WebhookDelivery(event, payload, body, headers, time.time()))
+        self.stats["accepted"] += 1
+        return 200
+
+    async def _log(self, body: bytes, headers: Dict[str, str]) -> int:
+        try:
+            await self._appender.append(encode_record(body, headers, time.time()))
+        except OSError:
+            logger.exception("Could not append a webhook notification to the event log")
+            self.stats["failed"] += 1
+            if self.dedupe is not None:
+                forgotten = self.dedupe.forget(body, signature_header(headers))
+                if inspect.isawaitable(forgotten):
+                    await forgotten
+            return 500
+        self.stats["logged"] += 1
+        return 200
+
+    async def dispatch(self, delivery: WebhookDelivery) -> None:
+        """
+        Call the handlers of a notification.
+        """
+        handlers = self._handlers.get(delivery.event, []) + self._handlers.get("*", [])
+        if not handlers:
+            self.stats["unhandled"] += 1
+            return
+        # One lazy payload per model, shared by the handlers of the delivery
+        lazy: Dict[Type[BaseModel], LazyPayload] = {}
+        for handler, model, raw in handlers:
+            if not raw:
+                model = model or self.payloads.get(delivery.event)
+            if raw or model is None:
+                argument = delivery
+            else:
+                payload = lazy.get(model)
+                if payload is None:
+                    payload = lazy[model] = LazyPayload(model, delivery.payload)
+                argument = delivery._replace(payload=payload)
+            if inspect.iscoroutinefunction(handler):
+                await handler(argument)
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, handler, argument)
+
+    async def _work(self) -> None:
+        while True:
+            delivery = await self._queue.get()
+            try:
+                await self.dispatch(delivery)
+                self.stats["handled"] += 1
+            except Exception:
+                self.stats["failed"] += 1
+                logger.exception(f"Webhook handler failed for event {delivery.event!r}")
+            finally:
+                self._queue.task_done()
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if self.path is not None and scope["path"] != self.path:
+            await self._respond(send, 404)
+            return
+        if scope["method"] != "POST":
+            await self._respond(send, 405)
+            return
+
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        length = headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_body:
+            self.stats["too_large"] += 1
+            await self._respond(send, 413)
+            return
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body:
+                self.stats["too_large"] += 1
+                await self._respond(send, 413)
+                return
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        await self._respond(send, await self.accept(b"".join(chunks), headers))
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _respond(self, send: Callable, status: int) -> None:
+        headers = [(b"content-type", b"application/json")]
+        if status == 503:
+            headers.append((b"retry-after", b"1"))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b'{"status":"ok"}' if status == 200 else b"{}"})
+
+
+class EventLogWorker:
+    """
+    Processes the notifications of an `EventLog` with the handlers of a `WebhookReceiver`.
+
+    Records are read in batches and dispatched concurrently, and the offset is
+    committed after each batch, so after a crash or restart the uncommitted
+    batch is processed again: handlers should be idempotent. As with the
+    in-memory queue, a failing handler is logged and counted in `stats`, not
+    retried. Several workers share the load by `partition`, each with its own
+    committed offset. The worker opens the log read-only to compact it, so it
+    never truncates records the receiver is appending.
+
+    Example:
+        worker = EventLogWorker(receiver, "/var/lib/mypos/webhooks")
+        await worker.run()
+    """
+
+    def __init__(
+        self,
+        receiver: WebhookReceiver,
+        directory: str,
+        name: str = "handlers",
+        batch: int = 100,
+        poll_interval: float = 0.05,
+        partition: int = 0,
+        partitions: int = 1,
+        compact_interval: float = 60
+    ) -> None:
+        self.receiver = receiver
+        self.batch = batch
+        self.poll_interval = poll_interval
+        self.partition = partition
+        self.partitions = partitions
+        self.compact_interval = compact_interval
+        self.consumer = Consumer(directory, f"{name}.{partition}" if partitions > 1 else name)
+        self.log = EventLog(directory, read_only=True)
+        self.stats: Counter = Counter()
+        self._compacted_at = time.monotonic()
+
+    def _delivery(self, record: bytes) -> WebhookDelivery:
+        body, headers, received_at = decode_record(record)
+        event, payload = self.receiver.event_name(decoding.loads(body))
+        return WebhookDelivery(event, payload, body, headers, received_at)
+
+    async def _process(self, record: bytes) -> None:
+        try:
+            delivery = self._delivery(record)
+        except ValueError:
+            self.stats["unreadable"] += 1
+            logger.exception("Skipping an unreadable event log record")
+            return
+        try:
+            await self.receiver.dispatch(delivery)
+            self.stats["handled"] += 1
+        except Exception:
+            self.stats["failed"] += 1
+            logger.exception(f"Webhook handler failed for event {delivery.event!r}")
+
+    async def run_once(self) -> int:
+        """
+        Process one batch and commit it.
+
+        Returns:
+            int: The number of records read, 0 when the log is caught up.
+        """
+        records = self.consumer.poll(self.batch)
+        if not records:
+            return 0
+        mine = [record for _, record in records if self.partitions == 1 or zlib.crc32(record) % self.partitions == self.partition]
+        await asyncio.gather(*(self._process(record) for record in mine))
+        self.consumer.commit()
+        if time.monotonic() - self._compacted_at >= self.compact_interval:
+            self._compacted_at = time.monotonic()
+            self.log.compact()
+        return len(records)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Process the log until `stop` is set, waiting `poll_interval` seconds whenever it is caught up.
+        """
+        while stop is None or not stop.is_set():
+            if not await self.run_once():
+                await asyncio.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        self.consumer.close()
+        self.log.close()
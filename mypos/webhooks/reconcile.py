@@ -0,0 +1,297 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from ..concurrency import TaskResult, bounded_map, default_workers
+from ..pagination import fetch_all
+from ..schemas import Event, Subscription, Webhook
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WebhookSpec:
+    """
+    The desired state of one webhook: its secret, and the events it is subscribed to,
+    each with a filter (e.g. {"tids": ["90004889"]}) or None.
+    """
+    payload_url: str
+    secret: str
+    events: Dict[str, Optional[dict]] = field(default_factory=dict)
+    is_active: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "WebhookSpec":
+        """
+        Build a spec from a mapping, e.g. loaded from JSON or YAML. `events` may be a
+        list of event names or a mapping of event names to filters.
+        """
+        events = data.get("events") or {}
+        if not isinstance(events, Mapping):
+            events = {name: None for name in events}
+        return cls(data["payload_url"], data["secret"], dict(events), data.get("is_active", True))
+
+
+class ChangeAction(str, Enum):
+    CREATE_WEBHOOK = "create_webhook"
+    UPDATE_WEBHOOK = "update_webhook"
+    DELETE_WEBHOOK = "delete_webhook"
+    SUBSCRIBE = "subscribe"
+    UPDATE_SUBSCRIPTION = "update_subscription"
+    UNSUBSCRIBE = "unsubscribe"
+
+
+_WEBHOOK_ACTIONS = (ChangeAction.CREATE_WEBHOOK, ChangeAction.UPDATE_WEBHOOK, ChangeAction.DELETE_WEBHOOK)
+
+
+@dataclass
+class Change:
+    action: ChangeAction
+    payload_url: str
+    webhook_id: Optional[str] = None
+    event: Optional[str] = None
+    subscription_id: Optional[str] = None
+    secret: Optional[str] = None
+    is_active: Optional[bool] = None
+    filter: Optional[dict] = None
+
+    def __str__(self) -> str:
+        # Secrets are never printed
+        target = f"{self.payload_url} {self.event}" if self.event else self.payload_url
+        details = []
+        if self.secret is not None:
+            details.append("secret")
+        if self.is_active is not None:
+            details.append(f"is_active={self.is_active}")
+        if self.filter:
+            details.append(f"filter={self.filter}")
+        return f"{self.action.value} {target}" + (f" ({', '.join(details)})" if details else "")
+
+
+@dataclass
+class ReconcileResult:
+    """
+    The changes of a reconciliation. `errors` holds the changes that failed, `error`
+    what stopped the whole account from being reconciled, e.g. a failed listing.
+    """
+    changes: List[Change]
+    applied: List[Change] = field(default_factory=list)
+    errors: List[Tuple[Change, BaseException]] = field(default_factory=list)
+    dry_run: bool = False
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and self.error is None
+
+
+def _filter(value: Optional[dict]) -> dict:
+    return value or {}
+
+
+class WebhookReconciler:
+    """
+    Brings the webhooks and subscriptions of a merchant account to a desired state.
+
+    The current webhooks, subscriptions and events are listed concurrently, all
+    pages at once. Webhooks are matched by payload URL, subscriptions by webhook
+    and event name, and only the differences are applied: webhook changes first,
+    then subscription changes, each concurrently. Webhooks that are not in the
+    spec are left alone unless `prune` is True.
+
+    Example:
+        reconciler = WebhookReconciler(client.webhooks.v1, [
+            WebhookSpec("https://example.com/mypos", secret, {"transaction": {"tids": ["90004889"]}}),
+        ])
+        print(*reconciler.plan(), sep="\\n")
+        result = reconciler.run()
+    """
+
+    def __init__(
+        self,
+        webhooks,
+        specs: Iterable[WebhookSpec],
+        prune: bool = False,
+        max_workers: Optional[int] = None,
+        page_size: int = 100
+    ) -> None:
+        self.webhooks = webhooks
+        self.specs = {spec.payload_url: spec for spec in specs}
+        self.prune = prune
+        self.max_workers = max_workers or default_workers()
+        self.page_size = page_size
+        self._events: Dict[str, str] = {}
+
+    def current(self) -> Tuple[List[Webhook], List[Subscription], List[Event]]:
+        """
+        List the current webhooks, subscriptions and available events concurrently.
+        """
+        size = self.page_size
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="mypos-reconcile") as executor:
+            webhooks = executor.submit(fetch_all, lambda page: self.webhooks.list(page=page, size=size), "webhooks", self.max_workers)
+            subscriptions = executor.submit(fetch_all, lambda page: self.webhooks.list_subscriptions(page=page, size=size), "subscriptions", self.max_workers)
+            events = executor.submit(fetch_all, lambda page: self.webhooks.list_events(page=page, size=size), "events", self.max_workers)
+            return webhooks.result(), subscriptions.result(), events.result()
+
+    def diff(self, webhooks: List[Webhook], subscriptions: List[Subscription], events: List[Event]) -> List[Change]:
+        """
+        Compute the changes that turn the current state into the desired one.
+        """
+        self._events = {event.name: event.id for event in events}
+        changes: List[Change] = []
+        by_url: Dict[str, Webhook] = {}
+        for webhook in webhooks:
+            if webhook.payload_url in by_url or webhook.payload_url not in self.specs:
+                # Duplicates of a managed webhook, or webhooks the spec does not mention
+                if self.prune:
+                    changes.append(Change(ChangeAction.DELETE_WEBHOOK, webhook.payload_url, webhook_id=webhook.id))
+                continue
+            by_url[webhook.payload_url] = webhook
+
+        current: Dict[str, Dict[str, Subscription]] = {}
+        for subscription in subscriptions:
+            current.setdefault(subscription.hook.id, {})[subscription.event] = subscription
+
+        for url, spec in self.specs.items():
+            unknown = [event for event in spec.events if event not in self._events]
+            if unknown:
+                raise ValueError(f"Unknown events for {url}: {', '.join(unknown)}")
+            webhook = by_url.get(url)
+            if webhook is None:
+                changes.append(Change(ChangeAction.CREATE_WEBHOOK, url, secret=spec.secret, is_active=None if spec.is_active else False))
+                existing: Dict[str, Subscription] = {}
+            else:
+                if webhook.secret != spec.secret or webhook.is_active != spec.is_active:
+                    changes.append(Change(
+                        ChangeAction.UPDATE_WEBHOOK, url, webhook_id=webhook.id,
+                        secret=spec.secret if webhook.secret != spec.secret else None,
+                        is_active=spec.is_active if webhook.is_active != spec.is_active else None
+                    ))
+                existing = current.get(webhook.id, {})
+            webhook_id = webhook.id if webhook else None
+
+            for event, event_filter in spec.events.items():
+                subscription = existing.get(event)
+                if subscription is None:
+                    changes.append(Change(ChangeAction.SUBSCRIBE, url, webhook_id=webhook_id, event=event, filter=event_filter))
+                elif _filter(subscription.filter) != _filter(event_filter):
+                    changes.append(Change(
+                        ChangeAction.UPDATE_SUBSCRIPTION, url, webhook_id=webhook_id, event=event,
+                        subscription_id=subscription.id, filter=event_filter
+                    ))
+            for event, subscription in existing.items():
+                if event not in spec.events:
+                    changes.append(Change(ChangeAction.UNSUBSCRIBE, url, webhook_id=webhook_id, event=event, subscription_id=subscription.id))
+        return changes
+
+    def plan(self) -> List[Change]:
+        """
+        Fetch the current state and compute the changes, without applying them.
+        """
+        return self.diff(*self.current())
+
+    def _apply_one(self, change: Change) -> Any:
+        api = self.webhooks
+        action = change.action
+        if action is ChangeAction.CREATE_WEBHOOK:
+            webhook = api.create(change.payload_url, change.secret)
+            if change.is_active is False:
+                webhook = api.update(webhook.id, is_active=False)
+            return webhook
+        if action is ChangeAction.UPDATE_WEBHOOK:
+            return api.update(change.webhook_id, secret=change.secret, is_active=change.is_active)
+        if action is ChangeAction.DELETE_WEBHOOK:
+            return api.delete(change.webhook_id)
+        if action is ChangeAction.SUBSCRIBE:
+            subscription = api.subscribe(self._events[change.event], webhook_id=change.webhook_id)
+            if change.filter:
+                subscription = api.update_subscription(subscription.id, filter=change.filter)
+            return subscription
+        if action is ChangeAction.UPDATE_SUBSCRIPTION:
+            # An empty filter clears it
+            return api.update_subscription(change.subscription_id, filter=change.filter or {})
+        return api.unsubscribe(change.subscription_id)
+
+    def _apply_all(self, changes: List[Change], result: ReconcileResult) -> List[TaskResult]:
+        results = list(bounded_map(self._apply_one, changes, max_workers=self.max_workers))
+        for task in results:
+            if task.ok:
+                result.applied.append(task.item)
+            else:
+                logger.warning(f"Failed to {task.item}: {task.error}")
+                result.errors.append((task.item, task.error))
+        return results
+
+    def apply(self, changes: List[Change]) -> ReconcileResult:
+        """
+        Apply changes computed by `diff` or `plan`.
+
+        Webhook changes are applied first, so subscriptions of new webhooks get their IDs.
+        Subscriptions of a webhook that failed to be created are reported as failed.
+        """
+        result = ReconcileResult(changes)
+        webhook_changes = [change for change in changes if change.action in _WEBHOOK_ACTIONS]
+        subscription_changes = [change for change in changes if change.action not in _WEBHOOK_ACTIONS]
+
+        created: Dict[str, str] = {}
+        for task in self._apply_all(webhook_changes, result):
+            if task.ok and task.item.action is ChangeAction.CREATE_WEBHOOK:
+                created[task.item.payload_url] = task.value.id
+
+        ready = []
+        for change in subscription_changes:
+            if change.webhook_id is None:
+                if change.payload_url not in created:
+                    result.errors.append((change, RuntimeError(f"Webhook {change.payload_url} was not created")))
+                    continue
+                change = replace(change, webhook_id=created[change.payload_url])
+            ready.append(change)
+        self._apply_all(ready, result)
+        return result
+
+    def run(self, dry_run: bool = False) -> ReconcileResult:
+        """
+        Reconcile the account. With `dry_run`, only compute the changes.
+        """
+        changes = self.plan()
+        if dry_run:
+            return ReconcileResult(changes, dry_run=True)
+        result = self.apply(changes)
+        logger.info(f"Applied {len(result.applied)} of {len(changes)} webhook changes")
+        return result
+
+
+def reconcile_accounts(
+    accounts: Mapping[str, Tuple[Any, Iterable[WebhookSpec]]],
+    dry_run: bool = False,
+    prune: bool = False,
+    max_accounts: int = 8,
+    max_workers: Optional[int] = None
+) -> Dict[str, ReconcileResult]:
+    """
+    Reconcile many merchant accounts concurrently.
+
+    Args:
+        accounts: The `client.webhooks.v1` and the specs of every account, by account name.
+        dry_run: Only compute the changes.
+        prune: Delete the webhooks that are not in the specs.
+        max_accounts: Number of accounts reconciled at a time.
+        max_workers: Number of concurrent requests per account (optional)
+
+    Returns:
+        Dict[str, ReconcileResult]: The result of every account. An account that could
+        not be listed gets a result with no changes, and the failure in `error`.
+    """
+    def reconcile(name: str) -> ReconcileResult:
+        webhooks, specs = accounts[name]
+        return WebhookReconciler(webhooks, specs, prune=prune, max_workers=max_workers).run(dry_run=dry_run)
+
+    results: Dict[str, ReconcileResult] = {}
+    for task in bounded_map(reconcile, list(accounts), max_workers=max_accounts):
+        if task.ok:
+            results[task.item] = task.value
+        else:
+            logger.warning(f"Failed to reconcile the webhooks of {task.item}: {task.error}")
+            results[task.item] = ReconcileResult([], dry_run=dry_run, error=task.error)
+    return results
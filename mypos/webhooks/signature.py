@@ -0,0 +1,186 @@
+import hashlib
+import hmac
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple, Union
+
+SIGNATURE_HEADER = "X-myPOS-Signature"
+
+Body = Union[bytes, bytearray, memoryview, str]
+
+# JSON string literals, and whitespace, which is insignificant outside of them
+_STRING = re.compile(rb'("(?:[^"\\]++|\\.)*+")', re.S)
+_WHITESPACE = re.compile(rb"[ \t\r\n]+")
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if key.lower() == lowered:
+                return candidate
+    return value
+
+
+def signature_header(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    The signature header of a request, looked up case-insensitively.
+    """
+    return _header(headers, SIGNATURE_HEADER)
+
+
+def parse_signature_header(value: Union[str, bytes]) -> Tuple[Optional[int], List[str]]:
+    """
+    Parse a `t=<timestamp>,v1=<signature>` header in one pass.
+
+    Returns:
+        Tuple[Optional[int], List[str]]: The timestamp, and every v1 signature.
+    """
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    timestamp = None
+    signatures = []
+    for part in value.split(","):
+        part = part.strip()
+        if part.startswith("t="):
+            try:
+                timestamp = int(part[2:])
+            except ValueError:
+                return None, []
+        elif part.startswith("v1="):
+            signatures.append(part[3:])
+    return timestamp, signatures
+
+
+def normalize_json(body: bytes) -> bytes:
+    """
+    Remove the whitespace between JSON tokens, leaving string values untouched.
+    """
+    parts = _STRING.split(body)
+    # split() alternates text outside strings (even) and string literals (odd)
+    parts[::2] = [_WHITESPACE.sub(b"", part) for part in parts[::2]]
+    return b"".join(parts)
+
+
+class SignatureVerifier:
+    """
+    Reusable verifier of webhook signatures.
+
+    The HMAC state of every active secret is created once and copied per
+    message, so the key schedule is not recomputed for each notification.
+    Bodies are verified as raw bytes (or memoryview) without decoding. The
+    compact body is tried first. Only if it does not match and contains
+    whitespace is it normalised, outside of string values. Several secrets
+    can be active while rotating them.
+
+    Example:
+        verifier = SignatureVerifier([new_secret, old_secret])
+        if not verifier.verify(body, headers):
+            return 401
+    """
+
+    def __init__(self, secrets: Union[str, Sequence[str]], tolerance: int = 300, clock: Callable[[], float] = time.time) -> None:
+        self.tolerance = tolerance
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._keyring: Tuple[Tuple[str, "hmac.HMAC"], ...] = ()
+        for secret in [secrets] if isinstance(secrets, str) else secrets:
+            self.add_secret(secret)
+
+    def add_secret(self, secret: str) -> None:
+        """
+        Accept signatures made with another secret, e.g. the new one during a rotation.
+        """
+        with self._lock:
+            if all(existing != secret for existing, _ in self._keyring):
+                # Swapped as a whole, so verifying threads never see a partial keyring
+                self._keyring = self._keyring + ((secret, hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)),)
+
+    def remove_secret(self, secret: str) -> None:
+        """
+        Stop accepting signatures made with a secret.
+        """
+        with self._lock:
+            self._keyring = tuple(entry for entry in self._keyring if entry[0] != secret)
+
+    def _matches(self, body: Union[bytes, memoryview], signatures: List[str]) -> bool:
+        # compare_digest raises TypeError on non-ASCII strings, which can never match a hex digest
+        signatures = [signature for signature in signatures if signature.isascii()]
+        if not signatures:
+            return False
+        keyring = self._keyring
+        for index, (secret, key) in enumerate(keyring):
+            mac = key.copy()
+            mac.update(body)
+            expected = mac.hexdigest()
+            for signature in signatures:
+                if hmac.compare_digest(expected, signature):
+                    if index:
+                        self._promote(secret)
+                    return True
+        return False
+
+    def _promote(self, secret: str) -> None:
+        # Try the secret that signs current notifications first, mostly the new one after a rotation
+        with self._lock:
+            self._keyring = tuple(sorted(self._keyring, key=lambda entry: entry[0] != secret))
+
+    def verify_header(self, body: Body, signature_header: Union[str, bytes, None]) -> bool:
+        """
+        Verify a body against the value of the signature header.
+        """
+        if not signature_header:
+            return False
+        timestamp, signatures = parse_signature_header(signature_header)
+        if timestamp is None or not signatures:
+            return False
+        if abs(self.clock() - timestamp) > self.tolerance:
+            return False
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if self._matches(body, signatures):
+            return True
+        raw = bytes(body)
+        if b" " in raw or b"\n" in raw or b"\t" in raw or b"\r" in raw:
+            return self._matches(normalize_json(raw), signatures)
+        return False
+
+    def verify(self, body: Body, headers: Mapping[str, str]) -> bool:
+        """
+        Verify a notification.
+
+        Args:
+            body: The raw request body.
+            headers: The request headers.
+
+        Returns:
+            bool: True if the signature is valid for one of the secrets and not expired.
+        """
+        return self.verify_header(body, signature_header(headers))
+
+
+@lru_cache(maxsize=64)
+def _verifier(secret: str, tolerance: int) -> SignatureVerifier:
+    return SignatureVerifier(secret, tolerance)
+
+
+def verify_signature(payload: Body, headers: Mapping[str, str], secret: str, tolerance: int = 300) -> bool:
+    """
+    Verify the signature of a webhook notification.
+
+    Args:
+        payload: The raw request body.
+        headers: The request headers.
+        secret: The webhook secret.
+        tolerance: Maximum age of the signature timestamp in seconds. Default is 300.
+
+    Returns:
+        bool: True if the signature is valid, False otherwise.
+    """
+    return _verifier(secret, tolerance).verify(payload, headers)
@@ -1,6 +1,7 @@
 from typing import Optional, List
-from ...schemas import Webhook, WebhookListResponse, EventListResponse, Subscription, NotificationListResponse, SubscriptionListResponse, Notification
+from ..schemas import Webhook, WebhookListResponse, EventListResponse, Subscription, NotificationListResponse, SubscriptionListResponse, Notification
 import json
+from .signature import verify_signature
 
 class WebhooksV1:
     def __init__(self, client):
@@ -28,13 +29,13 @@ class WebhooksV1:
         """
         List all webhooks.
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            WebhookListResponse,
             "GET", 
             "/v1/webhooks", 
             params={"page": page, "size": size},
             base_url=self.base_url
         )
-        return WebhookListResponse(**response_data)
 
     def get(self, webhook_id: str) -> Webhook:
         """
@@ -96,65 +97,19 @@ class WebhooksV1:
         Returns:
             bool: True if the signature is valid, False otherwise.
         """
-        import hmac
-        import hashlib
-        import time
-
-        signature_header = headers.get("X-myPOS-Signature")
-        if not signature_header:
-            return False
-
-        try:
-            # Extract timestamp and signature
-            parts = signature_header.split(",")
-            timestamp = None
-            signature = None
-            
-            for part in parts:
-                if part.startswith("t="):
-                    timestamp = part.split("=")[1]
-                elif part.startswith("v1="):
-                    signature = part.split("=")[1]
-            
-            if not timestamp or not signature:
-                return False
-
-            # Verify timestamp (tolerance of 5 minutes)
-            current_time = int(time.time())
-            if abs(current_time - int(timestamp)) > 300:
-                return False
-
-            # Normalize JSON payload (remove spaces)
-            # The documentation says: "Please make sure there are no unneeded spaces in the JSON string between the key and value pairs and between the different values."
-            # However, modifying the raw payload is risky if the sender didn't format it exactly as expected.
-            # Ideally, we should use the raw payload as received. 
-            # But the PHP example explicitly does str_replace(": ", ":") and str_replace(", ", ",").
-            # So we will replicate that behavior.
-            normalized_payload = payload.replace(": ", ":").replace(", ", ",")
-
-            # Generate expected signature
-            expected_signature = hmac.new(
-                secret.encode("utf-8"),
-                normalized_payload.encode("utf-8"),
-                hashlib.sha256
-            ).hexdigest()
-
-            return hmac.compare_digest(expected_signature, signature)
-
-        except Exception:
-            return False
+        return verify_signature(payload, headers, secret)
 
     def list_events(self, page: Optional[int] = 1, size: Optional[int] = 20) -> EventListResponse:
         """
         List all available events.
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            EventListResponse,
             "GET", 
             "/v1/events", 
             params={"page": page, "size": size},
             base_url=self.base_url
         )
-        return EventListResponse(**response_data)
 
     def subscribe(self, event_id: str, webhook_id: Optional[str] = None) -> Subscription:
         """
@@ -176,10 +131,10 @@ class WebhooksV1:
 
     def update_subscription(self, subscription_id: str, filter: Optional[dict] = None) -> Subscription:
         """
-        Update event subscription.
+        Update event subscription. An empty `filter` clears it, None leaves it unchanged.
         """
         data = {}
-        if filter:
+        if filter is not None:
             # The example shows filter passed as a JSON string inside the form data
             # filter=%7B%22tids%22%3A%5B%2290004889%22%5D%7D
             data["filter"] = json.dumps(filter)
@@ -248,25 +203,25 @@ class WebhooksV1:
         """
         List event notifications.
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            NotificationListResponse,
             "GET", 
             "/v1/notifications", 
             params={"page": page, "size": size},
             base_url=self.base_url
         )
-        return NotificationListResponse(**response_data)
 
     def list_subscriptions(self, page: Optional[int] = 1, size: Optional[int] = 20) -> SubscriptionListResponse:
         """
         List current subscriptions.
         """
-        response_data = self.client.request(
+        return self.client.request_model(
+            SubscriptionListResponse,
             "GET", 
             "/v1/subscriptions", 
             params={"page": page, "size": size},
             base_url=self.base_url
         )
-        return SubscriptionListResponse(**response_data)
 
     def get_subscription(self, subscription_id: str) -> Subscription:
         """
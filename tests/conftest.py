@@ -0,0 +1,56 @@
+import pytest
+from mypos.base import BaseClient
+
+
+class FakeResponse:
+    """
+    A niquests response stand-in with a fixed status and body.
+    """
+
+    def __init__(self, status_code: int = 200, content: bytes = b"{}", headers: dict = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {"Content-Type": "application/json"}
+        self.closed = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def iter_content(self, chunk_size: int = 1024):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def iter_lines(self):
+        yield from self.content.splitlines()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    A `BaseClient` whose token requests are counted instead of sent. Set
+    `client.responses` to the responses `niquests.request` returns, in order.
+    """
+    tokens = []
+
+    def get_access_token(self):
+        tokens.append(1)
+        self.access_token = f"token-{len(tokens)}"
+        return self.access_token
+
+    monkeypatch.setattr(BaseClient, "get_access_token", get_access_token)
+    monkeypatch.setenv("MYPOS_API_BASE_URL", "https://api.example.test")
+    base = BaseClient()
+    base.tokens = tokens
+    base.responses = []
+    base.sent = []
+
+    def request(method, url, headers=None, **kwargs):
+        base.sent.append((method, url, headers, kwargs))
+        return base.responses.pop(0)
+
+    monkeypatch.setattr("mypos.base.niquests.request", request)
+    return base
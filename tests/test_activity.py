@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from mypos.devices.activity import ActivityEventType, DeviceActivityMonitor
+from tests.test_fleet import detail
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDevices:
+    def __init__(self):
+        self.details = {}
+        self.calls = []
+
+    def get_device_details(self, terminal_id):
+        self.calls.append(terminal_id)
+        if terminal_id not in self.details:
+            raise Exception("Request failed: 502 Bad Gateway")
+        return self.details[terminal_id]
+
+
+def with_last_transaction(terminal_id, when, status="active", outlet_id=1):
+    device = detail(terminal_id, outlet_id)
+    device.last_transaction_date = when.strftime("%Y-%m-%d %H:%M:%S")
+    device.status = status
+    return device
+
+
+def test_failures_of_a_never_fetched_terminal_back_off():
+    clock = Clock(datetime(2025, 1, 1, 12, 0))
+    devices = FakeDevices()
+    monitor = DeviceActivityMonitor(devices, min_interval=timedelta(minutes=5), max_interval=timedelta(hours=6), clock=clock)
+    monitor.add(["T1"])
+    waits = []
+    for _ in range(5):
+        clock.now += timedelta(seconds=monitor.seconds_until_due())
+        monitor.poll()
+        waits.append(monitor.seconds_until_due())
+    assert waits == [300, 600, 1200, 2400, 4800]
+    assert len(devices.calls) == 5
+
+
+def test_first_check_emits_no_events_then_changes_are_reported():
+    start = datetime(2025, 1, 1, 12, 0)
+    clock = Clock(start)
+    devices = FakeDevices()
+    devices.details["T1"] = with_last_transaction("T1", start - timedelta(minutes=30))
+    monitor = DeviceActivityMonitor(devices, quiet_after=timedelta(hours=2), clock=clock)
+    monitor.add(["T1"])
+    assert monitor.poll() == []
+
+    # Due again when it would become quiet, 90 minutes later
+    assert monitor.seconds_until_due() == 90 * 60
+    clock.now += timedelta(minutes=90)
+    devices.details["T1"] = with_last_transaction("T1", start - timedelta(minutes=30), status="blocked", outlet_id=2)
+    events = monitor.poll()
+    assert [e.type for e in events] == [ActivityEventType.QUIET, ActivityEventType.STATUS_CHANGED, ActivityEventType.OUTLET_CHANGED]
+
+    clock.now += timedelta(seconds=monitor.seconds_until_due())
+    devices.details["T1"] = with_last_transaction("T1", clock.now, status="blocked", outlet_id=2)
+    assert [e.type for e in monitor.poll()] == [ActivityEventType.RESUMED]
+
+
+def test_removed_terminal_is_not_checked():
+    clock = Clock(datetime(2025, 1, 1, 12, 0))
+    devices = FakeDevices()
+    monitor = DeviceActivityMonitor(devices, clock=clock)
+    monitor.add(["T1", "T2"])
+    monitor.remove("T1")
+    monitor.poll()
+    assert devices.calls == ["T2"]
@@ -0,0 +1,74 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from mypos.webhooks.backfill import NotificationBackfill, ProcessedIndex
+from mypos.webhooks.payloads import EventPayload, LazyPayload
+from mypos.webhooks.receiver import WebhookDelivery, WebhookReceiver
+
+
+def notification(sent_on, payload=None, event="payment.completed"):
+    return SimpleNamespace(event=event, payload=payload or {"amount": 10}, sent_on=sent_on)
+
+
+def delivery(body: dict) -> WebhookDelivery:
+    return WebhookDelivery(body["event"], body["payload"], json.dumps(body).encode(), {}, 0.0)
+
+
+class FakeWebhooks:
+    def __init__(self, notifications):
+        self.notifications = notifications
+
+    def list_notifications(self, page, size):
+        items = self.notifications[(page - 1) * size:page * size]
+        return SimpleNamespace(notifications=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(self.notifications)))
+
+
+def test_identical_payloads_are_told_apart_by_sent_on():
+    index = ProcessedIndex()
+    index.record(delivery({"event": "payment.completed", "payload": {"amount": 10}, "sent_on": "2026-10-19 10:00:00"}))
+    assert index.seen("payment.completed", {"amount": 10}, "2026-10-19 10:00:00")
+    assert not index.seen("payment.completed", {"amount": 10}, "2026-10-19 11:00:00")
+
+
+def test_deliveries_without_sent_on_match_any_listing():
+    index = ProcessedIndex()
+    index.record(delivery({"event": "payment.completed", "payload": {"amount": 10}}))
+    assert index.seen("payment.completed", {"amount": 10}, "2026-10-19 11:00:00")
+
+
+def test_index_survives_a_restart(tmp_path):
+    path = str(tmp_path / "processed.idx")
+    index = ProcessedIndex(path)
+    index.add("payment.completed", {"amount": 10}, "2026-10-19 10:00:00")
+    index.close()
+    assert ProcessedIndex(path).seen("payment.completed", {"amount": 10}, "2026-10-19 10:00:00")
+
+
+def test_backfill_replays_missing_notifications_oldest_first(tmp_path):
+    index = ProcessedIndex()
+    index.add("payment.completed", {"amount": 10}, "2026-10-19 10:00:00")
+    webhooks = FakeWebhooks([
+        notification("2026-10-19 12:00:00", {"amount": 12}),
+        notification("2026-10-19 11:00:00"),
+        notification("2026-10-19 10:00:00"),
+    ])
+    receiver = WebhookReceiver("secret")
+    replayed = []
+    receiver.on("payment.completed", raw=True)(lambda delivery: replayed.append(delivery.payload))
+    backfill = NotificationBackfill(webhooks, receiver, index, state_path=str(tmp_path / "backfill.json"), page_size=2)
+    report = asyncio.run(backfill.run())
+    assert replayed == [{"amount": 10}, {"amount": 12}]
+    assert (report.scanned, report.missing, report.replayed) == (3, 2, 2)
+    assert backfill.watermark == "2026-10-19 12:00:00"
+
+
+class Payment(EventPayload):
+    amount: float
+
+
+def test_lazy_payloads_are_keyed_by_their_raw_payload():
+    index = ProcessedIndex()
+    payload = {"amount": 10}
+    index.record(WebhookDelivery("payment.completed", LazyPayload(Payment, payload), b"{}", {}, 0.0))
+    assert index.seen("payment.completed", payload)
+    assert index.seen("payment.completed", LazyPayload(Payment, b'{"amount": 10}'))
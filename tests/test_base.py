@@ -0,0 +1,54 @@
+import pytest
+from mypos.base import APIError
+from mypos.schemas import Pagination
+from tests.conftest import FakeResponse
+
+
+def test_refreshes_token_on_401(client):
+    client.responses = [FakeResponse(401, b"unauthorized"), FakeResponse(200, b'{"ok": true}')]
+    assert client.request("GET", "/x") == {"ok": True}
+    assert len(client.tokens) == 2
+    assert client.sent[1][2]["Authorization"] == "Bearer token-2"
+
+
+def test_refreshes_token_on_200_error_envelope(client):
+    client.responses = [FakeResponse(200, b'{"code": 503, "message": "Token expired"}'), FakeResponse(200, b'{"ok": true}')]
+    assert client.request("GET", "/x") == {"ok": True}
+    assert len(client.tokens) == 2
+
+
+def test_large_200_body_is_not_decoded_for_the_token_check(client, monkeypatch):
+    body = b'{"code": 503, "items": [' + b"1," * 1000 + b"1]}"
+    client.responses = [FakeResponse(200, body)]
+    decoded = []
+    monkeypatch.setattr("mypos.base.decoding.loads", lambda data: decoded.append(data) or {"code": 200})
+    client.request("GET", "/x")
+    assert len(decoded) == 1
+    assert len(client.tokens) == 1
+
+
+def test_request_model_raises_for_empty_body(client):
+    client.responses = [FakeResponse(204, b""), FakeResponse(200, b"")]
+    with pytest.raises(APIError, match="Empty response body") as error:
+        client.request_model(Pagination, "DELETE", "/x")
+    assert (error.value.status_code, error.value.definite) == (204, False)
+    with pytest.raises(APIError):
+        client.request_model(Pagination, "GET", "/x")
+
+
+def test_request_model_decodes_body(client):
+    client.responses = [FakeResponse(200, b'{"page": 2, "page_size": 10, "total": 30}')]
+    assert client.request_model(Pagination, "GET", "/x").total == 30
+
+
+def test_request_stream_of_empty_body_has_no_records(client):
+    client.responses = [FakeResponse(204, b"")]
+    page = client.request_stream("items", Pagination, "GET", "/x")
+    assert list(page) == []
+    assert page.pagination is None
+
+
+def test_failed_request_raises(client):
+    client.responses = [FakeResponse(400, b'{"message": "bad"}')]
+    with pytest.raises(Exception, match="Request failed"):
+        client.request("GET", "/x")
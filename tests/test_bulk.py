@@ -0,0 +1,104 @@
+import niquests
+import pytest
+from mypos.base import APIError
+from mypos.journal import Journal
+from mypos.transactions.bulk import BulkOperation, BulkRunner, BulkStatus, load_bulk_csv
+
+
+class FakeTransactions:
+    """
+    Answers payment link operations with the queued errors, then succeeds.
+    """
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = []
+
+    def _call(self, operation, params):
+        self.calls.append((operation, params))
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"code": params.get("code", "new")}
+
+    def create_payment_link(self, **params):
+        return self._call("create", params)
+
+    def update_payment_link(self, **params):
+        return self._call("update", params)
+
+
+def run(runner, operation, rows):
+    return list(runner.run(operation, rows))
+
+
+def test_server_error_on_create_is_in_doubt_and_not_resent(tmp_path):
+    transactions = FakeTransactions([APIError("Request failed: gateway timeout", 504)])
+    runner = BulkRunner(transactions, str(tmp_path / "bulk.journal"))
+    row = {"item_name": "Ride", "item_price": 10.0}
+    assert [r.status for r in run(runner, "create_payment_link", [row])] == [BulkStatus.IN_DOUBT]
+    assert [r.status for r in run(runner, "create_payment_link", [row])] == [BulkStatus.IN_DOUBT]
+    assert len(transactions.calls) == 1
+
+
+def test_client_error_on_create_is_failed(tmp_path):
+    transactions = FakeTransactions([APIError("Request failed: invalid price", 422)])
+    runner = BulkRunner(transactions, str(tmp_path / "bulk.journal"))
+    [result] = run(runner, "create_payment_link", [{"item_name": "Ride", "item_price": -1.0}])
+    assert result.status is BulkStatus.FAILED
+
+
+@pytest.mark.parametrize("error", [APIError("Request failed: bad gateway", 502), niquests.exceptions.ConnectionError("reset"), RuntimeError("boom")])
+def test_updates_in_doubt_are_retried(tmp_path, error):
+    transactions = FakeTransactions([error])
+    runner = BulkRunner(transactions, str(tmp_path / "bulk.journal"))
+    row = {"code": "L1", "enable": False}
+    assert [r.status for r in run(runner, "update_payment_link", [row])] == [BulkStatus.IN_DOUBT]
+    assert [r.status for r in run(runner, "update_payment_link", [row])] == [BulkStatus.DONE]
+    assert [r.status for r in run(runner, "update_payment_link", [row])] == [BulkStatus.ALREADY_DONE]
+
+
+def test_csv_booleans_are_strict(tmp_path):
+    path = tmp_path / "links.csv"
+    path.write_text("code,enable,send_sms\nL1,yes,0\nL2,False,\n")
+    items = load_bulk_csv(str(path), BulkOperation.UPDATE_LINK)
+    assert [item.params for item in items] == [{"code": "L1", "enable": True, "send_sms": False}, {"code": "L2", "enable": False}]
+
+    path.write_text("code,enable\nL1,off\n")
+    with pytest.raises(ValueError, match="Invalid boolean"):
+        load_bulk_csv(str(path), BulkOperation.UPDATE_LINK)
+
+
+def test_different_updates_of_one_code_both_run(tmp_path):
+    transactions = FakeTransactions()
+    runner = BulkRunner(transactions, str(tmp_path / "bulk.journal"))
+    assert [r.status for r in run(runner, "update_payment_link", [{"code": "L1", "enable": False}])] == [BulkStatus.DONE]
+    assert [r.status for r in run(runner, "update_payment_link", [{"code": "L1", "enable": True}])] == [BulkStatus.DONE]
+    assert [params for _, params in transactions.calls] == [{"code": "L1", "enable": False}, {"code": "L1", "enable": True}]
+
+
+def test_changing_one_code_twice_in_a_batch_runs_the_first_change(tmp_path):
+    transactions = FakeTransactions()
+    runner = BulkRunner(transactions, str(tmp_path / "bulk.journal"))
+    results = run(runner, "update_payment_link", [{"code": "L1", "enable": False}, {"code": "L1", "enable": True}])
+    assert sorted(r.status.value for r in results) == ["done", "failed"]
+    assert transactions.calls == [("update", {"code": "L1", "enable": False})]
+
+
+class FailingJournal(Journal):
+    """
+    A journal that cannot record outcomes.
+    """
+
+    def append(self, record):
+        if record["state"] != "intent":
+            raise OSError("disk full")
+        super().append(record)
+
+
+def test_create_whose_outcome_cannot_be_journaled_is_in_doubt(tmp_path):
+    transactions = FakeTransactions()
+    runner = BulkRunner(transactions, FailingJournal(str(tmp_path / "bulk.journal")))
+    row = {"item_name": "Ride", "item_price": 10.0}
+    [result] = run(runner, "create_payment_link", [row])
+    assert result.status is BulkStatus.IN_DOUBT
+    assert result.value == {"code": "new"}
@@ -0,0 +1,64 @@
+import niquests
+import pytest
+from mypos.base import APIError
+from mypos.journal import Journal
+from mypos.transactions.campaigns import Campaign, CampaignItem, CampaignStatus
+
+
+class FakeTransactions:
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.created = []
+
+    def create_payment_request(self, **params):
+        self.created.append(params)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"code": f"PR{len(self.created)}", "payment_request_url": "https://pay.example"}
+
+
+ITEM = CampaignItem("driver-1", {"amount": 10.0, "currency": "EUR", "client_name": "Driver", "reason": "Fee"})
+
+
+def campaign(tmp_path, transactions):
+    return Campaign(transactions, "fees", str(tmp_path / "campaigns.journal"), reminder_rate=None)
+
+
+@pytest.mark.parametrize("error", [APIError("Request failed: unavailable", 503), niquests.exceptions.ReadTimeout("timeout"), RuntimeError("boom")])
+def test_errors_that_may_have_created_the_request_are_in_doubt(tmp_path, error):
+    transactions = FakeTransactions([error])
+    fees = campaign(tmp_path, transactions)
+    assert [result.status for result in fees.create([ITEM])] == [CampaignStatus.IN_DOUBT]
+    assert fees._records()["fees:driver-1"]["state"] == "intent"
+    assert [result.status for result in fees.create([ITEM])] == [CampaignStatus.IN_DOUBT]
+    assert len(transactions.created) == 1
+
+
+def test_rejected_creations_are_retried(tmp_path):
+    transactions = FakeTransactions([APIError("Request failed: invalid currency", 400)])
+    fees = campaign(tmp_path, transactions)
+    assert [result.status for result in fees.create([ITEM])] == [CampaignStatus.FAILED]
+    [result] = fees.create([ITEM])
+    assert (result.status, result.code) == (CampaignStatus.CREATED, "PR2")
+    assert [result.status for result in fees.create([ITEM])] == [CampaignStatus.ALREADY_CREATED]
+    assert fees.codes() == {"driver-1": "PR2"}
+
+
+class FailingJournal(Journal):
+    """
+    A journal that cannot record answers.
+    """
+
+    def append(self, record):
+        if record["state"] != "intent":
+            raise OSError("disk full")
+        super().append(record)
+
+
+def test_created_request_that_cannot_be_journaled_is_in_doubt(tmp_path):
+    transactions = FakeTransactions()
+    fees = Campaign(transactions, "fees", FailingJournal(str(tmp_path / "campaigns.journal")), reminder_rate=None)
+    [result] = fees.create([ITEM])
+    assert (result.status, result.code) == (CampaignStatus.IN_DOUBT, "PR1")
+    assert [result.status for result in fees.create([ITEM])] == [CampaignStatus.IN_DOUBT]
+    assert len(transactions.created) == 1
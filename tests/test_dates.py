@@ -0,0 +1,45 @@
+from datetime import datetime
+import pytest
+from mypos import dates
+from mypos.dates import parse_column, parse_datetime, parse_datetimes
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-03-01 10:20:30", datetime(2025, 3, 1, 10, 20, 30)),
+    ("2025-03-01T10:20:30Z", datetime(2025, 3, 1, 10, 20, 30)),
+    ("2025-03-01T10:20:30+02:00", datetime(2025, 3, 1, 10, 20, 30)),
+    ("2025-03-01", datetime(2025, 3, 1)),
+])
+def test_parse_datetime_returns_naive_wall_time(value, expected):
+    parsed = parse_datetime(value)
+    assert parsed == expected
+    assert parsed.tzinfo is None
+
+
+@pytest.mark.parametrize("value", [None, ""])
+def test_parse_datetime_of_empty_value_is_none(value):
+    assert parse_datetime(value) is None
+
+
+def test_parse_datetimes_matches_parse_datetime():
+    values = ["2025-03-01 10:20:30", "2025-03-01T10:20:30Z", "2025-03-01T10:20:30+02:00", "", None]
+    parsed = parse_datetimes(values)
+    if dates.np is None:
+        assert parsed == [parse_datetime(v) for v in values]
+        return
+    np = dates.np
+    assert [str(v) for v in parsed] == ["2025-03-01T10:20:30"] * 3 + ["NaT", "NaT"]
+    assert [str(v) for v in parse_datetimes(np.array(values[:3], dtype="S25"))] == ["2025-03-01T10:20:30"] * 3
+
+
+def test_parse_datetimes_without_numpy(monkeypatch):
+    monkeypatch.setattr(dates, "np", None)
+    assert parse_datetimes(["2025-03-01T10:20:30+02:00", ""]) == [datetime(2025, 3, 1, 10, 20, 30), None]
+
+
+def test_parse_column_reads_the_field_of_every_item():
+    class Item:
+        def __init__(self, date):
+            self.date = date
+    parsed = parse_column([Item("2025-03-01 00:00:00"), Item("2025-03-02 00:00:00")], "date")
+    assert len(parsed) == 2
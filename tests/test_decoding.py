@@ -0,0 +1,31 @@
+import pytest
+from mypos import decoding
+from mypos.webhooks.receiver import WebhookReceiver
+from tests.test_receiver import SECRET, accept, signed
+
+
+class BackendDecodeError(Exception):
+    """
+    A backend decode error that is not a ValueError, like `msgspec.DecodeError`.
+    """
+
+
+@pytest.fixture
+def strict_backend(monkeypatch):
+    def backend(data):
+        raise BackendDecodeError("truncated")
+
+    monkeypatch.setitem(decoding._BACKENDS, "strict", backend)
+    monkeypatch.setattr(decoding, "_DECODE_ERRORS", (BackendDecodeError,))
+    monkeypatch.setattr(decoding, "_backend_name", "strict")
+
+
+def test_backend_decode_errors_are_value_errors(strict_backend):
+    with pytest.raises(ValueError, match="truncated"):
+        decoding.loads(b'{"event": ')
+
+
+def test_receiver_answers_400_whatever_the_backend(strict_backend):
+    receiver = WebhookReceiver(SECRET)
+    body = b'{"event": "payment.completed"}'
+    assert accept(receiver, body, signed(body)) == 400
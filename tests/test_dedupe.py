@@ -0,0 +1,70 @@
+import json
+from mypos.webhooks.dedupe import Deduplicator, MemoryBackend, RedisBackend, RotatingBloomFilter
+from mypos.webhooks.receiver import WebhookReceiver
+from tests.test_receiver import SECRET, accept, signed
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_backend_expires_and_bounds_keys():
+    clock = Clock()
+    backend = MemoryBackend(max_entries=2, clock=clock)
+    assert backend.add(b"a", 10)
+    assert not backend.add(b"a", 10)
+    clock.now = 11
+    assert backend.add(b"a", 10)
+    backend.add(b"b", 10)
+    backend.add(b"c", 10)
+    assert len(backend) == 2
+    backend.discard(b"c")
+    assert backend.add(b"c", 10)
+
+
+def test_bloom_filter_remembers_keys_for_a_ttl():
+    clock = Clock()
+    backend = RotatingBloomFilter(capacity=100, error_rate=1e-6, clock=clock)
+    assert backend.add(b"a", 10)
+    assert not backend.add(b"a", 10)
+    clock.now = 10
+    assert not backend.add(b"a", 10)
+    clock.now = 20
+    assert backend.add(b"a", 10)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+
+    def set(self, name, value, nx, ex):
+        if nx and name in self.keys:
+            return None
+        self.keys[name] = (value, ex)
+        return True
+
+    def delete(self, name):
+        self.keys.pop(name, None)
+
+
+def test_redis_backend_sets_keys_with_an_expiry():
+    redis = FakeRedis()
+    backend = RedisBackend(redis)
+    assert backend.add(b"\x01", 0.5)
+    assert not backend.add(b"\x01", 0.5)
+    assert redis.keys == {"mypos:webhook:01": (1, 1)}
+
+
+def test_retried_delivery_is_acknowledged_once():
+    receiver = WebhookReceiver(SECRET, dedupe=Deduplicator())
+    handled = []
+    receiver.on("ping", raw=True)(lambda delivery: handled.append(delivery))
+    body = json.dumps({"event": "ping", "payload": {}}).encode()
+    assert accept(receiver, body, signed(body)) == 200
+    assert accept(receiver, body, signed(body)) == 200
+    assert len(handled) == 1
+    assert receiver.stats["duplicate"] == 1
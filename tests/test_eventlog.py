@@ -0,0 +1,99 @@
+import asyncio
+import os
+import pytest
+from mypos.webhooks.eventlog import Consumer, EventLog, _segment_name
+from mypos.webhooks.receiver import EventLogWorker, WebhookReceiver, encode_record
+from tests.test_receiver import SECRET, signed
+
+
+def tear(directory):
+    # A record header promising more bytes than were written
+    with open(os.path.join(directory, _segment_name(0)), "ab") as f:
+        f.write(b"\x10\x00\x00\x00\x00\x00\x00\x00partial")
+
+
+def size(directory):
+    return os.path.getsize(os.path.join(directory, _segment_name(0)))
+
+
+def test_records_are_read_back_by_a_consumer(tmp_path):
+    log = EventLog(str(tmp_path))
+    offsets = log.append_many([b"one", b"two"])
+    consumer = Consumer(str(tmp_path), "archive")
+    assert consumer.poll() == list(zip(offsets, [b"one", b"two"]))
+    consumer.commit()
+    assert Consumer(str(tmp_path), "archive").poll() == []
+    log.close()
+
+
+def test_only_the_writer_truncates_a_torn_tail(tmp_path):
+    directory = str(tmp_path)
+    log = EventLog(directory)
+    log.append(b"one")
+    log.close()
+    tear(directory)
+    torn = size(directory)
+
+    reader = EventLog(directory, read_only=True)
+    assert size(directory) == torn
+    assert reader.end_offset == 8 + 3
+    reader.close()
+
+    writer = EventLog(directory)
+    assert size(directory) == 8 + 3
+    assert writer.append(b"two") == 8 + 3
+    writer.close()
+
+
+def test_read_only_log_refuses_appends(tmp_path):
+    reader = EventLog(str(tmp_path), read_only=True)
+    with pytest.raises(ValueError):
+        reader.append(b"one")
+
+
+def test_worker_does_not_truncate_and_compacts(tmp_path):
+    directory = str(tmp_path)
+    log = EventLog(directory, segment_bytes=1)
+    for i in range(3):
+        log.append(encode_record(b'{"event": "ping"}', {}, float(i)))
+    tear_base = max(int(name[:20]) for name in os.listdir(directory) if name.endswith(".log"))
+    with open(os.path.join(directory, _segment_name(tear_base)), "ab") as f:
+        f.write(b"\x10\x00\x00\x00")
+    torn = os.path.getsize(os.path.join(directory, _segment_name(tear_base)))
+
+    receiver = WebhookReceiver("secret")
+    seen = []
+    receiver.on("ping", raw=True)(lambda delivery: seen.append(delivery.received_at))
+    worker = EventLogWorker(receiver, directory, compact_interval=0)
+    assert os.path.getsize(os.path.join(directory, _segment_name(tear_base))) == torn
+    assert asyncio.run(worker.run_once()) == 3
+    assert sorted(seen) == [0.0, 1.0, 2.0]
+    assert len([name for name in os.listdir(directory) if name.endswith(".log")]) == 1
+    worker.close()
+    log.close()
+
+
+def test_close_is_idempotent_and_appends_after_close_fail(tmp_path):
+    log = EventLog(str(tmp_path))
+    log.append(b"one")
+    log.close()
+    log.close()
+    with pytest.raises(ValueError, match="closed"):
+        log.append(b"two")
+
+
+def test_receiver_stop_closes_the_event_log(tmp_path):
+    log = EventLog(str(tmp_path))
+    receiver = WebhookReceiver(SECRET, event_log=log)
+    body = b'{"event": "ping"}'
+
+    async def run():
+        assert await receiver.accept(body, signed(body)) == 200
+        await receiver.stop()
+
+    asyncio.run(run())
+    with pytest.raises(ValueError, match="closed"):
+        log.append(body)
+    consumer = Consumer(str(tmp_path), "check")
+    assert len(consumer.poll()) == 1
+    consumer.close()
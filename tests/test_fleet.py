@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from mypos.devices.fleet import Fleet, FleetDevice
+
+
+def detail(terminal_id, outlet_id=1):
+    return SimpleNamespace(
+        terminal_id=terminal_id, terminal_name=f"Car {terminal_id}", serial_number="SN", model="Go 2",
+        status="active", outlet_id=outlet_id, outlet_name="Sofia", device_currency="EUR",
+        settlement_account_number="40100001", settlement_account_name="Main",
+        last_transaction_date="2025-01-01 10:00:00", transactions_count=3,
+    )
+
+
+class FakeDevices:
+    def __init__(self, count):
+        self.ids = [f"T{i}" for i in range(count)]
+        self.detail_calls = []
+        self.pages = []
+
+    def list(self, page, size, model=None):
+        self.pages.append((page, len(self.detail_calls)))
+        items = [SimpleNamespace(terminal_id=t) for t in self.ids[(page - 1) * size:page * size]]
+        return SimpleNamespace(devices=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(self.ids)))
+
+    def get_device_details(self, terminal_id):
+        self.detail_calls.append(terminal_id)
+        if terminal_id == "T3":
+            raise Exception("Request failed: not found")
+        return detail(terminal_id, outlet_id=int(terminal_id[1:]) % 2)
+
+
+def test_snapshot_indexes_devices_and_collects_errors():
+    devices = FakeDevices(5)
+    table = Fleet(devices, max_workers=2, page_size=2).snapshot()
+    assert len(table) == 4
+    assert "T3" in table.errors
+    assert {d.terminal_id for d in table.outlet(0)} == {"T0", "T2", "T4"}
+    assert len(table.settlement_account("40100001")) == 4
+
+
+def test_snapshot_uses_the_cache_until_expired():
+    devices = FakeDevices(3)
+    fleet = Fleet(devices, max_workers=2)
+    fleet.snapshot()
+    fleet.snapshot()
+    assert len(devices.detail_calls) == 3
+    fleet.ttl = -1
+    fleet.snapshot()
+    assert len(devices.detail_calls) == 6
+
+
+def test_cache_is_bounded():
+    devices = FakeDevices(10)
+    fleet = Fleet(devices, max_workers=2, max_entries=4)
+    fleet.snapshot()
+    assert len(fleet._cache) == 4
+
+
+def test_interned_fields_are_shared():
+    first = FleetDevice.from_detail(detail("T1"))
+    second = FleetDevice.from_detail(SimpleNamespace(**{**vars(detail("T2")), "model": "".join(["Go", " 2"])}))
+    assert first.model is second.model
+
+
+def test_details_are_fetched_while_later_pages_are_listed():
+    devices = FakeDevices(12)
+    table = Fleet(devices, max_workers=2, page_size=2).snapshot()
+    assert len(table) == 11
+    # Page 3 was listed after some detail requests had been sent
+    assert dict(devices.pages)[3] > 0
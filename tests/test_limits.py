@@ -0,0 +1,51 @@
+import threading
+from mypos.limits import HostLimiter, RateLimiter
+from tests.conftest import FakeResponse
+
+
+def test_release_is_idempotent():
+    limiter = HostLimiter(max_concurrency=1)
+    release = limiter.acquire("https://api.example.test/x")
+    release()
+    release()
+    # A second release must not have added a slot
+    assert limiter.acquire("https://api.example.test/y")
+    second = threading.Thread(target=lambda: limiter.acquire("https://api.example.test/z"), daemon=True)
+    second.start()
+    second.join(0.1)
+    assert second.is_alive()
+
+
+def test_hosts_have_separate_slots():
+    limiter = HostLimiter(max_concurrency=1)
+    limiter.acquire("https://a.example.test/")
+    limiter.acquire("https://b.example.test/")
+
+
+def test_streamed_response_holds_the_slot_until_closed(client):
+    client.limiter = HostLimiter(max_concurrency=1)
+    client.responses = [FakeResponse(200, b'{"items": []}'), FakeResponse(200, b'{"items": []}')]
+    response = client.send("GET", "/stream", stream=True)
+    second = threading.Thread(target=lambda: client.send("GET", "/other"), daemon=True)
+    second.start()
+    second.join(0.1)
+    assert second.is_alive()
+    response.close()
+    second.join(1)
+    assert not second.is_alive()
+
+
+def test_failed_streamed_request_releases_the_slot(client):
+    client.limiter = HostLimiter(max_concurrency=1)
+    client.responses = [FakeResponse(500, b"error"), FakeResponse(200, b"{}")]
+    try:
+        client.send("GET", "/stream", stream=True)
+    except Exception:
+        pass
+    assert client.request("GET", "/x") == {}
+
+
+def test_rate_limiter_allows_a_burst():
+    limiter = RateLimiter(1000, burst=5)
+    for _ in range(5):
+        limiter.acquire()
@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+import pytest
+from mypos.transactions.mt940 import Entry, Statement, iter_entries, match_transactions, parse_mt940
+
+STATEMENT = """{1:F01MYPOSBGSFAXXX0000000000}{2:I940MYPOSBGSFXXXXN}{4:
+:20:STMT-2026-09-30
+:25:BG00MYPOS40100001
+:28C:273/1
+:60F:C260929EUR1000,00
+:61:2609300930C100,00NTRFINV/123//BANKREF1
+:86:/EREF/INV/123/REMI/Ride fees
+:61:2609300930D25,50NCHGNONREF
+:86:Monthly fee
+:62F:C260930EUR1074,50
+-}
+"""
+
+
+def test_statement_is_parsed_into_entries_and_totals():
+    records = list(parse_mt940(STATEMENT))
+    entries = [record for record in records if isinstance(record, Entry)]
+    [statement] = [record for record in records if isinstance(record, Statement)]
+    assert [entry.signed_amount for entry in entries] == [100.0, -25.5]
+    assert (statement.number, statement.sequence, statement.entries) == ("273", "1", 2)
+    assert statement.balanced
+
+
+def test_customer_reference_may_contain_slashes():
+    entry = next(iter_entries(STATEMENT))
+    assert (entry.customer_reference, entry.bank_reference) == ("INV/123", "BANKREF1")
+    assert entry.entry_date == "2026-09-30"
+    assert entry.fields == {"EREF": "INV/123", "REMI": "Ride fees"}
+
+
+def test_invalid_statement_line_raises():
+    with pytest.raises(ValueError, match="Invalid :61:"):
+        list(parse_mt940(STATEMENT.replace("C100,00NTRF", "C100,00")))
+
+
+def test_entries_match_transactions_by_reference():
+    transactions = [SimpleNamespace(payment_reference="BANKREF1")]
+    pairs = list(match_transactions(iter_entries(STATEMENT), transactions))
+    assert [transaction is not None for _, transaction in pairs] == [True, False]
+
+
+def test_empty_subfields_do_not_match_unsettled_transactions():
+    statement = STATEMENT.replace(":86:Monthly fee", ":86:166?00TRANSFER?20?21driver fee")
+    entry = list(iter_entries(statement))[1]
+    assert entry.fields == {"code": "166", "00": "TRANSFER", "20": "", "21": "driver fee"}
+    assert "" not in list(entry.references())
+    pairs = list(match_transactions([entry], [SimpleNamespace(payment_reference="")]))
+    assert pairs == [(entry, None)]
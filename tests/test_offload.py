@@ -0,0 +1,83 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import time
+from mypos.webhooks.offload import ProcessDispatcher
+from mypos.webhooks.receiver import WebhookDelivery
+from tests.test_payloads import Payment
+
+
+def amount_and_pid(delivery):
+    return delivery.event, delivery.payload.amount, os.getpid()
+
+
+def delivery(amount=10.0):
+    body = json.dumps({"event": "payment", "payload": {"amount": amount}}).encode()
+    return WebhookDelivery("payment", {"amount": amount}, body, {}, 0.0)
+
+
+def test_handler_runs_in_a_worker_process_on_the_raw_body():
+    pool = ProcessDispatcher(max_workers=1, interpreters=False)
+    try:
+        event, amount, pid = asyncio.run(pool.offload(amount_and_pid, model=Payment)(delivery()))
+    finally:
+        pool.shutdown()
+    assert (event, amount) == ("payment", 10.0)
+    assert pid != os.getpid()
+
+
+def test_pending_deliveries_are_bounded():
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow(delivery):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    async def run():
+        handler = pool.offload(slow)
+        await asyncio.gather(*(handler(delivery(i)) for i in range(10)))
+
+    pool = ProcessDispatcher(max_pending=2, executor=concurrent.futures.ThreadPoolExecutor(max_workers=8))
+    asyncio.run(run())
+    pool.shutdown()
+    assert peak[0] == 2
+
+
+class BrokenInterpreterPool(concurrent.futures.ThreadPoolExecutor):
+    """
+    An interpreter pool whose workers cannot import extension modules.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.set_exception(ImportError("module does not support loading in subinterpreters"))
+        return future
+
+
+def test_processes_are_the_default(monkeypatch):
+    monkeypatch.setattr("mypos.webhooks.offload._interpreter_pool", lambda: concurrent.futures.ThreadPoolExecutor)
+    pool = ProcessDispatcher(max_workers=1)
+    assert isinstance(pool.executor, concurrent.futures.ProcessPoolExecutor)
+    pool.shutdown()
+
+
+def test_interpreter_pool_falls_back_to_processes_when_workers_cannot_import(monkeypatch):
+    monkeypatch.setattr("mypos.webhooks.offload._interpreter_pool", lambda: concurrent.futures.ThreadPoolExecutor)
+    pool = ProcessDispatcher(max_workers=1, interpreters=True)
+    assert isinstance(pool.executor, concurrent.futures.ThreadPoolExecutor)
+    pool.shutdown()
+
+    monkeypatch.setattr("mypos.webhooks.offload._interpreter_pool", lambda: BrokenInterpreterPool)
+    pool = ProcessDispatcher(max_workers=1, interpreters=True)
+    try:
+        event, amount, _ = asyncio.run(pool.offload(amount_and_pid, model=Payment)(delivery()))
+        assert isinstance(pool.executor, concurrent.futures.ProcessPoolExecutor)
+    finally:
+        pool.shutdown()
+    assert (event, amount) == ("payment", 10.0)
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from mypos.devices.receipts import TransactionPoller
+from mypos.pagination import iter_newer
+
+
+class Listing:
+    """
+    Items served from a list in pages, counting the pages read.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.pages = 0
+
+    def __iter__(self):
+        for i, item in enumerate(self.items):
+            if i % 2 == 0:
+                self.pages += 1
+            yield item
+
+
+def test_newest_first_listing_stops_at_the_cutoff():
+    listing = Listing([9, 8, 7, 6, 5, 4, 3, 2, 1])
+    assert list(iter_newer(listing, lambda d: d, 6, sample=2)) == [9, 8, 7, 6]
+    assert listing.pages == 3
+
+
+def test_oldest_first_listing_is_filtered_to_the_end():
+    listing = Listing([1, 2, 3, 4, 5, 6, 7, 8, 9])
+    assert list(iter_newer(listing, lambda d: d, 6, sample=2)) == [6, 7, 8, 9]
+
+
+def test_order_is_checked_on_the_first_page_before_stopping():
+    assert list(iter_newer([1, 9, 8], lambda d: d, 5, sample=3)) == [9, 8]
+
+
+def test_undated_items_are_kept():
+    assert list(iter_newer([3, None, 1], lambda d: d, 2, sample=1)) == [3, None]
+
+
+class FakeDevices:
+    def __init__(self, dates):
+        self.dates = dates
+
+    def list_transactions(self, page, size, from_date=None, terminal_id=None):
+        transactions = [SimpleNamespace(date=d, payment_reference=d, terminal_id="T1", stan="1") for d in self.dates]
+        items = transactions[(page - 1) * size:page * size]
+        return SimpleNamespace(transactions=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(transactions)))
+
+
+def test_poller_reads_oldest_first_listings_without_missing_transactions():
+    devices = FakeDevices(["2026-10-19 08:00:00", "2026-10-19 09:00:00"])
+    poller = TransactionPoller(devices, page_size=1)
+    poller.watermark = "2026-10-19 08:30:00"
+    devices.dates = ["2026-10-19 08:00:00", "2026-10-19 09:00:00", "2026-10-19 10:00:00"]
+    assert [t.date for t in poller.poll()] == ["2026-10-19 09:00:00", "2026-10-19 10:00:00"]
+    assert poller.poll() == []
+    assert poller.watermark == "2026-10-19 10:00:00"
+
+
+def test_poller_stops_paging_on_newest_first_listings():
+    devices = FakeDevices(["2026-10-19 10:00:00", "2026-10-19 09:00:00", "2026-10-19 08:00:00"])
+    poller = TransactionPoller(devices, page_size=1)
+    poller.watermark = "2026-10-19 08:30:00"
+    assert [t.date for t in poller.poll()] == ["2026-10-19 10:00:00", "2026-10-19 09:00:00"]
@@ -0,0 +1,42 @@
+import copy
+import pickle
+import pytest
+from pydantic import ValidationError
+from mypos.webhooks.payloads import EventPayload, LazyPayload, PayloadRegistry
+
+
+class Payment(EventPayload):
+    amount: float
+
+
+def test_payload_is_validated_on_first_field_access():
+    payload = LazyPayload(Payment, {"amount": "10.5", "extra": 1})
+    assert payload["amount"] == "10.5"
+    assert not payload.validated
+    assert payload.amount == 10.5
+    assert payload.value.extra == 1
+    assert payload.validated
+
+
+def test_validation_errors_are_raised_on_access():
+    payload = LazyPayload(Payment, b'{"amount": "many"}')
+    with pytest.raises(ValidationError):
+        payload.amount
+
+
+def test_pickle_and_copy_round_trip():
+    payload = LazyPayload(Payment, {"amount": 10})
+    for restored in (pickle.loads(pickle.dumps(payload)), copy.copy(payload), copy.deepcopy(payload)):
+        assert restored.raw == {"amount": 10}
+        assert restored.amount == 10
+
+
+def test_private_names_are_not_model_fields():
+    with pytest.raises(AttributeError):
+        LazyPayload(Payment, {"amount": 10})._missing
+
+
+def test_registry_wraps_registered_events_only():
+    payloads = PayloadRegistry({"payment": Payment})
+    assert isinstance(payloads.wrap("payment", {"amount": 1}), LazyPayload)
+    assert payloads.wrap("other", {"amount": 1}) == {"amount": 1}
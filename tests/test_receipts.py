@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+from mypos.devices.receipts import ReceiptPrefetcher, TransactionPoller
+
+
+def transaction(date, stan, payment_reference=""):
+    return SimpleNamespace(date=date, stan=stan, terminal_id="T1", payment_reference=payment_reference)
+
+
+class FakeDevices:
+    """
+    Serves `transactions` newest first, recording the `from_date` of every read.
+    """
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.from_dates = []
+        self.receipts = []
+
+    def list_transactions(self, page, size, from_date=None, terminal_id=None):
+        self.from_dates.append(from_date)
+        listed = sorted((t for t in self.transactions if t.date[:10] >= from_date), key=lambda t: t.date, reverse=True)
+        items = listed[(page - 1) * size:page * size]
+        return SimpleNamespace(transactions=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(listed)))
+
+    def get_receipt_details(self, payment_reference):
+        self.receipts.append(payment_reference)
+        return SimpleNamespace(payment_reference=payment_reference)
+
+
+def test_unsettled_transactions_are_returned_again_once_settled():
+    devices = FakeDevices([transaction("2026-10-18 09:00:00", "1"), transaction("2026-10-19 08:00:00", "2", "P2")])
+    poller = TransactionPoller(devices, page_size=10)
+    poller.watermark = "2026-10-18 00:00:00"
+    assert [t.stan for t in poller.poll()] == ["2", "1"]
+    assert poller.pending == 1
+
+    # The watermark moved to the next day, the pending transaction is still read
+    assert poller.poll() == []
+    devices.transactions[0] = transaction("2026-10-18 09:00:00", "1", "P1")
+    assert [t.payment_reference for t in poller.poll()] == ["P1"]
+    assert devices.from_dates[-1] == "2026-10-18"
+    assert poller.pending == 0
+    assert poller.poll() == []
+    assert devices.from_dates[-1] == "2026-10-19"
+
+
+def test_pending_transactions_are_given_up_after_pending_days():
+    devices = FakeDevices([transaction("2026-10-10 09:00:00", "1"), transaction("2026-10-19 08:00:00", "2")])
+    poller = TransactionPoller(devices, page_size=10, pending_days=3)
+    poller.watermark = "2026-10-10 00:00:00"
+    poller.poll()
+    assert poller.pending == 2
+    poller.poll()
+    assert poller.pending == 1
+
+
+def test_prefetcher_gets_receipts_of_transactions_settled_after_the_first_poll():
+    devices = FakeDevices([transaction("2026-10-19 09:00:00", "1")])
+    poller = TransactionPoller(devices, page_size=10)
+    poller.watermark = "2026-10-19 00:00:00"
+    with ReceiptPrefetcher(devices, max_workers=1) as prefetcher:
+        prefetcher.feed_transactions(poller.poll())
+        devices.transactions[0] = transaction("2026-10-19 09:00:00", "1", "P1")
+        prefetcher.feed_transactions(poller.poll())
+    assert devices.receipts == ["P1"]
+    assert "P1" in prefetcher.cache
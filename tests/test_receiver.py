@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from mypos.webhooks.receiver import WebhookReceiver
+
+SECRET = "whsec_test"
+
+
+def signed(body: bytes, secret: str = SECRET) -> dict:
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return {"X-myPOS-Signature": f"t={timestamp},v1={signature}"}
+
+
+def accept(receiver: WebhookReceiver, body: bytes, headers: dict) -> int:
+    async def run():
+        try:
+            status = await receiver.accept(body, headers)
+            await receiver.join()
+            return status
+        finally:
+            await receiver.stop()
+
+    return asyncio.run(run())
+
+
+def test_signed_notification_is_dispatched():
+    receiver = WebhookReceiver(SECRET)
+    seen = []
+    receiver.on("payment.completed", raw=True)(lambda delivery: seen.append(delivery.payload))
+    body = json.dumps({"event": "payment.completed", "payload": {"amount": 10}}).encode()
+    assert accept(receiver, body, signed(body)) == 200
+    assert seen == [{"amount": 10}]
+
+
+def test_invalid_json_is_rejected_with_400():
+    receiver = WebhookReceiver(SECRET)
+    body = b'{"event": "payment.completed", '
+    assert accept(receiver, body, signed(body)) == 400
+    assert receiver.stats["rejected"] == 1
+
+
+def post(receiver: WebhookReceiver, chunks: list, headers: dict) -> tuple:
+    """
+    Send a POST to the receiver as an ASGI server would, returning the status and the number of chunks read.
+    """
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1} for i, chunk in enumerate(chunks)]
+    read = []
+    sent = []
+
+    async def receive():
+        read.append(messages[len(read)])
+        return read[-1]
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        scope = {"type": "http", "method": "POST", "path": "/", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]}
+        try:
+            await receiver(scope, receive, send)
+        finally:
+            await receiver.stop()
+
+    asyncio.run(run())
+    return sent[0]["status"], len(read)
+
+
+def test_bodies_over_max_body_are_refused_without_reading_them():
+    receiver = WebhookReceiver(SECRET, max_body=10)
+    assert post(receiver, [b"x" * 8] * 4, {}) == (413, 2)
+    assert post(receiver, [b"x" * 8], {"Content-Length": "32"}) == (413, 0)
+    assert receiver.stats["too_large"] == 2
+
+    body = json.dumps({"event": "ping"}).encode()
+    receiver = WebhookReceiver(SECRET, max_body=len(body))
+    assert post(receiver, [body[:5], body[5:]], signed(body)) == (200, 2)
@@ -0,0 +1,52 @@
+import json
+from types import SimpleNamespace
+from mypos.webhooks.reconcile import ChangeAction, WebhookReconciler, WebhookSpec, reconcile_accounts
+from mypos.webhooks.v1 import WebhooksV1
+from tests.conftest import FakeResponse
+
+HOOK = {"id": "w1", "created_on": "2026-10-19", "is_active": True, "payload_url": "https://example.com/mypos", "secret": "s"}
+
+
+def subscription(filter=None):
+    return {"id": "s1", "created_on": "2026-10-19", "event": "transaction", "filter": filter, "hook": HOOK}
+
+
+def test_removing_a_filter_sends_an_empty_one(client):
+    client.responses = [FakeResponse(200, json.dumps({"subscription": subscription()}).encode())]
+    WebhooksV1(client).update_subscription("s1", filter={})
+    assert client.sent[0][3]["data"] == {"filter": "{}"}
+
+
+def test_no_filter_leaves_it_unchanged(client):
+    client.responses = [FakeResponse(200, json.dumps({"subscription": subscription()}).encode())]
+    WebhooksV1(client).update_subscription("s1")
+    assert client.sent[0][3]["data"] == {}
+
+
+def test_reconciler_clears_a_filter_the_spec_dropped(client):
+    reconciler = WebhookReconciler(WebhooksV1(client), [WebhookSpec(HOOK["payload_url"], "s", {"transaction": None})])
+    webhook = SimpleNamespace(**HOOK)
+    current = SimpleNamespace(id="s1", event="transaction", filter={"tids": ["90004889"]}, hook=webhook)
+    events = [SimpleNamespace(name="transaction", id="e1")]
+    [change] = reconciler.diff([webhook], [current], events)
+    assert change.action is ChangeAction.UPDATE_SUBSCRIPTION
+
+    client.responses = [FakeResponse(200, json.dumps({"subscription": subscription()}).encode())]
+    result = reconciler.apply([change])
+    assert result.ok
+    assert client.sent[0][3]["data"] == {"filter": "{}"}
+
+
+class UnreachableWebhooks:
+    def list(self, *args, **kwargs):
+        raise ConnectionError("unreachable")
+
+    list_subscriptions = list_events = list
+
+
+def test_account_that_cannot_be_listed_reports_its_error():
+    results = reconcile_accounts({"fleet": (UnreachableWebhooks(), [WebhookSpec(HOOK["payload_url"], "s", {"transaction": None})])})
+    result = results["fleet"]
+    assert not result.ok
+    assert result.errors == []
+    assert isinstance(result.error, ConnectionError)
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+import pytest
+from mypos.reconciliation import Reconciler, ReconciliationStatus
+
+
+def ledger(reference, terminal="T1", amount=10.0, currency="EUR", reference_number=None):
+    return SimpleNamespace(
+        payment_reference=reference, terminal_id=terminal, reference_number=reference_number,
+        original_amount=amount, original_currency=currency, date="2025-01-01 10:00:00",
+    )
+
+
+def device(reference, terminal="T1", amount=10.0, currency="EUR", reference_number=None, settled=True):
+    return SimpleNamespace(
+        payment_reference=reference, terminal_id=terminal, reference_number=reference_number,
+        amount=amount, currency=currency, date="2025-01-01 10:00:00",
+        settlement_date="2025-01-02 00:00:00" if settled else "",
+    )
+
+
+LEDGER = [
+    ledger("PR1"),
+    ledger("PR2", amount=11.0),
+    ledger("PR3"),
+    ledger("", terminal="T2", reference_number="RIDE-1"),
+    ledger("PR5"),
+    ledger("PR7", terminal=""),
+]
+DEVICE = [
+    device("PR1"),
+    device("PR2"),
+    device(None, terminal="T2", reference_number="RIDE-1"),
+    device("PR4"),
+    device(None, terminal="T3", settled=False),
+    device("PR5", settled=False),
+]
+EXPECTED = {
+    ReconciliationStatus.MATCHED: 2,
+    ReconciliationStatus.AMOUNT_MISMATCH: 1,
+    ReconciliationStatus.MISSING_ON_DEVICE: 1,
+    ReconciliationStatus.MISSING_IN_LEDGER: 1,
+    ReconciliationStatus.UNSETTLED: 2,
+}
+
+
+@pytest.mark.parametrize("max_rows", [500_000, 1])
+def test_reconcile_classifies_rows_in_memory_and_spilled(max_rows, tmp_path):
+    reconciler = Reconciler(max_rows=max_rows, partitions=4, spill_dir=str(tmp_path))
+    results = list(reconciler.reconcile(LEDGER, DEVICE))
+    counts = {status: sum(1 for r in results if r.status is status) for status in ReconciliationStatus}
+    assert counts == EXPECTED
+    assert reconciler.summary[ReconciliationStatus.MATCHED.value] == 2
+
+
+def test_matched_but_unsettled_device_row_is_unsettled():
+    results = list(Reconciler().reconcile([ledger("PR5")], [device("PR5", settled=False)]))
+    assert [(r.status, r.ledger.payment_reference, r.device.payment_reference) for r in results] == [
+        (ReconciliationStatus.UNSETTLED, "PR5", "PR5")
+    ]
+
+
+def test_amount_within_tolerance_matches():
+    results = list(Reconciler(amount_tolerance=0.01).reconcile([ledger("PR1", amount=10.004)], [device("PR1")]))
+    assert results[0].status is ReconciliationStatus.MATCHED
@@ -0,0 +1,47 @@
+import dataclasses
+import json
+import pytest
+from mypos.records import DeviceTransactionRecord, TransactionRecord, iter_device_transaction_records
+from mypos.schemas import DeviceTransaction, ReferenceNumberType, TransactionType
+
+TRANSACTION = {
+    "id": 7, "payment_reference": "PR-1", "transaction_type": "001", "transaction_amount": "12.5",
+    "transaction_currency": "EUR", "original_amount": 12.5, "original_currency": "EUR", "sign": "D",
+    "date": "2026-10-19 10:00:00", "reference_number_type": 2, "terminal_id": "T1",
+}
+
+DEVICE_TRANSACTION = {
+    "terminal_id": "T1", "terminal_name": "Car 1", "outlet_name": "Sofia", "amount": 10.0, "currency": "EUR",
+    "fee": 0.2, "pan": "1234", "card_scheme": "VISA", "rrn": "R1", "stan": "000123", "date": "2026-10-19 10:00:00",
+    "settlement_date": "", "settlement_amount": "", "settlement_currency": "EUR", "tran_status": "approved",
+    "payment_status": "paid", "payment_reference": "",
+}
+
+
+def test_transaction_record_converts_types():
+    record = TransactionRecord.from_dict(TRANSACTION)
+    assert record.transaction_type is TransactionType.FEE
+    assert record.reference_number_type is ReferenceNumberType.INVOICE_NUMBER
+    assert record.transaction_amount == 12.5
+    assert record.parsed_date.hour == 10
+    assert record.to_model().payment_reference == "PR-1"
+
+
+def test_records_are_immutable_and_compact():
+    record = DeviceTransactionRecord.from_dict(DEVICE_TRANSACTION)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.amount = 0
+    assert not hasattr(record, "__dict__")
+
+
+def test_low_cardinality_strings_are_interned():
+    raw = json.dumps(DEVICE_TRANSACTION).encode()
+    first, second = iter_device_transaction_records([raw, raw])
+    assert first.currency is second.currency
+    assert first.terminal_name is second.terminal_name
+    assert first.parsed_settlement_date is None
+
+
+def test_device_record_round_trips_through_the_model():
+    model = DeviceTransaction(**DEVICE_TRANSACTION)
+    assert DeviceTransactionRecord.from_model(model).to_model() == model
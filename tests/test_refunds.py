@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+import niquests
+from mypos.base import APIError
+from mypos.devices.refunds import BatchRefunder, RefundItem, RefundStatus
+from mypos.journal import Journal
+
+
+def transaction(reference_number, amount=10.0):
+    return SimpleNamespace(reference_number=reference_number, amount=amount, currency="EUR")
+
+
+class FakeDevices:
+    """
+    One terminal whose transactions are served `size` per page, and whose
+    refunds answer with the queued errors, then succeed.
+    """
+
+    def __init__(self, transactions, errors=()):
+        self.transactions = transactions
+        self.errors = list(errors)
+        self.refunds = []
+
+    def list_device_transactions(self, terminal_id, page, size, reference_number=None):
+        matching = [t for t in self.transactions if t.reference_number == reference_number or t.reference_number.startswith("other")]
+        items = matching[(page - 1) * size:page * size]
+        return SimpleNamespace(transactions=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(matching)))
+
+    def refund(self, terminal_id, reference_number, amount):
+        self.refunds.append((terminal_id, reference_number, amount))
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+def test_server_error_is_in_doubt_and_not_resubmitted(tmp_path):
+    devices = FakeDevices([transaction("R1")], errors=[APIError("Request failed: bad gateway", 502)])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"))
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.IN_DOUBT
+
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.IN_DOUBT
+    assert len(devices.refunds) == 1
+
+
+def test_connection_and_unknown_errors_are_in_doubt(tmp_path):
+    devices = FakeDevices([transaction("R1"), transaction("R2")], errors=[niquests.exceptions.ConnectionError("reset"), RuntimeError("boom")])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"), max_workers=1)
+    results = refunder.run([RefundItem("T1", "R1", 5.0), RefundItem("T1", "R2", 5.0)])
+    assert [result.status for result in results] == [RefundStatus.IN_DOUBT, RefundStatus.IN_DOUBT]
+
+
+def test_client_error_is_failed_and_can_be_retried(tmp_path):
+    devices = FakeDevices([transaction("R1")], errors=[APIError("Request failed: invalid amount", 400)])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"))
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.FAILED
+
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.REFUNDED
+    assert len(devices.refunds) == 2
+
+
+def test_original_is_found_past_the_first_page(tmp_path):
+    others = [transaction(f"other-{i}") for i in range(150)]
+    devices = FakeDevices([*others, transaction("R1")])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"))
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.REFUNDED
+    assert result.original.reference_number == "R1"
+
+
+def test_refunds_may_not_exceed_the_original_amount(tmp_path):
+    devices = FakeDevices([transaction("R1", 10.0)])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"))
+    results = refunder.run([RefundItem("T1", "R1", 6.0, "a"), RefundItem("T1", "R1", 6.0, "b")])
+    assert [result.status for result in results] == [RefundStatus.REFUNDED, RefundStatus.REJECTED]
+
+
+class FailingJournal(Journal):
+    """
+    A journal that cannot record outcomes.
+    """
+
+    def append(self, record):
+        if record["state"] != "intent":
+            raise OSError("disk full")
+        super().append(record)
+
+
+def test_refund_whose_outcome_cannot_be_journaled_is_in_doubt(tmp_path):
+    devices = FakeDevices([transaction("R1")])
+    refunder = BatchRefunder(devices, FailingJournal(str(tmp_path / "refunds.journal")))
+    [result] = refunder.run([RefundItem("T1", "R1", 5.0)])
+    assert result.status is RefundStatus.IN_DOUBT
+    assert len(devices.refunds) == 1
+
+
+def test_results_follow_input_order_for_identical_items(tmp_path):
+    devices = FakeDevices([transaction("R1"), transaction("R2")])
+    refunder = BatchRefunder(devices, str(tmp_path / "refunds.journal"))
+    item = RefundItem("T1", "R1", 5.0)
+    results = refunder.run([item, RefundItem("T1", "R2", 5.0), item])
+    assert [(result.item.reference_number, result.status) for result in results] == [
+        ("R1", RefundStatus.REFUNDED), ("R2", RefundStatus.REFUNDED), ("R1", RefundStatus.REJECTED),
+    ]
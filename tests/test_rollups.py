@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+import pytest
+from mypos.rollups import RollupStore
+
+
+def sale(stan="000123", payment_reference=None, amount=10.0, day="2026-10-19"):
+    return SimpleNamespace(
+        terminal_id="T1", stan=stan, date=f"{day} 10:00:00", payment_reference=payment_reference,
+        amount=amount, fee=0.2, currency="EUR",
+    )
+
+
+def test_a_sale_is_counted_once_before_and_after_it_settles():
+    store = RollupStore()
+    assert store.add([sale()]) == 1
+    assert store.add([sale(payment_reference="PR-1")]) == 0
+    [row] = store.daily_revenue()
+    assert (row.count, row.net) == (1, 10.0)
+
+
+def test_refunds_are_netted_and_dimensions_validated():
+    store = RollupStore()
+    store.add([sale(), sale(stan="000124", amount=-4.0), sale(stan="000125", day="2026-10-20")])
+    rows = store.query(by=("day",), source="device")
+    assert [(row.day, row.count, row.net) for row in rows] == [("2026-10-19", 2, 6.0), ("2026-10-20", 1, 10.0)]
+    with pytest.raises(ValueError):
+        store.query(by=("merchant",))
+
+
+def test_pruned_days_are_forgotten():
+    store = RollupStore()
+    store.add([sale(day="2026-10-01"), sale(day="2026-10-19")])
+    assert store.prune("2026-10-10") == 1
+    assert store.add([sale(day="2026-10-19")]) == 0
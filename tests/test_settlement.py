@@ -0,0 +1,70 @@
+from datetime import datetime
+from types import SimpleNamespace
+from mypos.devices.settlement import SettlementEventType, SettlementTracker
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def transaction(day, stan, settlement_date=None, tran_status="approved"):
+    date = f"{day} 10:00:00"
+    return SimpleNamespace(
+        terminal_id="T1", rrn="R", stan=stan, date=date, amount=10.0, currency="EUR",
+        tran_status=tran_status, payment_status="paid", settlement_date=settlement_date,
+        parsed_date=datetime.fromisoformat(date),
+        parsed_settlement_date=datetime.fromisoformat(settlement_date) if settlement_date else None,
+    )
+
+
+class FakeDevices:
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.windows = []
+
+    def stream_transactions(self, page, size, from_date, to_date, terminal_id=None):
+        self.windows.append((from_date, to_date))
+        items = [t for t in self.transactions if from_date <= t.date[:10] <= to_date]
+        return SimpleNamespace(transactions=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(items)))
+
+
+def tracker(devices, **kwargs):
+    tracker = SettlementTracker(devices, clock=lambda: NOW, **kwargs)
+    # The API streams pages, the fake returns plain ones
+    tracker._read = lambda from_date, to_date, terminal_id=None: devices.stream_transactions(1, 1000, from_date, to_date).transactions
+    return tracker
+
+
+def test_windows_merge_consecutive_days_and_gaps_up_to_max_gap_days():
+    days = ["2026-10-01", "2026-10-02", "2026-10-04", "2026-10-08"]
+    devices = FakeDevices([transaction(day, str(i)) for i, day in enumerate(days)])
+    assert tracker(devices).windows() == []
+    strict = tracker(devices)
+    strict.ingest(devices.transactions)
+    assert strict.windows() == [("2026-10-01", "2026-10-02"), ("2026-10-04", "2026-10-04"), ("2026-10-08", "2026-10-08")]
+    loose = tracker(devices, max_gap_days=1)
+    loose.ingest(devices.transactions)
+    assert loose.windows() == [("2026-10-01", "2026-10-04"), ("2026-10-08", "2026-10-08")]
+
+
+def test_refresh_reports_settlements_and_status_changes():
+    devices = FakeDevices([transaction("2026-10-18", "1"), transaction("2026-10-18", "2")])
+    settlement = tracker(devices)
+    settlement.ingest(devices.transactions)
+    devices.transactions = [
+        transaction("2026-10-18", "1", settlement_date="2026-10-19 06:00:00"),
+        transaction("2026-10-18", "2", tran_status="reversed"),
+    ]
+    events = {event.type for event in settlement.refresh()}
+    assert events == {SettlementEventType.SETTLED, SettlementEventType.STATUS_CHANGED}
+    assert settlement.metrics().open_count == 1
+    assert settlement.settled_count == 1
+
+
+def test_transactions_open_too_long_expire():
+    devices = FakeDevices([transaction("2026-08-01", "1"), transaction("2026-10-18", "2")])
+    settlement = tracker(devices, max_open_days=30)
+    settlement.ingest(devices.transactions)
+    events = settlement.refresh()
+    assert [event.type for event in events] == [SettlementEventType.EXPIRED]
+    assert events[0].previous.date == "2026-08-01 10:00:00"
+    assert devices.windows == [("2026-10-18", "2026-10-18")]
+    assert settlement.expired_count == 1
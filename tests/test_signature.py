@@ -0,0 +1,45 @@
+import time
+import pytest
+from mypos.webhooks.receiver import WebhookReceiver
+from mypos.webhooks.signature import SignatureVerifier, parse_signature_header
+from tests.test_receiver import SECRET, accept, signed
+
+BODY = b'{"event": "payment.completed", "payload": {"amount": 10}}'
+
+
+def test_valid_signature_and_whitespace_normalisation():
+    verifier = SignatureVerifier(SECRET)
+    assert verifier.verify(BODY, signed(BODY))
+    compact = b'{"event":"payment.completed","payload":{"amount":10}}'
+    assert verifier.verify(BODY, signed(compact))
+    assert not verifier.verify(BODY, signed(BODY, "other"))
+
+
+def test_rotated_secrets_are_accepted():
+    verifier = SignatureVerifier(["new", SECRET])
+    assert verifier.verify(BODY, signed(BODY))
+    verifier.remove_secret(SECRET)
+    assert not verifier.verify(BODY, signed(BODY))
+
+
+@pytest.mark.parametrize("header", [
+    "",
+    "t=abc,v1=00",
+    f"t={int(time.time())}",
+    f"t={int(time.time())},v1=é" + "0" * 63,
+    f"t={int(time.time())},v1=☃",
+    f"t={int(time.time()) - 3600},v1=00",
+    b"t=1,v1=\xff\xfe",
+])
+def test_malformed_headers_are_rejected(header):
+    assert not SignatureVerifier(SECRET).verify(BODY, {"X-myPOS-Signature": header})
+
+
+def test_non_ascii_signature_answers_401():
+    receiver = WebhookReceiver(SECRET)
+    header = f"t={int(time.time())},v1=éé"
+    assert accept(receiver, BODY, {"X-myPOS-Signature": header}) == 401
+
+
+def test_parse_signature_header_collects_every_signature():
+    assert parse_signature_header("t=5, v1=aa ,v1=bb,v0=cc") == (5, ["aa", "bb"])
@@ -0,0 +1,53 @@
+import os
+from mypos.transactions.statements import StatementDownloader, StatementJob, StatementStatus, date_range
+
+
+class FakeTransactions:
+    """
+    Writes a small statement per call, failing for the given account numbers.
+    """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def download_mt940_statement(self, document_type, date, account_number, path):
+        self.calls.append((account_number, date, document_type))
+        if account_number in self.failing:
+            raise RuntimeError("unavailable")
+        content = f":20:{account_number}-{date}\n".encode()
+        with open(path, "wb") as f:
+            f.write(content)
+        return len(content)
+
+
+def test_date_range_includes_both_ends():
+    assert date_range("2026-09-29", "2026-10-01") == ["2026-09-29", "2026-09-30", "2026-10-01"]
+    assert date_range("2026-10-01", "2026-09-30") == []
+
+
+def test_files_are_named_by_account_date_and_format(tmp_path):
+    downloader = StatementDownloader(FakeTransactions(), str(tmp_path))
+    jobs = list(downloader.jobs(["A", "B"], ["2026-10-01"], document_types=[1, 2]))
+    assert jobs == [StatementJob("A", "2026-10-01", 1), StatementJob("A", "2026-10-01", 2), StatementJob("B", "2026-10-01", 1), StatementJob("B", "2026-10-01", 2)]
+    assert downloader.path(jobs[1]) == os.path.join(str(tmp_path), "A/2026-10-01.structured.sta")
+
+
+def test_existing_statements_are_skipped_and_failures_reported(tmp_path):
+    transactions = FakeTransactions(failing=["B"])
+    downloader = StatementDownloader(transactions, str(tmp_path), max_workers=2)
+    os.makedirs(tmp_path / "A")
+    (tmp_path / "A" / "2026-10-01.swift.sta").write_bytes(b"old")
+
+    results = list(downloader.run("2026-10-01", "2026-10-02", account_numbers=["A", "B"]))
+    statuses = {(r.job.account_number, r.job.date): r.status for r in results}
+    assert statuses == {
+        ("A", "2026-10-01"): StatementStatus.EXISTS,
+        ("A", "2026-10-02"): StatementStatus.DOWNLOADED,
+        ("B", "2026-10-01"): StatementStatus.FAILED,
+        ("B", "2026-10-02"): StatementStatus.FAILED,
+    }
+    assert ("A", "2026-10-01", 1) not in transactions.calls
+    downloaded = next(r for r in results if r.status is StatementStatus.DOWNLOADED)
+    assert downloaded.size == os.path.getsize(downloaded.path)
+    assert all(r.message == "unavailable" for r in results if r.status is StatementStatus.FAILED)
@@ -0,0 +1,76 @@
+import json
+import pytest
+from mypos.schemas import DeviceTransaction
+from mypos.streaming import JSONArrayScanner, StreamedPage, iter_array
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, chunk_size: int) -> None:
+        self.body = body
+        self.chunk = chunk_size
+        self.closed = False
+
+    def iter_content(self, chunk_size: int):
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i:i + self.chunk]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def chunks(body: bytes, size: int):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+DOCUMENT = {
+    "pagination": {"page": 1, "page_size": 3, "total": 7},
+    "transactions": [
+        {"id": 1, "note": "brackets ] } [ { inside", "nested": {"a": [1, 2, {"b": "]"}]}},
+        {"id": 2, "note": "escaped \" quote and \\ backslash"},
+        {"id": 3, "list": [], "empty": {}},
+    ],
+    "after": {"transactions": ["not", "the", "array"]},
+}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_scanner_yields_every_element_for_any_chunking(size):
+    body = json.dumps(DOCUMENT).encode()
+    scanner = JSONArrayScanner("transactions")
+    items = [json.loads(raw) for chunk in chunks(body, size) for raw in scanner.feed(chunk)]
+    assert items == DOCUMENT["transactions"]
+    skeleton = json.loads(scanner.skeleton())
+    assert skeleton["transactions"] == []
+    assert skeleton["pagination"] == DOCUMENT["pagination"]
+    assert skeleton["after"] == DOCUMENT["after"]
+
+
+def test_scanner_ignores_key_inside_nested_objects():
+    body = json.dumps({"meta": {"items": [9]}, "items": [{"x": 1}]}).encode()
+    assert [json.loads(raw) for raw in iter_array(chunks(body, 5), "items")] == [{"x": 1}]
+
+
+def test_skeleton_of_unterminated_array_raises():
+    scanner = JSONArrayScanner("items")
+    scanner.feed(b'{"items": [{"a": 1}, {"b"')
+    with pytest.raises(ValueError):
+        scanner.skeleton()
+
+
+def test_streamed_page_validates_records_and_exposes_pagination():
+    record = {
+        "terminal_id": "90000001", "terminal_name": "Car 1", "outlet_name": "Sofia", "amount": 12.5,
+        "currency": "EUR", "fee": 0.2, "pan": "1234", "card_scheme": "VISA", "rrn": "1", "stan": "2",
+        "date": "2025-01-01 10:00:00", "settlement_date": "", "settlement_amount": "12.5",
+        "settlement_currency": "EUR", "tran_status": "ok", "payment_status": "ok", "payment_reference": "PR1",
+    }
+    body = json.dumps({"transactions": [record, record], "pagination": {"page": 1, "page_size": 2, "total": 2}}).encode()
+    response = FakeResponse(body, 17)
+    page = StreamedPage(response, "transactions", DeviceTransaction)
+    records = list(page)
+    assert [r.amount for r in records] == [12.5, 12.5]
+    assert page.count == 2
+    assert page.pagination.total == 2
+    assert response.closed
+    with pytest.raises(ValueError):
+        list(page)
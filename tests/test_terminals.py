@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+from mypos.devices.terminals import MultiTerminalFetch
+
+
+def transaction(terminal_id, hour):
+    return SimpleNamespace(terminal_id=terminal_id, date=f"2026-10-19 {hour:02d}:00:00")
+
+
+class FakeDevices:
+    """
+    Terminals whose transactions are listed newest first, `size` per page.
+    """
+
+    def __init__(self, hours, failing=()):
+        self.transactions = {
+            terminal_id: [transaction(terminal_id, hour) for hour in sorted(hours_of, reverse=True)]
+            for terminal_id, hours_of in hours.items()
+        }
+        self.failing = set(failing)
+
+    def list_device_transactions(self, terminal_id, page, size, **filters):
+        if terminal_id in self.failing:
+            raise Exception("Request failed: terminal not found")
+        items = self.transactions[terminal_id][(page - 1) * size:page * size]
+        return SimpleNamespace(transactions=items, pagination=SimpleNamespace(page=page, page_size=size, size=None, total=len(self.transactions[terminal_id])))
+
+
+def test_terminals_are_merged_newest_first():
+    devices = FakeDevices({"T1": [1, 5, 9, 13], "T2": [2, 3, 11], "T3": []})
+    fetch = MultiTerminalFetch(devices, max_workers=2, page_size=2)
+    dates = [t.date[11:13] for t in fetch.fetch(["T1", "T2", "T3"])]
+    assert dates == ["13", "11", "09", "05", "03", "02", "01"]
+    assert fetch.stats["T1"].pages == 2
+    assert all(stats.done for stats in fetch.stats.values())
+
+
+def test_oldest_first_merge():
+    devices = FakeDevices({"T1": [4, 1], "T2": [3, 2]})
+    devices.transactions = {terminal_id: items[::-1] for terminal_id, items in devices.transactions.items()}
+    fetch = MultiTerminalFetch(devices, max_workers=2, page_size=1)
+    assert [t.date[11:13] for t in fetch.fetch(["T1", "T2"], descending=False)] == ["01", "02", "03", "04"]
+
+
+def test_failed_terminal_does_not_stop_the_fetch():
+    devices = FakeDevices({"T1": [1, 2], "T2": [3]}, failing=["T2"])
+    progress = []
+    fetch = MultiTerminalFetch(devices, max_workers=2, page_size=1, progress=progress.append)
+    assert len(list(fetch.fetch(["T1", "T2"], ordered=False))) == 2
+    assert fetch.stats["T2"].error is not None
+    assert progress[-1].terminals_done == 2
@@ -0,0 +1,55 @@
+import json
+from datetime import datetime, timedelta
+from mypos.schemas import PaymentRequest, PaymentRequestStatus
+from mypos.streaming import StreamedPage
+from mypos.transactions.watcher import PaymentRequestWatcher
+from tests.conftest import FakeResponse
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def request(code, status, added_on="2026-10-18 09:00:00"):
+    return {
+        "code": code, "url": f"https://pay.example/{code}", "added_on": added_on, "client_name": "Client",
+        "amount": 10.0, "currency": "EUR", "reason": "Ride", "booking_text": "Ride", "status": int(status),
+    }
+
+
+class FakeTransactions:
+    def __init__(self, requests):
+        self.requests = requests
+        self.queries = []
+
+    def stream_payment_requests(self, page, size, status, from_date, to_date):
+        self.queries.append((status, from_date, to_date))
+        items = [r for r in self.requests if r["status"] == status]
+        body = json.dumps({"items": items, "pagination": {"page": page, "page_size": size, "total": len(items)}})
+        return StreamedPage(FakeResponse(200, body.encode()), "items", PaymentRequest)
+
+
+def test_untracked_added_on_defaults_to_now():
+    transactions = FakeTransactions([])
+    watcher = PaymentRequestWatcher(transactions, clock=lambda: NOW)
+    watcher.track("A", added_on="2026-10-10 08:00:00")
+    watcher.track("B")
+    assert watcher.requests["B"].added_on == NOW
+    watcher.refresh()
+    assert {(from_date, to_date) for _, from_date, to_date in transactions.queries} == {("2026-10-10", "2026-10-19")}
+
+
+def test_final_statuses_are_emitted_and_untracked():
+    transactions = FakeTransactions([request("A", PaymentRequestStatus.PAID), request("B", PaymentRequestStatus.SEEN)])
+    watcher = PaymentRequestWatcher(transactions, clock=lambda: NOW)
+    watcher.track("A", added_on="2026-10-18 09:00:00")
+    watcher.track("B", added_on="2026-10-18 09:00:00")
+    events = {event.code: event.current for event in watcher.refresh()}
+    assert events == {"A": PaymentRequestStatus.PAID, "B": PaymentRequestStatus.SEEN}
+    assert list(watcher.requests) == ["B"]
+
+
+def test_interval_backs_off_while_nothing_changes():
+    watcher = PaymentRequestWatcher(FakeTransactions([]), clock=lambda: NOW)
+    watcher.track("A")
+    watcher.refresh()
+    watcher.refresh()
+    assert watcher.next_interval() == timedelta(seconds=120)